@@ -4,8 +4,12 @@ Electric Clojure Research Lab - Numerai Electric Trading System
 Advanced reactive system for AI-driven trading research and real-time forecasting
 """
 
-from flask import Flask, jsonify, render_template_string, request
+from flask import Flask, g, jsonify, request, send_from_directory
+from markupsafe import Markup, escape
+from werkzeug.exceptions import HTTPException
+import argparse
 import json
+import queue
 import time
 import datetime
 import os
@@ -13,34 +17,96 @@ import logging
 import socket
 import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 
+from lab import (assets, backtest, barstore, columnar, dataset, indicators, inference, jobs, logbuffer,
+                 portfolio, profiling, respcache, resultcache, scoring, streaming, telemetry)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# Global configuration
-CONFIG = {
+# Global configuration (TrackedDict versions each key for the response cache)
+CONFIG = respcache.TrackedDict({
     'host': '0.0.0.0',
     'port': 42857,
     'debug': True,
     'domain': 'electric.lab.uprootiny.dev',
     'public_ip': None,
-    'version': '3.0-numerai-electric'
-}
+    'version': '3.0-numerai-electric',
+    'data_path': '/data/market',
+    'store_path': '/data/market/columnar',
+    'result_cache_path': '/data/market/results',  # Content-addressed backtest/optimizer results
+    'result_cache_entries': 256,  # In-memory LRU tier
+    'result_cache_bytes': 512 * 1024 * 1024,  # Disk tier bound, shared by all workers
+    'optimize_workers': None,  # Defaults to os.cpu_count()
+    'optimize_max_combinations': 50000,
+    'walkforward_max_folds': 500,
+    'signal_warmup_bars': 200,
+    'log_capacity': 1000,
+    'stream_max_clients': 100,
+    'stream_queue_size': 256,
+    'stream_poll_interval': 1.0,
+    'stream_heartbeat_interval': 15.0,
+    'stream_batch_rows': 65536,  # Rows per NDJSON flush / columnar record batch on row-streaming routes
+    'cache_ttl': 1.0,  # Max staleness of uptime/request counters on cached routes
+    'cache_gzip': True,
+    'workers': None,  # Production worker processes; defaults to os.cpu_count()
+    'tick_queue_size': 1000,
+    'signal_publish_interval': 0.25,
+    'replay_queue_size': 10000,  # Bounded tick queue between the replay feed and the signal engine
+    'replay_policy': 'block',  # 'block' the feed or 'drop' the oldest queued tick when the queue is full
+    'replay_max_symbols': 1000,
+    'shared_signals_bytes': 8 * 1024 * 1024,
+    'shared_predictions_bytes': 1024 * 1024,
+    'shared_scores_bytes': 256 * 1024,
+    'shared_log_message_bytes': 512,
+    'shared_config_bytes': 64 * 1024,
+    'fast_startup': True,  # Bind first; resolve the public IP and warm up signals in the background
+    'public_ip_cache': os.path.expanduser('~/.cache/numerai-electric/public_ip.json'),
+    'public_ip_cache_ttl': 24 * 3600,
+    'tournament_path': '/data/numerai/numerai_tournament_data.csv',
+    'model_path': '/data/numerai/ensemble-v1.npz',  # Seeded weights are used when missing
+    'predictions_path': '/data/numerai/predictions.csv',
+    'predict_chunk_rows': 5000,
+    'training_path': '/data/numerai/numerai_training_data.csv',
+    'validation_path': None,  # Rows with targets are scored; tournament_path when None
+    'candidate_models_path': '/data/numerai/candidates',  # .npz ensembles scored next to model_path
+    'meta_model_path': '/data/numerai/meta_model.csv',  # id,prediction; MMC is skipped when missing
+    'dataset_cache': '/data/numerai/cache',  # Converted uint8 feature matrices
+    'train_ridge_alpha': 10.0,
+    'job_workers': 2,
+    'job_queue_size': 100,
+    'batch_max_requests': 20,  # Sub-requests per /api/batch call
+    'batch_workers': 8,  # Threads running independent (GET) sub-requests concurrently
+    'job_max_wait': 60.0,  # Longest ?wait= a request may block on
+    'jobs_path': '/data/numerai/jobs',  # Job records shared by pre-forked workers
+    'tournament_deadline': '2025-06-21T12:00:00Z',
+    'deadline_window_hours': 24,  # Predictions this close to the deadline run at 'deadline' priority
+    'metrics_publish_interval': 1.0,  # How stale other workers' numbers on /metrics may be
+    'shared_metrics_bytes': 512 * 1024,  # Per worker
+    'profiling_enabled': False,  # Allow ?profile=cprofile|sample (or X-Profile) on single requests
+    'profiles_path': '/data/numerai/profiles',
+    'profiles_keep': 200,
+    'profile_sample_interval': 0.001,
+    'sampler_enabled': True,  # Always-on low-rate stack sampling of in-flight requests
+    'sampler_interval': 0.05,
+    'shared_profile_bytes': 128 * 1024  # Per worker
+})
 
 # Global state
-SYSTEM_STATE = {
+SYSTEM_STATE = respcache.TrackedDict({
     'start_time': time.time(),
     'request_count': 0,
-    'logs': [],
     'trading_signals': [],
     'model_predictions': {},
+    'model_scores': {},
     'market_data': {},
     'numerai_status': {'tournament': 'active', 'model_state': 'training'}
-}
+})
 
 def get_public_ip():
     """Get the public IP address of the server"""
@@ -60,20 +126,131 @@ def get_public_ip():
         except:
             return "unknown"
 
-def log_event(message: str):
-    """Add event to system logs"""
-    timestamp = datetime.datetime.now().isoformat()
-    log_entry = f"{timestamp} - {message}"
-    SYSTEM_STATE['logs'].append(log_entry)
-    logger.info(message)
+def read_cached_public_ip():
+    """(ip, fresh) from the on-disk cache; ip is None when nothing is cached"""
+    try:
+        with open(CONFIG['public_ip_cache']) as f:
+            cached = json.load(f)
+        return cached['ip'], time.time() - cached['resolved_at'] < CONFIG['public_ip_cache_ttl']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, False
+
+def resolve_public_ip() -> str:
+    """Look up the public IP, cache it on disk and apply it to CONFIG in every process"""
+    ip = get_public_ip()
+    if ip != "unknown":
+        path = CONFIG['public_ip_cache']
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w') as f:
+                json.dump({'ip': ip, 'resolved_at': time.time()}, f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.warning(f"Could not cache public IP: {e}")
     
-    # Keep only last 50 logs
-    if len(SYSTEM_STATE['logs']) > 50:
-        SYSTEM_STATE['logs'] = SYSTEM_STATE['logs'][-50:]
+    if ip != CONFIG['public_ip']:
+        CONFIG['public_ip'] = ip
+        publish_config('public_ip')
+        log_event(f"Public IP resolved: {ip}")
+    return ip
+
+EVENT_BROKER = streaming.EventBroker()
+LOG_BUFFER = logbuffer.LogBuffer(CONFIG['log_capacity'])
+_request_count_lock = threading.Lock()
+
+# Cross-process state and tick queue, set up by enable_shared_state() in production mode
+SHARED = None
+TICK_QUEUE = None
+WORKER_INDEX = None  # This pre-forked worker's metrics slot
+_shared_config_version = 0
+
+def log_event(message: str, level: str = 'info'):
+    """Add event to system logs"""
+    LOG_BUFFER.append(message, level)
+    EVENT_BROKER.notify()  # Stream clients read new records from LOG_BUFFER
+    logger.log(logging.getLevelName(level.upper()), message)
+
+SIGNAL_ENGINE = indicators.SignalEngine()
+RESPONSE_CACHE = respcache.ResponseCache()
+JOB_SCHEDULER = jobs.JobScheduler(CONFIG['job_workers'], CONFIG['job_queue_size'], CONFIG['jobs_path'])
+
+SAMPLER = profiling.StackSampler(CONFIG['sampler_interval'])
+
+METRICS = telemetry.Registry()
+HTTP_REQUESTS = METRICS.counter('http_requests_total', 'Requests by route, method and status',
+                                ('method', 'route', 'status'))
+HTTP_IN_FLIGHT = METRICS.gauge('http_requests_in_flight', 'Requests currently being handled', ('route',))
+HTTP_LATENCY = METRICS.histogram('http_request_duration_seconds', 'Time until the response is returned '
+                                 '(streamed bodies excluded)', ('method', 'route'))
+BACKTEST_SECONDS = METRICS.histogram('backtest_duration_seconds', 'Backtest run time', ('strategy',))
+OPTIMIZER_SECONDS = METRICS.histogram('optimizer_run_duration_seconds', 'Parameter grid search run time',
+                                      ('strategy',))
+OPTIMIZER_COMBINATIONS = METRICS.counter('optimizer_combinations_total', 'Parameter combinations evaluated',
+                                         ('strategy',))
+WALKFORWARD_SECONDS = METRICS.histogram('walkforward_run_duration_seconds', 'Walk-forward evaluation run time',
+                                        ('strategy',))
+WALKFORWARD_FOLDS = METRICS.counter('walkforward_folds_total', 'Walk-forward folds evaluated', ('strategy',))
+REPLAY_LATENCY = METRICS.histogram('replay_tick_to_signal_seconds', 'Replay feed tick publication to evaluated '
+                                   'signal', buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                                                      0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+PREDICTION_BATCH_SECONDS = METRICS.histogram('prediction_batch_duration_seconds',
+                                             'Read, score and write time per prediction chunk')
+PREDICTION_ROWS = METRICS.counter('prediction_rows_total', 'Tournament rows scored')
+JOBS = METRICS.gauge('jobs', 'Background jobs held by this worker, by status', ('status',))
+STREAM_CLIENTS = METRICS.gauge('stream_clients', 'Connected Server-Sent Events clients')
+# Sub-request methods are metric labels, so only the standard ones are accepted
+BATCH_METHODS = frozenset({'GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'})
+BATCH_SUBREQUESTS = METRICS.counter('batch_subrequests_total', 'Sub-requests served through /api/batch',
+                                    ('method', 'route', 'status'))
 
 def increment_request_count():
     """Increment request counter"""
-    SYSTEM_STATE['request_count'] += 1
+    if SHARED is not None:
+        SHARED.increment('request_count')
+        return
+    with _request_count_lock:
+        SYSTEM_STATE['request_count'] += 1
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """This process's metrics with the point-in-time gauges refreshed"""
+    for status, count in JOB_SCHEDULER.stats().items():
+        if status in (jobs.QUEUED, jobs.RUNNING) + jobs.FINISHED:
+            JOBS.set((status,), count)
+    STREAM_CLIENTS.set((), EVENT_BROKER.client_count)
+    return METRICS.snapshot()
+
+def publish_metrics():
+    """Share this worker's metrics for /metrics on the other workers"""
+    try:
+        SHARED.publish(f'metrics-{WORKER_INDEX}', metrics_snapshot())
+        SHARED.publish(f'profile-{WORKER_INDEX}', SAMPLER.snapshot())
+    except ValueError as e:
+        logger.warning(f"Metrics not shared: {e}")
+
+def run_metrics_publisher():
+    while True:
+        time.sleep(CONFIG['metrics_publish_interval'])
+        publish_metrics()
+
+def get_request_count() -> int:
+    """Requests served by this process, or by all workers in production mode"""
+    return SHARED.value('request_count') if SHARED is not None else SYSTEM_STATE['request_count']
+
+def publish_config(*keys: str):
+    """Share runtime changes to CONFIG `keys` with the other processes"""
+    if SHARED is not None:
+        current = dict(SHARED.get('config', {}))
+        current.update({k: CONFIG[k] for k in keys})
+        SHARED.publish('config', current)
+
+def sync_shared_config():
+    """Apply CONFIG changes published by other processes"""
+    global _shared_config_version
+    if SHARED is not None and SHARED.version('config') != _shared_config_version:
+        _shared_config_version = SHARED.version('config')
+        for key, value in SHARED.get('config', {}).items():
+            if CONFIG.get(key) != value:
+                CONFIG[key] = value
 
 # HTML Template for the main interface
 MAIN_TEMPLATE = """
@@ -83,213 +260,9 @@ MAIN_TEMPLATE = """
     <title>⚡ Numerai Electric Trading Lab</title>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        body { 
-            font-family: 'Monaco', 'Menlo', monospace; 
-            margin: 0; 
-            padding: 20px; 
-            background: linear-gradient(135deg, #0a0a0a, #1a1a2e, #16213e);
-            color: #00ff41; 
-            line-height: 1.6;
-            min-height: 100vh;
-        }
-        .container { max-width: 1400px; margin: 0 auto; }
-        .header { text-align: center; margin-bottom: 40px; }
-        .header h1 { 
-            font-size: 3.5rem; 
-            margin: 0; 
-            text-shadow: 0 0 20px #00ff41;
-            animation: glow 2s ease-in-out infinite alternate;
-            background: linear-gradient(45deg, #00ff41, #00d2ff);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-        .subtitle {
-            font-size: 1.2rem;
-            color: #00d2ff;
-            margin: 10px 0;
-            text-shadow: 0 0 10px #00d2ff;
-        }
-        @keyframes glow {
-            from { text-shadow: 0 0 20px #00ff41; }
-            to { text-shadow: 0 0 30px #00ff41, 0 0 40px #00ff41; }
-        }
-        .status-grid { 
-            display: grid; 
-            grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); 
-            gap: 25px; 
-            margin: 30px 0; 
-        }
-        .card { 
-            background: rgba(0, 255, 65, 0.05); 
-            border: 1px solid rgba(0, 255, 65, 0.3); 
-            border-radius: 15px; 
-            padding: 25px; 
-            box-shadow: 0 0 25px rgba(0, 255, 65, 0.1);
-            backdrop-filter: blur(10px);
-            transition: all 0.3s ease;
-        }
-        .card:hover {
-            border-color: #00ff41;
-            box-shadow: 0 0 35px rgba(0, 255, 65, 0.2);
-            transform: translateY(-2px);
-        }
-        .card h3 { 
-            margin-top: 0; 
-            color: #ffffff; 
-            font-size: 1.3rem;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        .card-icon {
-            font-size: 1.5rem;
-        }
-        .endpoint { 
-            background: rgba(0, 0, 0, 0.6); 
-            padding: 12px; 
-            margin: 12px 0; 
-            border-radius: 8px; 
-            border-left: 4px solid #00ff41;
-            transition: all 0.2s ease;
-        }
-        .endpoint:hover {
-            background: rgba(0, 255, 65, 0.1);
-            border-left-color: #00d2ff;
-        }
-        .endpoint a { 
-            color: #00ff41; 
-            text-decoration: none; 
-            font-weight: 500;
-        }
-        .endpoint a:hover { 
-            color: #00d2ff;
-            text-decoration: underline; 
-        }
-        .terminal { 
-            background: #000000; 
-            padding: 20px; 
-            border-radius: 10px; 
-            margin: 20px 0;
-            border: 1px solid #00ff41;
-            font-family: 'Monaco', monospace;
-            box-shadow: inset 0 0 20px rgba(0, 255, 65, 0.1);
-        }
-        .terminal-prompt { color: #00ff41; }
-        .terminal-output { color: #ffffff; }
-        .terminal-error { color: #ff4444; }
-        .terminal-success { color: #44ff44; }
-        .button { 
-            background: linear-gradient(45deg, #00ff41, #00d2ff); 
-            color: #000000; 
-            padding: 12px 24px; 
-            border: none; 
-            border-radius: 8px; 
-            cursor: pointer; 
-            font-weight: bold;
-            margin: 8px;
-            transition: all 0.3s ease;
-            font-family: inherit;
-        }
-        .button:hover { 
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(0, 255, 65, 0.3);
-        }
-        .button:active {
-            transform: translateY(0);
-        }
-        .metrics { 
-            display: grid; 
-            grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); 
-            gap: 20px; 
-            margin: 20px 0; 
-        }
-        .metric { 
-            text-align: center; 
-            padding: 15px;
-            background: rgba(0, 0, 0, 0.3);
-            border-radius: 10px;
-            border: 1px solid rgba(0, 255, 65, 0.2);
-        }
-        .metric-value { 
-            font-size: 2.2rem; 
-            font-weight: bold; 
-            color: #00ff41;
-            text-shadow: 0 0 10px #00ff41;
-        }
-        .metric-label { 
-            font-size: 0.9rem; 
-            color: #cccccc; 
-            margin-top: 5px;
-        }
-        .log-viewer { 
-            background: #000000; 
-            color: #00ff41; 
-            padding: 20px; 
-            border-radius: 10px; 
-            max-height: 300px; 
-            overflow-y: auto; 
-            font-family: monospace;
-            border: 1px solid #00ff41;
-            box-shadow: inset 0 0 20px rgba(0, 255, 65, 0.1);
-        }
-        .trading-panel {
-            background: rgba(0, 210, 255, 0.05);
-            border: 1px solid rgba(0, 210, 255, 0.3);
-            border-radius: 15px;
-            padding: 25px;
-            margin: 20px 0;
-        }
-        .signal-indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-            animation: pulse 2s infinite;
-        }
-        .signal-buy { background: #44ff44; }
-        .signal-sell { background: #ff4444; }
-        .signal-hold { background: #ffaa00; }
-        @keyframes pulse {
-            0% { opacity: 1; }
-            50% { opacity: 0.5; }
-            100% { opacity: 1; }
-        }
-        .progress-bar {
-            width: 100%;
-            height: 6px;
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 3px;
-            margin: 10px 0;
-            overflow: hidden;
-        }
-        .progress-fill {
-            height: 100%;
-            background: linear-gradient(90deg, #00ff41, #00d2ff);
-            transition: width 0.3s ease;
-        }
-        .footer {
-            text-align: center;
-            margin-top: 60px;
-            padding-top: 30px;
-            border-top: 1px solid rgba(0, 255, 65, 0.2);
-            color: #666;
-        }
-        .status-online { color: #44ff44; }
-        .status-warning { color: #ffaa00; }
-        .status-error { color: #ff4444; }
-        
-        /* Responsive design */
-        @media (max-width: 768px) {
-            .header h1 { font-size: 2.5rem; }
-            .status-grid { grid-template-columns: 1fr; }
-            .metrics { grid-template-columns: repeat(2, 1fr); }
-        }
-    </style>
+    <link rel="stylesheet" href="/assets/dashboard.css">
 </head>
-<body>
+<body data-request-count="{{ request_count }}" data-last-log-seq="{{ last_log_seq }}">
     <div class="container">
         <div class="header">
             <h1>⚡ Numerai Electric Trading Lab</h1>
@@ -418,9 +391,7 @@ MAIN_TEMPLATE = """
         <div class="card">
             <h3><span class="card-icon">📝</span>System Event Stream</h3>
             <div class="log-viewer" id="logs">
-                {% for log in logs %}
-                <div>{{ log }}</div>
-                {% endfor %}
+                {{ logs_html }}
             </div>
             <button class="button" onclick="refreshLogs()">Refresh Logs</button>
             <button class="button" onclick="downloadLogs()">Download Logs</button>
@@ -433,136 +404,664 @@ MAIN_TEMPLATE = """
         </div>
     </div>
     
-    <script>
-        let requestCount = {{ request_count }};
-        
-        function connectREPL() {
-            window.open('/api/repl', '_blank');
-        }
-        
-        function runPrediction() {
-            addLog('Generating predictions...');
-            fetch('/api/predict')
-                .then(r => r.json())
-                .then(data => {
-                    addLog('Predictions: ' + data.predictions + ' targets generated');
-                    requestCount++;
-                })
-                .catch(e => addLog('Error: ' + e.message));
-        }
-        
-        function trainModel() {
-            addLog('Model training initiated...');
-            fetch('/api/train')
-                .then(r => r.json())
-                .then(data => {
-                    addLog('Training: ' + data.message);
-                    requestCount++;
-                })
-                .catch(e => addLog('Error: ' + e.message));
+    <script src="/assets/dashboard.js"></script>
+</body>
+</html>
+"""
+
+# Static Clojure REPL page
+REPL_PAGE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Clojure REPL - Numerai Electric</title>
+    <style>
+        body { 
+            font-family: 'Monaco', monospace; 
+            background: #000; 
+            color: #00ff41; 
+            padding: 20px; 
+            margin: 0;
         }
-        
-        function refreshLogs() {
-            fetch('/api/logs')
-                .then(r => r.json())
-                .then(data => {
-                    const logDiv = document.getElementById('logs');
-                    logDiv.innerHTML = data.logs.map(log => `<div>${log}</div>`).join('');
-                    requestCount++;
-                })
-                .catch(e => console.error('Error refreshing logs:', e));
+        .repl-container { 
+            max-width: 1000px; 
+            margin: 0 auto; 
+            background: rgba(0, 255, 65, 0.05);
+            border: 1px solid #00ff41;
+            border-radius: 10px;
+            padding: 20px;
         }
-        
-        function downloadLogs() {
-            window.open('/api/logs?format=download', '_blank');
+        .repl-output { 
+            height: 400px; 
+            overflow-y: auto; 
+            background: #000; 
+            padding: 15px; 
+            border: 1px solid #00ff41;
+            border-radius: 5px;
+            margin-bottom: 15px;
         }
-        
-        function addLog(message) {
-            const logDiv = document.getElementById('logs');
-            const newLog = document.createElement('div');
-            newLog.textContent = new Date().toISOString() + ' - ' + message;
-            logDiv.insertBefore(newLog, logDiv.firstChild);
+        .repl-input { 
+            width: 100%; 
+            padding: 10px; 
+            background: #000; 
+            color: #00ff41; 
+            border: 1px solid #00ff41;
+            border-radius: 5px;
+            font-family: inherit;
+            font-size: 14px;
         }
-        
-        // Auto-refresh logs every 30 seconds
-        setInterval(refreshLogs, 30000);
-        
-        // Auto-refresh metrics every 10 seconds
-        setInterval(() => {
-            fetch('/api/status')
-                .then(r => r.json())
-                .then(data => {
-                    // Update request count if element exists
-                    const reqCountElement = document.querySelector('.metric-value');
-                    if (reqCountElement && data.requests_served) {
-                        requestCount = data.requests_served;
+        .prompt { color: #00ff41; }
+        .result { color: #ffffff; }
+        .error { color: #ff4444; }
+    </style>
+</head>
+<body>
+    <div class="repl-container">
+        <h2>🔧 Clojure REPL - Numerai Electric Lab</h2>
+        <div class="repl-output" id="output">
+            <div class="prompt">numerai-electric=> (println "REPL Ready!")</div>
+            <div class="result">REPL Ready!</div>
+            <div class="result">nil</div>
+            <div class="prompt">numerai-electric=> (require '[numerai.core :as num])</div>
+            <div class="result">nil</div>
+            <div class="prompt">numerai-electric=> (num/system-status)</div>
+            <div class="result">{:status :online, :models 3, :predictions-ready true}</div>
+            <div class="prompt">numerai-electric=> </div>
+        </div>
+        <input type="text" class="repl-input" id="input" placeholder="Enter Clojure expression..." />
+        <p style="margin-top: 15px; color: #666;">
+            Connected to Numerai Electric REPL • Press Enter to evaluate • Type (help) for commands
+        </p>
+    </div>
+
+    <script>
+        const output = document.getElementById('output');
+        const input = document.getElementById('input');
+
+        input.addEventListener('keypress', function(e) {
+            if (e.key === 'Enter') {
+                const expr = input.value.trim();
+                if (expr) {
+                    // Add input to output
+                    const promptDiv = document.createElement('div');
+                    promptDiv.className = 'prompt';
+                    promptDiv.textContent = 'numerai-electric=> ' + expr;
+                    output.appendChild(promptDiv);
+
+                    // Simulate evaluation
+                    const resultDiv = document.createElement('div');
+                    resultDiv.className = 'result';
+
+                    if (expr === '(help)') {
+                        resultDiv.innerHTML = `Available commands:<br/>
+                        (num/get-tournament-data) - Get current tournament info<br/>
+                        (num/train-model opts) - Train a new model<br/>
+                        (num/generate-predictions) - Generate predictions<br/>
+                        (num/get-signals) - Get trading signals<br/>
+                        (system/status) - System status`;
+                    } else if (expr.includes('num/')) {
+                        resultDiv.textContent = '{:status :executed, :result :simulated}';
+                    } else {
+                        try {
+                            resultDiv.textContent = eval(expr.replace(/^\(|\)$/g, ''));
+                        } catch (e) {
+                            resultDiv.className = 'error';
+                            resultDiv.textContent = 'Error: ' + e.message;
+                        }
                     }
-                })
-                .catch(e => console.error('Error updating metrics:', e));
-        }, 10000);
-        
-        // Blink animation
-        const style = document.createElement('style');
-        style.textContent = `
-            @keyframes blink {
-                0%, 50% { opacity: 1; }
-                51%, 100% { opacity: 0; }
+
+                    output.appendChild(resultDiv);
+
+                    // Add new prompt
+                    const newPromptDiv = document.createElement('div');
+                    newPromptDiv.className = 'prompt';
+                    newPromptDiv.textContent = 'numerai-electric=> ';
+                    output.appendChild(newPromptDiv);
+
+                    input.value = '';
+                    output.scrollTop = output.scrollHeight;
+                }
             }
-        `;
-        document.head.appendChild(style);
+        });
+
+        input.focus();
     </script>
 </body>
 </html>
 """
 
+# Stylesheet and script for the dashboard, served precompressed from /assets
+DASHBOARD_CSS = """
+body { 
+    font-family: 'Monaco', 'Menlo', monospace; 
+    margin: 0; 
+    padding: 20px; 
+    background: linear-gradient(135deg, #0a0a0a, #1a1a2e, #16213e);
+    color: #00ff41; 
+    line-height: 1.6;
+    min-height: 100vh;
+}
+.container { max-width: 1400px; margin: 0 auto; }
+.header { text-align: center; margin-bottom: 40px; }
+.header h1 { 
+    font-size: 3.5rem; 
+    margin: 0; 
+    text-shadow: 0 0 20px #00ff41;
+    animation: glow 2s ease-in-out infinite alternate;
+    background: linear-gradient(45deg, #00ff41, #00d2ff);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+.subtitle {
+    font-size: 1.2rem;
+    color: #00d2ff;
+    margin: 10px 0;
+    text-shadow: 0 0 10px #00d2ff;
+}
+@keyframes glow {
+    from { text-shadow: 0 0 20px #00ff41; }
+    to { text-shadow: 0 0 30px #00ff41, 0 0 40px #00ff41; }
+}
+.status-grid { 
+    display: grid; 
+    grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); 
+    gap: 25px; 
+    margin: 30px 0; 
+}
+.card { 
+    background: rgba(0, 255, 65, 0.05); 
+    border: 1px solid rgba(0, 255, 65, 0.3); 
+    border-radius: 15px; 
+    padding: 25px; 
+    box-shadow: 0 0 25px rgba(0, 255, 65, 0.1);
+    backdrop-filter: blur(10px);
+    transition: all 0.3s ease;
+}
+.card:hover {
+    border-color: #00ff41;
+    box-shadow: 0 0 35px rgba(0, 255, 65, 0.2);
+    transform: translateY(-2px);
+}
+.card h3 { 
+    margin-top: 0; 
+    color: #ffffff; 
+    font-size: 1.3rem;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+}
+.card-icon {
+    font-size: 1.5rem;
+}
+.endpoint { 
+    background: rgba(0, 0, 0, 0.6); 
+    padding: 12px; 
+    margin: 12px 0; 
+    border-radius: 8px; 
+    border-left: 4px solid #00ff41;
+    transition: all 0.2s ease;
+}
+.endpoint:hover {
+    background: rgba(0, 255, 65, 0.1);
+    border-left-color: #00d2ff;
+}
+.endpoint a { 
+    color: #00ff41; 
+    text-decoration: none; 
+    font-weight: 500;
+}
+.endpoint a:hover { 
+    color: #00d2ff;
+    text-decoration: underline; 
+}
+.terminal { 
+    background: #000000; 
+    padding: 20px; 
+    border-radius: 10px; 
+    margin: 20px 0;
+    border: 1px solid #00ff41;
+    font-family: 'Monaco', monospace;
+    box-shadow: inset 0 0 20px rgba(0, 255, 65, 0.1);
+}
+.terminal-prompt { color: #00ff41; }
+.terminal-output { color: #ffffff; }
+.terminal-error { color: #ff4444; }
+.terminal-success { color: #44ff44; }
+.button { 
+    background: linear-gradient(45deg, #00ff41, #00d2ff); 
+    color: #000000; 
+    padding: 12px 24px; 
+    border: none; 
+    border-radius: 8px; 
+    cursor: pointer; 
+    font-weight: bold;
+    margin: 8px;
+    transition: all 0.3s ease;
+    font-family: inherit;
+}
+.button:hover { 
+    transform: translateY(-2px);
+    box-shadow: 0 5px 15px rgba(0, 255, 65, 0.3);
+}
+.button:active {
+    transform: translateY(0);
+}
+.metrics { 
+    display: grid; 
+    grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); 
+    gap: 20px; 
+    margin: 20px 0; 
+}
+.metric { 
+    text-align: center; 
+    padding: 15px;
+    background: rgba(0, 0, 0, 0.3);
+    border-radius: 10px;
+    border: 1px solid rgba(0, 255, 65, 0.2);
+}
+.metric-value { 
+    font-size: 2.2rem; 
+    font-weight: bold; 
+    color: #00ff41;
+    text-shadow: 0 0 10px #00ff41;
+}
+.metric-label { 
+    font-size: 0.9rem; 
+    color: #cccccc; 
+    margin-top: 5px;
+}
+.log-viewer { 
+    background: #000000; 
+    color: #00ff41; 
+    padding: 20px; 
+    border-radius: 10px; 
+    max-height: 300px; 
+    overflow-y: auto; 
+    font-family: monospace;
+    border: 1px solid #00ff41;
+    box-shadow: inset 0 0 20px rgba(0, 255, 65, 0.1);
+}
+.trading-panel {
+    background: rgba(0, 210, 255, 0.05);
+    border: 1px solid rgba(0, 210, 255, 0.3);
+    border-radius: 15px;
+    padding: 25px;
+    margin: 20px 0;
+}
+.signal-indicator {
+    display: inline-block;
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    margin-right: 8px;
+    animation: pulse 2s infinite;
+}
+.signal-buy { background: #44ff44; }
+.signal-sell { background: #ff4444; }
+.signal-hold { background: #ffaa00; }
+@keyframes pulse {
+    0% { opacity: 1; }
+    50% { opacity: 0.5; }
+    100% { opacity: 1; }
+}
+.progress-bar {
+    width: 100%;
+    height: 6px;
+    background: rgba(255, 255, 255, 0.1);
+    border-radius: 3px;
+    margin: 10px 0;
+    overflow: hidden;
+}
+.progress-fill {
+    height: 100%;
+    background: linear-gradient(90deg, #00ff41, #00d2ff);
+    transition: width 0.3s ease;
+}
+.footer {
+    text-align: center;
+    margin-top: 60px;
+    padding-top: 30px;
+    border-top: 1px solid rgba(0, 255, 65, 0.2);
+    color: #666;
+}
+.status-online { color: #44ff44; }
+.status-warning { color: #ffaa00; }
+.status-error { color: #ff4444; }
+
+/* Responsive design */
+@media (max-width: 768px) {
+    .header h1 { font-size: 2.5rem; }
+    .status-grid { grid-template-columns: 1fr; }
+    .metrics { grid-template-columns: repeat(2, 1fr); }
+}
+"""
+
+DASHBOARD_JS = """
+let requestCount = Number(document.body.dataset.requestCount);
+let lastLogSeq = Number(document.body.dataset.lastLogSeq);
+
+function connectREPL() {
+    window.open('/api/repl', '_blank');
+}
+
+function runPrediction() {
+    addLog('Generating predictions...');
+    fetch('/api/predict')
+        .then(r => r.json())
+        .then(data => {
+            addLog('Prediction job ' + data.job_id + ' ' + data.status + ' (' + data.priority + ' priority)');
+            requestCount++;
+        })
+        .catch(e => addLog('Error: ' + e.message));
+}
+
+function trainModel() {
+    addLog('Model training initiated...');
+    fetch('/api/train')
+        .then(r => r.json())
+        .then(data => {
+            addLog('Training job ' + data.job_id + ' ' + data.status);
+            requestCount++;
+        })
+        .catch(e => addLog('Error: ' + e.message));
+}
+
+function refreshLogs() {
+    fetch('/api/logs?since=' + lastLogSeq)
+        .then(r => r.json())
+        .then(data => {
+            data.logs.forEach(appendLogEntry);
+            requestCount++;
+        })
+        .catch(e => console.error('Error refreshing logs:', e));
+}
+
+function downloadLogs() {
+    window.open('/api/logs?format=download', '_blank');
+}
+
+function addLog(message) {
+    const logDiv = document.getElementById('logs');
+    const newLog = document.createElement('div');
+    newLog.textContent = new Date().toISOString() + ' - ' + message;
+    logDiv.insertBefore(newLog, logDiv.firstChild);
+}
+
+function appendLogEntry(record) {
+    if (record.seq <= lastLogSeq) return;
+    lastLogSeq = record.seq;
+    const logDiv = document.getElementById('logs');
+    const newLog = document.createElement('div');
+    newLog.textContent = record.timestamp + ' - ' + record.message;
+    logDiv.insertBefore(newLog, logDiv.firstChild);
+}
+
+function pollUpdates() {
+    // Auto-refresh metrics every 10 seconds, and logs every third refresh, in one batched call
+    let polls = 0;
+    setInterval(() => {
+        const requests = [{id: 'status', path: '/api/status'}];
+        if (polls++ % 3 === 0) {
+            requests.push({id: 'logs', path: '/api/logs?since=' + lastLogSeq});
+        }
+        fetch('/api/batch', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({requests: requests})
+        })
+            .then(r => r.json())
+            .then(data => {
+                data.responses.forEach(entry => {
+                    if (entry.status !== 200) return;
+                    if (entry.id === 'status' && entry.body.requests_served) {
+                        requestCount = entry.body.requests_served;
+                    } else if (entry.id === 'logs') {
+                        entry.body.logs.forEach(appendLogEntry);
+                    }
+                });
+            })
+            .catch(e => console.error('Error updating metrics:', e));
+    }, 10000);
+}
+
+// Push updates over one SSE connection, falling back to polling
+if (window.EventSource) {
+    const stream = new EventSource('/api/stream?topics=log,status');
+    stream.addEventListener('log', e => appendLogEntry(JSON.parse(e.data)));
+    stream.addEventListener('resync', () => refreshLogs());
+    stream.addEventListener('status', e => {
+        const delta = JSON.parse(e.data);
+        if (delta.requests_served) {
+            requestCount = delta.requests_served;
+        }
+    });
+} else {
+    pollUpdates();
+}
+
+// Blink animation
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes blink {
+        0%, 50% { opacity: 1; }
+        51%, 100% { opacity: 0; }
+    }
+`;
+document.head.appendChild(style);
+"""
+
+# Compiled once at startup: static bodies are pre-encoded, the dashboard is
+# pre-rendered per CONFIG version with markers where per-request values go
+ASSETS = {
+    'dashboard.css': assets.StaticAsset(DASHBOARD_CSS, 'text/css; charset=utf-8'),
+    'dashboard.js': assets.StaticAsset(DASHBOARD_JS, 'application/javascript; charset=utf-8'),
+    'repl.html': assets.StaticAsset(REPL_PAGE, 'text/html; charset=utf-8')
+}
+MAIN_PAGE = app.jinja_env.from_string(MAIN_TEMPLATE)
+_dashboard_pages = {}
+
+def dashboard_page() -> assets.FragmentPage:
+    """Dashboard split into static segments, rendered once per CONFIG version"""
+    page = _dashboard_pages.get(CONFIG.version)
+    if page is None:
+        marker = assets.FragmentPage.marker
+        page = assets.FragmentPage(MAIN_PAGE.render(
+            config=CONFIG,
+            uptime_hours=Markup(marker('uptime_hours')),
+            request_count=Markup(marker('request_count')),
+            model_count=3,  # Number of active models
+            logs_html=Markup(marker('logs_html')),
+            last_log_seq=Markup(marker('last_log_seq'))
+        ))
+        _dashboard_pages.clear()
+        _dashboard_pages[CONFIG.version] = page
+    return page
+
+def serve_asset(asset: assets.StaticAsset):
+    """Serve a precompressed asset with ETag revalidation"""
+    encoding, body = asset.negotiate(request.accept_encodings)
+    etag = asset.etag if encoding == 'identity' else f"{asset.etag}-{encoding}"
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, content_type=asset.content_type)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def cached_json(key: str, build, state_keys=(), config_keys=None, shared_keys=(), ttl: float = None):
+    """Serve build() from RESPONSE_CACHE with ETag revalidation and optional gzip.
+
+    The entry is rebuilt when any of `state_keys` in SYSTEM_STATE or
+    `config_keys` in CONFIG (all of CONFIG when None) is reassigned, when
+    any of the `shared_keys` slots is republished, or after `ttl` seconds.
+    """
+    version = CONFIG.version_of(config_keys) + SYSTEM_STATE.version_of(state_keys)
+    if SHARED is not None:
+        version += tuple(SHARED.version(k) for k in shared_keys)
+    entry = RESPONSE_CACHE.get(key, version, lambda: app.json.dumps(build()).encode() + b'\n', ttl)
+    
+    gzipped = CONFIG['cache_gzip'] and 'gzip' in request.accept_encodings
+    etag = entry.etag + ('-gz' if gzipped else '')
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(entry.gzipped if gzipped else entry.body, mimetype='application/json')
+        if gzipped:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+RESPONSE_FORMATS = {'json': 'application/json', 'ndjson': 'application/x-ndjson', 'columnar': columnar.MIMETYPE}
+
+def response_format() -> str:
+    """'json', 'ndjson' or 'columnar': ?format= wins, then the Accept header"""
+    requested = request.args.get('format')
+    if requested in RESPONSE_FORMATS:
+        return requested
+    best = request.accept_mimetypes.best_match(list(RESPONSE_FORMATS.values()), 'application/json')
+    return next(name for name, mimetype in RESPONSE_FORMATS.items() if mimetype == best)
+
+def stream_rows(fmt: str, head: Dict[str, Any], batches, schema: Dict[str, str]):
+    """Stream `head` and then the rows of column `batches`, as NDJSON or columnar record batches.
+
+    NDJSON starts with a {"type": "summary", ...head} line followed by one
+    object per row; columnar carries `head` as the first batch's meta.
+    """
+    if fmt == 'columnar':
+        body = columnar.stream(head, batches, schema)
+    else:
+        def generate():
+            dumps = app.json.dumps
+            yield dumps(dict(head, type='summary')) + '\n'
+            for columns in batches:
+                yield ''.join([dumps(row) + '\n' for row in columnar.rows([columns])])
+        body = generate()
+    response = app.response_class(body, mimetype=RESPONSE_FORMATS[fmt])
+    response.headers['Vary'] = 'Accept'
+    return response
+
 @app.before_request
 def before_request():
     """Track requests and log"""
     increment_request_count()
+    sync_shared_config()
+    g.metrics_route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    g.metrics_start = time.perf_counter()
+    HTTP_IN_FLIGHT.inc((g.metrics_route,))
+    if CONFIG['sampler_enabled']:
+        if not SAMPLER.running:
+            SAMPLER.interval = CONFIG['sampler_interval']
+            SAMPLER.start()  # Lazily, so each pre-forked worker runs its own
+        SAMPLER.add_thread(threading.get_ident())
+        g.sampled = True
+    mode = request.args.get('profile') or request.headers.get('X-Profile')
+    if CONFIG['profiling_enabled'] and mode:
+        mode = 'cprofile' if mode in ('1', 'true') else mode
+        if mode in profiling.MODES:
+            g.profile = profiling.RequestProfile(mode, CONFIG['profile_sample_interval'])
+
+@app.after_request
+def after_request(response):
+    g.metrics_status = response.status_code
+    profile = g.pop('profile', None)
+    if profile is not None:
+        try:
+            record = profile.save(CONFIG['profiles_path'], g.metrics_route, request.method,
+                                  CONFIG['profiles_keep'])
+            response.headers['X-Profile-Id'] = record['profile_id']
+        except OSError as e:
+            log_event(f"Profile not saved: {e}", 'warning')
+    return response
+
+@app.teardown_request
+def teardown_request(exc):
+    """Per-route latency and counts; runs for failed requests too"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profile.stop()  # The view raised before after_request
+    if g.pop('sampled', False):
+        SAMPLER.remove_thread(threading.get_ident())
+    route = g.pop('metrics_route', None)
+    if route is None:
+        return
+    HTTP_IN_FLIGHT.dec((route,))
+    HTTP_LATENCY.observe((request.method, route), time.perf_counter() - g.pop('metrics_start'))
+    HTTP_REQUESTS.inc((request.method, route, str(g.pop('metrics_status', 500))))
 
 @app.route('/')
 def index():
     """Main dashboard interface"""
     uptime_seconds = time.time() - SYSTEM_STATE['start_time']
     uptime_hours = round(uptime_seconds / 3600, 1)
-    
-    return render_template_string(
-        MAIN_TEMPLATE,
-        config=CONFIG,
-        uptime_hours=uptime_hours,
-        request_count=SYSTEM_STATE['request_count'],
-        model_count=3,  # Number of active models
-        logs=SYSTEM_STATE['logs'][-20:]  # Show last 20 logs
+    logs_html = ''.join(
+        f"\n                <div>{escape(r['timestamp'])} - {escape(r['message'])}</div>"
+        for r in LOG_BUFFER.recent(20)  # Show last 20 logs
     )
+    
+    values = {
+        'uptime_hours': uptime_hours,
+        'request_count': get_request_count(),
+        'logs_html': logs_html,
+        'last_log_seq': LOG_BUFFER.last_seq
+    }
+    if CONFIG['cache_gzip'] and 'gzip' in request.accept_encodings:
+        response = app.response_class(dashboard_page().render_gzip(values), mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(dashboard_page().render(values), mimetype='text/html')
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+@app.route('/assets/<name>')
+def static_asset(name):
+    """Precompressed dashboard stylesheet and script"""
+    if name not in ASSETS:
+        return jsonify({'status': 'error', 'error': f"Unknown asset: {name}"}), 404
+    return serve_asset(ASSETS[name])
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
     log_event("Health check requested")
+    return cached_json('health', build_health, config_keys=('version',), ttl=CONFIG['cache_ttl'])
+
+def build_health() -> Dict[str, Any]:
+    """Response body for /health"""
     uptime_seconds = time.time() - SYSTEM_STATE['start_time']
     
-    return jsonify({
+    return {
         'status': 'healthy',
         'service': 'numerai-electric',
         'version': CONFIG['version'],
         'uptime_seconds': round(uptime_seconds),
-        'requests_served': SYSTEM_STATE['request_count'],
+        'requests_served': get_request_count(),
         'mode': 'global',
         'features': ['numerai-integration', 'real-time-predictions', 'model-ensemble', 'trading-signals']
-    })
+    }
 
 @app.route('/api/status')
 def api_status():
     """Detailed system status"""
+    return cached_json('status', build_status, state_keys=('numerai_status',), ttl=CONFIG['cache_ttl'])
+
+def build_status() -> Dict[str, Any]:
+    """Response body for /api/status"""
     uptime_seconds = time.time() - SYSTEM_STATE['start_time']
     
-    return jsonify({
+    return {
         'service': 'numerai-electric',
         'status': 'running',
         'version': CONFIG['version'],
         'timestamp': datetime.datetime.now().isoformat(),
         'uptime_seconds': round(uptime_seconds),
-        'requests_served': SYSTEM_STATE['request_count'],
+        'requests_served': get_request_count(),
         'config': CONFIG,
         'features': [
             'numerai-tournament-integration',
@@ -578,21 +1077,34 @@ def api_status():
             'ensemble-v1': {'status': 'training', 'accuracy': 0.68},
             'xgboost-v2': {'status': 'ready', 'accuracy': 0.71},
             'neural-net-v1': {'status': 'predicting', 'accuracy': 0.69}
-        }
-    })
+        },
+        'response_cache': RESPONSE_CACHE.stats(),
+        'result_cache': get_result_cache().stats(),
+        'jobs': JOB_SCHEDULER.stats()
+    }
 
 @app.route('/api/numerai')
 def api_numerai():
     """Numerai tournament data"""
     log_event("Numerai data requested")
+    return cached_json('numerai', build_numerai, state_keys=('numerai_status', 'model_scores'),
+                       config_keys=('tournament_deadline',), shared_keys=('scores',))
+
+def build_numerai() -> Dict[str, Any]:
+    """Response body for /api/numerai: simulated tournament data plus the latest validation scores"""
+    scores = get_model_scores()
+    models = scores.get('models', {})
+    current = models.get('ensemble-v1', {})
     
-    # Simulated tournament data
-    return jsonify({
+    def mean(result, metric):
+        return result[metric]['mean'] if metric in result else None
+    
+    return {
         'tournament': {
             'id': 'numerai_tournament_123',
             'round': 456,
             'status': 'active',
-            'deadline': '2025-06-21T12:00:00Z',
+            'deadline': CONFIG['tournament_deadline'],
             'targets': 50000,
             'features': 2000
         },
@@ -600,25 +1112,74 @@ def api_numerai():
             'username': 'electric_trader',
             'rank': 1247,
             'score': 0.0234,
-            'correlation': 0.0456,
-            'mmc': 0.0123
+            'correlation': mean(current, 'correlation'),
+            'mmc': mean(current, 'mmc')
         },
-        'models': {
+        'models': dict({
             'ensemble-v1': {
                 'stake': 100,
-                'correlation': 0.045,
-                'mmc': 0.012,
+                'correlation': mean(current, 'correlation'),
+                'mmc': mean(current, 'mmc'),
                 'status': 'submitted'
             }
-        }
-    })
+        }, **{name: {
+            'stake': 0,
+            'correlation': mean(result, 'correlation'),
+            'mmc': mean(result, 'mmc'),
+            'status': 'candidate'
+        } for name, result in models.items() if name != 'ensemble-v1'}),
+        'scoring': {k: v for k, v in scores.items() if k != 'models'} or None
+    }
 
 @app.route('/api/predictions')
 def api_predictions():
     """Model predictions endpoint"""
     log_event("Predictions requested")
+    fmt = response_format()
+    if fmt != 'json':
+        # Every row of the latest prediction file, streamed from disk
+        head = build_predictions()
+        path = get_model_predictions().get('output_path')
+        rows = CONFIG['stream_batch_rows']
+        batches = inference.read_prediction_batches(path, rows) if path and os.path.exists(path) else ()
+        return stream_rows(fmt, head, batches, {'id': 'string', 'prediction': 'float32'})
+    # ttl: the placeholder summary stamps generated_at with the build time
+    return cached_json('predictions', build_predictions, state_keys=('model_predictions',), config_keys=(),
+                       shared_keys=('predictions',), ttl=CONFIG['cache_ttl'])
+
+def get_model_predictions() -> Dict[str, Any]:
+    """Latest prediction summary, shared across workers in production mode"""
+    if SHARED is not None:
+        return SHARED.get('predictions', {})
+    return SYSTEM_STATE['model_predictions']
+
+def set_model_predictions(predictions: Dict[str, Any]):
+    SYSTEM_STATE['model_predictions'] = predictions
+    if SHARED is not None:
+        SHARED.publish('predictions', predictions)
+
+def get_model_scores() -> Dict[str, Any]:
+    """Latest validation scores, shared across workers in production mode"""
+    if SHARED is not None:
+        return SHARED.get('scores', {})
+    return SYSTEM_STATE['model_scores']
+
+def set_model_scores(scores: Dict[str, Any]):
+    SYSTEM_STATE['model_scores'] = scores
+    if SHARED is not None:
+        SHARED.publish('scores', scores)
+
+def build_predictions() -> Dict[str, Any]:
+    """Response body for /api/predictions"""
+    latest = get_model_predictions()
+    if latest:
+        summary_keys = ('mean_prediction', 'std_prediction')
+        return {
+            'predictions': {k: v for k, v in latest.items() if k not in summary_keys},
+            'summary': {k: latest[k] for k in summary_keys}
+        }
     
-    return jsonify({
+    return {
         'predictions': {
             'count': 50000,
             'generated_at': datetime.datetime.now().isoformat(),
@@ -632,186 +1193,618 @@ def api_predictions():
             'std_prediction': 0.124,
             'correlation_estimate': 0.068
         }
-    })
+    }
+
+def current_signals(symbols: List[str] = None, since_version: int = 0):
+    """(version, signals, symbols_tracked) from the local engine, or from the
+    snapshot the signal owner process publishes in production mode"""
+    if SHARED is None:
+        return SIGNAL_ENGINE.version, SIGNAL_ENGINE.snapshot(symbols, since_version), len(SIGNAL_ENGINE.states)
+    exported = SHARED.get('signals') or {'version': 0, 'symbols_tracked': 0, 'signals': []}
+    signals = indicators.filter_signals(exported['signals'], symbols, since_version)
+    return exported['version'], signals, exported['symbols_tracked']
 
 @app.route('/api/signals')
 def api_signals():
     """Trading signals endpoint"""
     log_event("Trading signals requested")
     
-    signals = [
-        {'symbol': 'BTC-USD', 'signal': 'BUY', 'confidence': 0.87, 'expected_return': 0.023},
-        {'symbol': 'ETH-USD', 'signal': 'HOLD', 'confidence': 0.65, 'expected_return': 0.005},
-        {'symbol': 'SOL-USD', 'signal': 'SELL', 'confidence': 0.73, 'expected_return': -0.012}
-    ]
+    symbols = request.args.get('symbols')
+    _, signals, symbols_tracked = current_signals(symbols.split(',') if symbols else None)
     
     return jsonify({
         'signals': signals,
+        'symbols_tracked': symbols_tracked,
         'generated_at': datetime.datetime.now().isoformat(),
         'strategy': 'ensemble-momentum',
         'risk_level': 'moderate'
     })
 
-@app.route('/api/predict')
-def api_predict():
-    """Run prediction"""
-    log_event("Prediction job started")
+@app.route('/api/ticks', methods=['POST'])
+def api_ticks():
+    """Feed price ticks into the live signal engine"""
+    body = request.get_json(silent=True) or {}
+    ticks = body.get('ticks', [])
     
-    return jsonify({
-        'status': 'success',
-        'predictions': 50000,
-        'model': 'ensemble-v1',
-        'processing_time': '2.34s',
-        'message': 'Predictions generated successfully'
+    if TICK_QUEUE is not None:
+        # Production mode: the signal owner process applies ticks in arrival order
+        if not isinstance(ticks, list):
+            return jsonify({'status': 'error', 'error': "Invalid tick: 'ticks' must be a list"}), 400
+        try:
+            TICK_QUEUE.put_nowait(ticks)
+        except queue.Full:
+            return jsonify({'status': 'error', 'error': 'Tick queue full'}), 503
+        return jsonify({'status': 'queued', 'queued': len(ticks), 'version': current_signals()[0]}), 202
+    
+    try:
+        applied = SIGNAL_ENGINE.update_many(ticks)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'error': f"Invalid tick: {e}"}), 400
+    
+    return jsonify({'status': 'success', 'applied': applied, 'version': SIGNAL_ENGINE.version})
+
+REPLAY = None  # Current or last ReplayFeed of this worker
+
+@app.route('/api/replay', methods=['GET', 'POST', 'DELETE'])
+def api_replay():
+    """Replay stored bars into the signal engine at a speed multiplier; GET reports, DELETE stops.
+
+    POST returns as soon as the replay starts (202), or with ?wait=<s> once
+    it ends (200) or the wait runs out (202).
+    """
+    global REPLAY
+    if request.method == 'GET':
+        if REPLAY is None:
+            return jsonify({'status': 'error', 'error': 'No replay has been started'}), 404
+        return jsonify(REPLAY.stats())
+    if request.method == 'DELETE':
+        if REPLAY is None or not REPLAY.running:
+            return jsonify({'status': 'error', 'error': 'No replay is running'}), 404
+        REPLAY.stop()
+        log_event(f"Replay stopped after {REPLAY.processed} ticks")
+        return jsonify(REPLAY.stats())
+    
+    if REPLAY is not None and REPLAY.running:
+        return jsonify({'status': 'error', 'error': 'A replay is already running'}), 409
+    body = request.get_json(silent=True) or {}
+    try:
+        symbols = check_symbols(body['symbols']) if body.get('symbols') else get_bar_store().symbols()
+        if len(symbols) > CONFIG['replay_max_symbols']:
+            raise ValueError(f"{len(symbols)} symbols exceeds limit of {CONFIG['replay_max_symbols']}")
+        speed = body.get('speed', 1.0)
+        if speed != 'max' and not isinstance(speed, (int, float)):
+            raise ValueError("speed must be a number (0 for as fast as possible) or 'max'")
+        market_data = load_market_data(
+            symbols,
+            backtest.parse_timestamp(body.get('start_date')),
+            backtest.parse_timestamp(body.get('end_date'))
+        )
+        # The live engine belongs to the signal owner process in production mode
+        isolated = bool(body.get('isolated')) or TICK_QUEUE is not None
+        from lab import replay
+        paper = None
+        if body.get('paper_trade'):
+            paper = portfolio.Portfolio(
+                [bars.symbol for bars in market_data],
+                float(body.get('initial_cash', 100000)),
+                float(body.get('max_position_size', 0.1)),
+                float(body.get('commission', 0.001)),
+                track_stats=True
+            )
+        feed = replay.ReplayFeed(
+            market_data,
+            indicators.SignalEngine() if isolated else SIGNAL_ENGINE,
+            speed=0.0 if speed == 'max' else float(speed),
+            queue_size=int(body.get('queue_size', CONFIG['replay_queue_size'])),
+            policy=body.get('policy', CONFIG['replay_policy']),
+            batch_size=int(body.get('batch_size', 256)),
+            observe=lambda seconds: REPLAY_LATENCY.observe((), seconds),
+            portfolio=paper
+        )
+    except FileNotFoundError as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 400
+    
+    REPLAY = feed.start()
+    log_event(f"Replay started: {len(symbols)} symbols at {feed.speed or 'max'}x, "
+              f"{feed.policy} policy, queue {feed.queue_size}{' (isolated engine)' if isolated else ''}")
+    wait = request.args.get('wait', 0, type=float)
+    finished = wait > 0 and feed.wait(wait)
+    return jsonify(dict(feed.stats(), isolated=isolated)), 200 if finished else 202
+
+BAR_STORE = barstore.BarStore(CONFIG['store_path'])
+_ingest_lock = threading.Lock()
+
+def get_bar_store() -> barstore.BarStore:
+    """Bar store for CONFIG['store_path'], reopened if the path changes"""
+    global BAR_STORE
+    if BAR_STORE.root != CONFIG['store_path']:
+        BAR_STORE = barstore.BarStore(CONFIG['store_path'])
+    return BAR_STORE
+
+def ensure_ingested(symbol: str) -> barstore.BarStore:
+    """Convert a symbol's CSV into the columnar store if it is missing or stale"""
+    if not barstore.valid_symbol(symbol):
+        raise ValueError(f"Invalid symbol name: {symbol!r}")  # Never a path outside data_path/store_path
+    store = get_bar_store()
+    csv_path = os.path.join(CONFIG['data_path'], f"{symbol}.csv")
+    has_csv = os.path.exists(csv_path)
+    if store.has(symbol) and not (has_csv and os.stat(csv_path).st_mtime > store.mtime(symbol)):
+        return store
+    if not has_csv:
+        raise FileNotFoundError(f"No market data for {symbol}")
+    with _ingest_lock:
+        if not store.has(symbol) or os.stat(csv_path).st_mtime > store.mtime(symbol):
+            log_event(f"Ingesting {symbol} into columnar store")
+            store.ingest_csv(csv_path, symbol)
+    return store
+
+def load_market_data(symbols: List[str], start=None, end=None) -> List[backtest.Bars]:
+    """Per-symbol bars restricted to (start, end), read from the columnar store"""
+    return [ensure_ingested(symbol).read(symbol, start, end) for symbol in symbols]
+
+def check_symbols(symbols) -> List[str]:
+    """`symbols` from a request body; ValueError unless it is a non-empty list of plain names"""
+    if not isinstance(symbols, list) or not symbols or not all(barstore.valid_symbol(s) for s in symbols):
+        raise ValueError("symbols must be a non-empty list of symbol names (letters, digits, '.', '_', '-')")
+    return symbols
+
+def check_params(params) -> Dict[str, Any]:
+    """Strategy `params` from a request body; ValueError unless it is an object"""
+    if not isinstance(params, dict):
+        raise ValueError("params must map parameter names to values")
+    return params
+
+def check_workers(workers) -> int:
+    """Process count for a request: the body's `workers`, capped at optimize_workers (CPU count when None)"""
+    limit = CONFIG['optimize_workers'] or os.cpu_count() or 1
+    if workers is None:
+        return limit
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise ValueError("workers must be a positive integer")
+    return min(workers, limit)
+
+def check_parameter_ranges(parameter_ranges) -> Dict[str, list]:
+    """`parameter_ranges` from a request body; ValueError unless it maps names to non-empty lists"""
+    if (not isinstance(parameter_ranges, dict) or not parameter_ranges
+            or not all(isinstance(v, list) and v for v in parameter_ranges.values())):
+        raise ValueError("parameter_ranges must map parameter names to lists of values")
+    return parameter_ranges
+
+RESULT_CACHE = None
+
+def get_result_cache() -> resultcache.ResultCache:
+    """Result cache for CONFIG['result_cache_path'], reopened if the path or bounds change"""
+    global RESULT_CACHE
+    settings = (CONFIG['result_cache_path'], CONFIG['result_cache_entries'], CONFIG['result_cache_bytes'])
+    if RESULT_CACHE is None or (RESULT_CACHE.directory, RESULT_CACHE.memory_entries,
+                                RESULT_CACHE.disk_bytes) != settings:
+        RESULT_CACHE = resultcache.ResultCache(*settings)
+    return RESULT_CACHE
+
+def data_fingerprints(symbols: List[str]) -> List[list]:
+    """[symbol, store fingerprint] per symbol, ingesting stale CSVs first"""
+    return [[symbol, ensure_ingested(symbol).fingerprint(symbol)] for symbol in symbols]
+
+def result_key(kind: str, strategy_type: str, params: Dict[str, Any], fingerprints: List[list], start, end,
+               options: Dict[str, Any]) -> str:
+    """Content hash of a backtest: strategy, resolved parameters, symbol data, range and options"""
+    strategy_key, _, resolved = backtest.resolve_strategy(strategy_type, params)
+    return resultcache.content_key({
+        'kind': kind,
+        'strategy': strategy_key,
+        'params': resolved,
+        'data': fingerprints,
+        'range': [None if start is None else str(start), None if end is None else str(end)],
+        'options': options
     })
 
+TRADE_SCHEMA = {'type': 'category', 'symbol': 'category', 'quantity': 'int64', 'price': 'float32',
+                'timestamp': 'time', 'commission': 'float32', 'pnl': 'float32'}
+
+def use_result_cache(body: Dict[str, Any]) -> bool:
+    """Cache lookups are skipped with {"cache": false} in the request body"""
+    return body.get('cache', True) is not False and CONFIG['result_cache_entries'] > 0
+
+@app.route('/api/backtest', methods=['POST'])
+def api_backtest():
+    """Run a vectorized backtest"""
+    body = request.get_json(silent=True) or {}
+    strategy_type = body.get('strategy', 'sma')
+    
+    try:
+        symbols = check_symbols(body.get('symbols', ['AAPL', 'GOOGL', 'MSFT']))
+        params = check_params(body.get('params', {}))
+        log_event(f"Backtest requested: {strategy_type} on {', '.join(symbols)}")
+        strategy_key = backtest.resolve_strategy(strategy_type, params)[0]
+        start = backtest.parse_timestamp(body.get('start_date'))
+        end = backtest.parse_timestamp(body.get('end_date'))
+        options = {
+            'initial_cash': float(body.get('initial_cash', 100000)),
+            'max_position_size': float(body.get('max_position_size', 0.1)),
+            'commission': float(body.get('commission', 0.001))
+        }
+        cache = get_result_cache() if use_result_cache(body) else None
+        key = result_key('backtest', strategy_type, params, data_fingerprints(symbols), start, end, options)
+        results = cache.get(key) if cache is not None else None
+        hit = results is not None
+        if not hit:
+            market_data = load_market_data(symbols, start, end)
+            results = backtest.run_backtest(strategy_type, params, market_data, **options)
+    except FileNotFoundError as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 400
+    if cache is not None and not hit:
+        cache.put(key, results)
+    
+    if hit:
+        log_event(f"Backtest served from result cache ({key[:12]})")
+    else:
+        BACKTEST_SECONDS.observe((strategy_key,), results['processing_time_ms'] / 1000)
+        log_event(f"Backtest finished: {results['bars_processed']} bars in {results['processing_time_ms']}ms")
+    fmt = response_format()
+    if fmt == 'json':
+        response = jsonify(results)
+    else:
+        trades = results['trades']
+        head = dict({k: v for k, v in results.items() if k != 'trades'}, trades_count=len(trades))
+        response = stream_rows(fmt, head, columnar.record_batches(trades, TRADE_SCHEMA, CONFIG['stream_batch_rows']),
+                               TRADE_SCHEMA)
+    response.headers['X-Cache'] = 'hit' if hit else 'miss'
+    return response
+
+def warm_up_signals():
+    """Seed the signal engine with the most recent stored bars of every symbol"""
+    store = get_bar_store()
+    for symbol in store.symbols():
+        bars = store.bars(symbol)
+        recent = slice(max(0, len(bars) - CONFIG['signal_warmup_bars']), len(bars))
+        for timestamp, close in zip(bars.timestamp[recent], bars.close[recent].tolist()):
+            SIGNAL_ENGINE.update(symbol, close, backtest.format_timestamp(timestamp))
+    log_event(f"Signal engine warmed up for {len(SIGNAL_ENGINE.states)} symbols")
+
+@app.route('/api/optimize', methods=['POST'])
+def api_optimize():
+    """Parallel parameter grid search, streamed as NDJSON"""
+    body = request.get_json(silent=True) or {}
+    strategy_type = body.get('strategy', 'sma')
+    
+    try:
+        symbols = check_symbols(body.get('symbols', ['AAPL', 'GOOGL', 'MSFT']))
+        parameter_ranges = check_parameter_ranges(body.get('parameter_ranges', {}))
+        total = 1
+        for values in parameter_ranges.values():
+            total *= len(values)
+        if total > CONFIG['optimize_max_combinations']:
+            raise ValueError(f"{total} combinations exceeds limit of {CONFIG['optimize_max_combinations']}")
+        start = backtest.parse_timestamp(body.get('start_date'))
+        end = backtest.parse_timestamp(body.get('end_date'))
+        market_data = load_market_data(symbols, start, end)
+        options = {
+            'initial_cash': float(body.get('initial_cash', 100000)),
+            'max_position_size': float(body.get('max_position_size', 0.1)),
+            'commission': float(body.get('commission', 0.001))
+        }
+        fingerprints = data_fingerprints(symbols)
+        
+        def cache_key(params):
+            return result_key('optimize', strategy_type, params, fingerprints, start, end, options)
+        
+        from lab import optimizer  # Pulls in multiprocessing; only needed here
+        results = optimizer.optimize_strategy(
+            strategy_type,
+            market_data,
+            parameter_ranges,
+            workers=check_workers(body.get('workers')),
+            cache=get_result_cache() if use_result_cache(body) else None,
+            cache_key=cache_key,
+            **options
+        )
+    except FileNotFoundError as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 400
+    
+    log_event(f"Optimization started: {strategy_type} over {total} combinations")
+    
+    def generate():
+        for record in results:
+            if record['type'] == 'summary':
+                OPTIMIZER_SECONDS.observe((strategy_type,), record['processing_time_ms'] / 1000)
+                OPTIMIZER_COMBINATIONS.inc((strategy_type,), record['completed'] - record['cache_hits'])
+                log_event(f"Optimization finished: {record['completed']} combinations in {record['processing_time_ms']}ms")
+            yield json.dumps(record) + '\n'
+    
+    return app.response_class(generate(), mimetype='application/x-ndjson')
+
+@app.route('/api/walkforward', methods=['POST'])
+def api_walkforward():
+    """Walk-forward evaluation over train/test folds, streamed as NDJSON"""
+    body = request.get_json(silent=True) or {}
+    strategy_type = body.get('strategy', 'sma')
+    parameter_ranges = body.get('parameter_ranges') or None
+    
+    try:
+        symbols = check_symbols(body.get('symbols', ['AAPL', 'GOOGL', 'MSFT']))
+        params = check_params(body.get('params', {}))
+        folds = int(body.get('folds', 10))
+        if not 1 <= folds <= CONFIG['walkforward_max_folds']:
+            raise ValueError(f"folds must be between 1 and {CONFIG['walkforward_max_folds']}")
+        total = folds
+        if parameter_ranges is not None:
+            check_parameter_ranges(parameter_ranges)
+            for values in parameter_ranges.values():
+                total *= len(values)
+        if total > CONFIG['optimize_max_combinations']:
+            raise ValueError(f"{total} fold backtests exceeds limit of {CONFIG['optimize_max_combinations']}")
+        start = backtest.parse_timestamp(body.get('start_date'))
+        end = backtest.parse_timestamp(body.get('end_date'))
+        market_data = load_market_data(symbols, start, end)
+        from lab import walkforward  # Pulls in multiprocessing; only needed here
+        results = walkforward.walk_forward(
+            strategy_type,
+            market_data,
+            folds,
+            parameter_ranges=parameter_ranges,
+            params=params,
+            train_periods=int(body.get('train_periods', 3)),
+            mode=body.get('mode', 'rolling'),
+            workers=check_workers(body.get('workers')),
+            initial_cash=float(body.get('initial_cash', 100000)),
+            max_position_size=float(body.get('max_position_size', 0.1)),
+            commission=float(body.get('commission', 0.001))
+        )
+    except FileNotFoundError as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 400
+    
+    log_event(f"Walk-forward started: {strategy_type} over {folds} folds")
+    
+    def generate():
+        for record in results:
+            if record['type'] == 'summary':
+                WALKFORWARD_SECONDS.observe((strategy_type,), record['processing_time_ms'] / 1000)
+                WALKFORWARD_FOLDS.inc((strategy_type,), record['completed'])
+                log_event(f"Walk-forward finished: {record['completed']} folds in {record['processing_time_ms']}ms")
+            yield json.dumps(record) + '\n'
+    
+    return app.response_class(generate(), mimetype='application/x-ndjson')
+
+_ensemble_cache = {}
+
+def get_trained_ensemble():
+    """Ensemble saved at model_path (reloaded when it changes), or None before the first training"""
+    path = CONFIG['model_path']
+    if not os.path.exists(path):
+        return None
+    key = (path, os.stat(path).st_mtime)
+    if key not in _ensemble_cache:
+        _ensemble_cache.clear()
+        _ensemble_cache[key] = inference.Ensemble.load(path, 'ensemble-v1')
+    return _ensemble_cache[key]
+
+def dataset_selection():
+    """Feature subset (?features=a,b) and era range (?start_era=&end_era=) from the query"""
+    features = request.args.get('features')
+    era_range = (request.args.get('start_era', type=int), request.args.get('end_era', type=int))
+    return features.split(',') if features else None, era_range
+
+def load_dataset(path: str) -> dataset.FeatureMatrix:
+    """uint8 feature matrix for `path`, converting the CSV into dataset_cache on first use"""
+    start = time.time()
+    fresh = not dataset.is_cached(path, CONFIG['dataset_cache'])
+    matrix = dataset.load(path, CONFIG['dataset_cache'], CONFIG['predict_chunk_rows'])
+    if fresh:
+        log_event(f"Converted {os.path.basename(path)} to a {len(matrix)}x{len(matrix.feature_names)} "
+                  f"uint8 matrix in {time.time() - start:.2f}s")
+    return matrix
+
+def run_prediction_job(job: jobs.Job) -> Dict[str, Any]:
+    """Job body for /api/predict"""
+    features, era_range = job.params['features'], tuple(job.params['era_range'])
+    job.report(0.0, 'loading dataset')
+    matrix = load_dataset(CONFIG['tournament_path'])
+    ensemble = get_trained_ensemble()
+    features = features or (ensemble.features if ensemble is not None else None)
+    if ensemble is None:
+        ensemble = inference.Ensemble.initial(len(matrix.feature_indices(features)))
+    
+    rows = matrix.row_range(era_range)
+    total = max(rows.stop - rows.start, 1)
+    last = [0, time.perf_counter()]  # Rows and time at the previous chunk
+    
+    def progress(done: int):
+        now = time.perf_counter()
+        PREDICTION_BATCH_SECONDS.observe((), now - last[1])
+        PREDICTION_ROWS.inc((), done - last[0])
+        last[:] = [done, now]
+        job.report(done / total)
+    
+    job.report(0.0, 'predicting')
+    summary = inference.predict_chunks(matrix.iter_chunks(job.params['chunk_rows'], features, era_range),
+                                       ensemble, CONFIG['predictions_path'], progress=progress)
+    
+    set_model_predictions(summary)
+    log_event(f"Predictions written: {summary['count']} rows in {summary['chunks']} chunks "
+              f"({summary['rows_per_sec']} rows/s)")
+    return summary
+
+def run_training_job(job: jobs.Job) -> Dict[str, Any]:
+    """Job body for /api/train"""
+    features, era_range = job.params['features'], tuple(job.params['era_range'])
+    job.report(0.0, 'loading dataset')
+    matrix = load_dataset(CONFIG['training_path'])
+    names = [matrix.feature_names[i] for i in matrix.feature_indices(features)]
+    
+    rows = matrix.row_range(era_range)
+    total = max(rows.stop - rows.start, 1)
+    job.report(0.0, 'fitting')
+    ensemble, stats = inference.fit_ensemble(matrix.iter_chunks(job.params['chunk_rows'], features, era_range),
+                                             names, alpha=CONFIG['train_ridge_alpha'],
+                                             progress=lambda done: job.report(done / total))
+    job.report(1.0, 'saving model')
+    os.makedirs(os.path.dirname(CONFIG['model_path']) or '.', exist_ok=True)
+    ensemble.save(CONFIG['model_path'])
+    
+    log_event(f"Model trained on {stats['rows']} rows x {stats['features_used']} features "
+              f"in {stats['processing_time_ms']}ms")
+    return dict(stats, model=ensemble.name, members=list(ensemble.members), model_path=CONFIG['model_path'])
+
+_meta_model_cache = {}
+
+def load_meta_model(matrix: dataset.FeatureMatrix, rows):
+    """Meta-model predictions for `rows` from meta_model_path, or None when missing or incomplete"""
+    path = CONFIG['meta_model_path']
+    if not path or not os.path.exists(path):
+        return None
+    key = (path, os.stat(path).st_mtime)
+    if key not in _meta_model_cache:
+        _meta_model_cache.clear()
+        _meta_model_cache[key] = scoring.read_predictions(path)
+    values, covered = scoring.align(_meta_model_cache[key], matrix.ids[rows].tolist())
+    if values is None:
+        log_event(f"Meta-model predictions cover {covered}/{len(rows)} scored rows; skipping MMC", 'warning')
+    return values
+
+def candidate_models() -> Dict[str, inference.Ensemble]:
+    """The current model plus every .npz ensemble in candidate_models_path"""
+    models = {'ensemble-v1': get_trained_ensemble()}
+    directory = CONFIG['candidate_models_path']
+    if directory and os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.npz'):
+                models[name[:-4]] = inference.Ensemble.load(os.path.join(directory, name))
+    return models
+
+def run_scoring_job(job: jobs.Job) -> Dict[str, Any]:
+    """Job body for /api/score"""
+    start = time.time()
+    features, era_range = job.params['features'], tuple(job.params['era_range'])
+    job.report(0.0, 'loading dataset')
+    matrix = load_dataset(CONFIG['validation_path'] or CONFIG['tournament_path'])
+    rows, index = scoring.target_rows(matrix, era_range)
+    if len(rows) == 0:
+        raise ValueError("No rows with targets to score against")
+    
+    models = candidate_models()
+    predictions = {}
+    for n, (name, ensemble) in enumerate(models.items()):
+        columns = features or (ensemble.features if ensemble is not None else None)
+        if ensemble is None:
+            ensemble = inference.Ensemble.initial(len(matrix.feature_indices(columns)))
+        predictions[name] = scoring.predict_rows(ensemble, matrix, rows, columns, job.params['chunk_rows'])
+        job.report((n + 1) / (len(models) + 1), f'predicted {name}')
+    
+    job.report(len(models) / (len(models) + 1), 'scoring')
+    meta = load_meta_model(matrix, rows)
+    summary = {
+        'models': scoring.score_many(predictions, matrix.targets[rows], index, meta),
+        'eras': len(index.sizes),
+        'rows': len(rows),
+        'meta_model': meta is not None,
+        'scored_at': datetime.datetime.now().isoformat(),
+        'processing_time_ms': int((time.time() - start) * 1000)
+    }
+    set_model_scores(summary)
+    log_event(f"Scored {len(models)} models on {len(rows)} rows over {len(index.sizes)} eras "
+              f"in {summary['processing_time_ms']}ms")
+    return summary
+
+def default_prediction_priority() -> str:
+    """'deadline' within deadline_window_hours of the tournament deadline, else 'normal'"""
+    deadline = datetime.datetime.fromisoformat(CONFIG['tournament_deadline'].replace('Z', '+00:00'))
+    remaining = deadline - datetime.datetime.now(datetime.timezone.utc)
+    if datetime.timedelta(0) <= remaining <= datetime.timedelta(hours=CONFIG['deadline_window_hours']):
+        return 'deadline'
+    return 'normal'
+
+def submit_job(kind: str, fn, path: str, default_priority: str, label: str):
+    """Queue a dataset job from the request's query parameters; ?wait=<s> blocks for the result"""
+    if not os.path.exists(path):
+        return jsonify({'status': 'error', 'error': f"{label} data not found: {path}"}), 404
+    features, era_range = dataset_selection()
+    params = {
+        'chunk_rows': request.args.get('chunk_rows', CONFIG['predict_chunk_rows'], type=int),
+        'features': features,
+        'era_range': era_range
+    }
+    if params['chunk_rows'] < 1:
+        return jsonify({'status': 'error', 'error': 'chunk_rows must be positive'}), 400
+    
+    try:
+        job = JOB_SCHEDULER.submit(kind, fn, request.args.get('priority', default_priority), params)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 400
+    except jobs.QueueFull as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503
+    log_event(f"{label} job {job.id} queued ({job.priority} priority)")
+    
+    wait = min(request.args.get('wait', 0, type=float), CONFIG['job_max_wait'])
+    record = JOB_SCHEDULER.wait(job.id, wait) if wait > 0 else job.to_dict()
+    return job_response(record)
+
+def job_response(record: Dict[str, Any]):
+    body = dict(record, job_url=f"/api/jobs/{record['job_id']}")
+    return jsonify(body), (200 if record['status'] in jobs.FINISHED else 202)
+
+@app.route('/api/predict')
+def api_predict():
+    """Queue a chunked prediction run over the tournament data"""
+    return submit_job('predict', run_prediction_job, CONFIG['tournament_path'],
+                      default_prediction_priority(), 'Prediction')
+
 @app.route('/api/train')
 def api_train():
-    """Train model"""
-    log_event("Model training started")
-    
+    """Queue a training run on the training data"""
+    return submit_job('train', run_training_job, CONFIG['training_path'], 'exploratory', 'Training')
+
+@app.route('/api/score')
+def api_score():
+    """Queue per-era correlation/MMC scoring of the current and candidate models"""
+    return submit_job('score', run_scoring_job, CONFIG['validation_path'] or CONFIG['tournament_path'],
+                      'exploratory', 'Validation')
+
+@app.route('/api/jobs')
+def api_jobs():
+    """Recent jobs of this worker, newest first"""
     return jsonify({
-        'status': 'started',
-        'model': 'ensemble-v2',
-        'eta_minutes': 45,
-        'message': 'Training initiated with latest tournament data'
+        'jobs': JOB_SCHEDULER.list(request.args.get('limit', 50, type=int)),
+        'stats': JOB_SCHEDULER.stats()
     })
 
+@app.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+def api_job(job_id):
+    """Job progress and result; DELETE cancels"""
+    if request.method == 'DELETE':
+        record = JOB_SCHEDULER.cancel(job_id)
+        if record is not None:
+            log_event(f"Job {job_id} cancel requested")
+    else:
+        record = JOB_SCHEDULER.get(job_id)
+    if record is None:
+        return jsonify({'status': 'error', 'error': f"Unknown job: {job_id}"}), 404
+    return job_response(record)
+
 @app.route('/api/repl')
 def api_repl():
     """Clojure REPL interface"""
     log_event("REPL interface accessed")
-    
-    repl_html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Clojure REPL - Numerai Electric</title>
-        <style>
-            body { 
-                font-family: 'Monaco', monospace; 
-                background: #000; 
-                color: #00ff41; 
-                padding: 20px; 
-                margin: 0;
-            }
-            .repl-container { 
-                max-width: 1000px; 
-                margin: 0 auto; 
-                background: rgba(0, 255, 65, 0.05);
-                border: 1px solid #00ff41;
-                border-radius: 10px;
-                padding: 20px;
-            }
-            .repl-output { 
-                height: 400px; 
-                overflow-y: auto; 
-                background: #000; 
-                padding: 15px; 
-                border: 1px solid #00ff41;
-                border-radius: 5px;
-                margin-bottom: 15px;
-            }
-            .repl-input { 
-                width: 100%; 
-                padding: 10px; 
-                background: #000; 
-                color: #00ff41; 
-                border: 1px solid #00ff41;
-                border-radius: 5px;
-                font-family: inherit;
-                font-size: 14px;
-            }
-            .prompt { color: #00ff41; }
-            .result { color: #ffffff; }
-            .error { color: #ff4444; }
-        </style>
-    </head>
-    <body>
-        <div class="repl-container">
-            <h2>🔧 Clojure REPL - Numerai Electric Lab</h2>
-            <div class="repl-output" id="output">
-                <div class="prompt">numerai-electric=> (println "REPL Ready!")</div>
-                <div class="result">REPL Ready!</div>
-                <div class="result">nil</div>
-                <div class="prompt">numerai-electric=> (require '[numerai.core :as num])</div>
-                <div class="result">nil</div>
-                <div class="prompt">numerai-electric=> (num/system-status)</div>
-                <div class="result">{:status :online, :models 3, :predictions-ready true}</div>
-                <div class="prompt">numerai-electric=> </div>
-            </div>
-            <input type="text" class="repl-input" id="input" placeholder="Enter Clojure expression..." />
-            <p style="margin-top: 15px; color: #666;">
-                Connected to Numerai Electric REPL • Press Enter to evaluate • Type (help) for commands
-            </p>
-        </div>
-        
-        <script>
-            const output = document.getElementById('output');
-            const input = document.getElementById('input');
-            
-            input.addEventListener('keypress', function(e) {
-                if (e.key === 'Enter') {
-                    const expr = input.value.trim();
-                    if (expr) {
-                        // Add input to output
-                        const promptDiv = document.createElement('div');
-                        promptDiv.className = 'prompt';
-                        promptDiv.textContent = 'numerai-electric=> ' + expr;
-                        output.appendChild(promptDiv);
-                        
-                        // Simulate evaluation
-                        const resultDiv = document.createElement('div');
-                        resultDiv.className = 'result';
-                        
-                        if (expr === '(help)') {
-                            resultDiv.innerHTML = `Available commands:<br/>
-                            (num/get-tournament-data) - Get current tournament info<br/>
-                            (num/train-model opts) - Train a new model<br/>
-                            (num/generate-predictions) - Generate predictions<br/>
-                            (num/get-signals) - Get trading signals<br/>
-                            (system/status) - System status`;
-                        } else if (expr.includes('num/')) {
-                            resultDiv.textContent = '{:status :executed, :result :simulated}';
-                        } else {
-                            try {
-                                resultDiv.textContent = eval(expr.replace(/^\(|\)$/g, ''));
-                            } catch (e) {
-                                resultDiv.className = 'error';
-                                resultDiv.textContent = 'Error: ' + e.message;
-                            }
-                        }
-                        
-                        output.appendChild(resultDiv);
-                        
-                        // Add new prompt
-                        const newPromptDiv = document.createElement('div');
-                        newPromptDiv.className = 'prompt';
-                        newPromptDiv.textContent = 'numerai-electric=> ';
-                        output.appendChild(newPromptDiv);
-                        
-                        input.value = '';
-                        output.scrollTop = output.scrollHeight;
-                    }
-                }
-            });
-            
-            input.focus();
-        </script>
-    </body>
-    </html>
-    """
-    
-    return repl_html
+    return serve_asset(ASSETS['repl.html'])
 
 @app.route('/api/logs')
 def api_logs():
-    """System logs endpoint"""
+    """System logs endpoint; ?since=<seq> returns only newer records"""
     format_type = request.args.get('format', 'json')
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', None, type=int)
+    records = LOG_BUFFER.since(since, limit)
     
     if format_type == 'download':
         # Return logs as downloadable text file
-        logs_text = '\n'.join(SYSTEM_STATE['logs'])
+        logs_text = '\n'.join(logbuffer.format_record(r) for r in records)
         response = app.response_class(
             logs_text,
             mimetype='text/plain',
@@ -820,11 +1813,241 @@ def api_logs():
         return response
     
     return jsonify({
-        'logs': SYSTEM_STATE['logs'],
-        'total_entries': len(SYSTEM_STATE['logs']),
+        'logs': records,
+        'total_entries': len(LOG_BUFFER),
+        'capacity': LOG_BUFFER.capacity,
+        'last_seq': LOG_BUFFER.last_seq,
+        'next_since': records[-1]['seq'] if records else max(since, 0),
         'last_updated': datetime.datetime.now().isoformat()
     })
 
+def stream_status() -> Dict[str, Any]:
+    """Status fields pushed as deltas over /api/stream"""
+    return {
+        'status': 'running',
+        'version': CONFIG['version'],
+        'requests_served': get_request_count(),
+        'numerai_status': SYSTEM_STATE['numerai_status'],
+        'symbols_tracked': current_signals()[2],
+        'stream_clients': EVENT_BROKER.client_count
+    }
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events stream of new logs, changed signals and status deltas"""
+    if EVENT_BROKER.client_count >= CONFIG['stream_max_clients']:
+        return jsonify({'status': 'error', 'error': 'Too many stream clients'}), 503
+    
+    topics = set(request.args.get('topics', 'log,signals,status').split(','))
+    log_seq = request.args.get('since', type=int)
+    if log_seq is None:
+        log_seq = request.headers.get('Last-Event-ID', LOG_BUFFER.last_seq, type=int)
+    subscription = EVENT_BROKER.subscribe()
+    
+    def generate():
+        nonlocal log_seq
+        signal_version = 0
+        last_status = {}
+        last_sent = time.time()
+        try:
+            while True:
+                chunks = []
+                EVENT_BROKER.wait(subscription, CONFIG['stream_poll_interval'])
+                
+                if 'log' in topics:
+                    records = LOG_BUFFER.since(log_seq, CONFIG['stream_queue_size'])
+                    if records and records[0]['seq'] > log_seq + 1:
+                        chunks.append(streaming.format_event('resync', {'dropped': records[0]['seq'] - log_seq - 1}))
+                    for record in records:
+                        chunks.append(streaming.format_event('log', record, event_id=record['seq']))
+                    if records:
+                        log_seq = records[-1]['seq']
+                
+                if 'signals' in topics:
+                    version, changed, _ = current_signals(since_version=signal_version)
+                    signal_version = version
+                    if changed:
+                        chunks.append(streaming.format_event('signals', changed))
+                
+                if 'status' in topics:
+                    status = stream_status()
+                    delta = {k: v for k, v in status.items() if last_status.get(k) != v}
+                    last_status = status
+                    if delta:
+                        chunks.append(streaming.format_event('status', delta))
+                
+                now = time.time()
+                if chunks:
+                    last_sent = now
+                    yield ''.join(chunks)
+                elif now - last_sent >= CONFIG['stream_heartbeat_interval']:
+                    last_sent = now
+                    yield streaming.heartbeat()
+        finally:
+            EVENT_BROKER.unsubscribe(subscription)
+    
+    return app.response_class(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics, summed over all workers in production mode"""
+    snapshots = [metrics_snapshot()]
+    if SHARED is not None and WORKER_INDEX is not None:
+        publish_metrics()
+        for index in range(CONFIG['workers']):
+            if index != WORKER_INDEX:
+                snapshots.append(SHARED.get(f'metrics-{index}', {}))
+    return app.response_class(telemetry.render(telemetry.merge(snapshots)),
+                              content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/profiles')
+def api_profiles():
+    """Saved request profiles, plus the hottest functions seen by the always-on sampler"""
+    snapshots = [SAMPLER.snapshot()]
+    if SHARED is not None and WORKER_INDEX is not None:
+        for index in range(CONFIG['workers']):
+            if index != WORKER_INDEX:
+                snapshots.append(SHARED.get(f'profile-{index}', {}))
+    sampled = profiling.merge_snapshots(snapshots)
+    return jsonify({
+        'profiling_enabled': CONFIG['profiling_enabled'],
+        'profiles': profiling.list_profiles(CONFIG['profiles_path'], request.args.get('limit', 50, type=int)),
+        'sampler': {
+            'enabled': CONFIG['sampler_enabled'],
+            'interval': CONFIG['sampler_interval'],
+            'samples': sampled['samples'],
+            'top_functions': profiling.top_functions(sampled, request.args.get('top', 20, type=int))
+        }
+    })
+
+@app.route('/api/profiles/<name>')
+def api_profile_file(name):
+    """Download a saved profile (.pstats, .folded or its .json record)"""
+    if not name.endswith(profiling.SUFFIXES):
+        return jsonify({'status': 'error', 'error': f"Unknown profile file: {name}"}), 404
+    return send_from_directory(CONFIG['profiles_path'], name)
+
+# Endpoints that stream, block or recurse cannot be sub-requests
+BATCH_EXCLUDED = {'api_batch', 'api_stream', 'api_optimize', 'api_walkforward', 'api_repl', 'api_profile_file'}
+BATCH_EXECUTOR = None
+BATCH_EXECUTOR_LOCK = threading.Lock()
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    """Thread pool for concurrent sub-requests, resized when batch_workers changes"""
+    global BATCH_EXECUTOR
+    with BATCH_EXECUTOR_LOCK:
+        if BATCH_EXECUTOR is None or BATCH_EXECUTOR._max_workers != CONFIG['batch_workers']:
+            if BATCH_EXECUTOR is not None:
+                BATCH_EXECUTOR.shutdown(wait=False)
+            BATCH_EXECUTOR = ThreadPoolExecutor(CONFIG['batch_workers'], thread_name_prefix='batch')
+        return BATCH_EXECUTOR
+
+def run_subrequest(spec: Dict[str, Any], base_url: str):
+    """Dispatch one sub-request straight to its view function: (status, encoded batch response entry).
+
+    JSON bodies are spliced in as the view produced them (cached routes hand
+    back their pre-encoded bytes) rather than decoded and re-encoded.
+    """
+    dumps = app.json.dumps
+    method = spec['method']
+    route, status = 'unmatched', 500
+    entry = {'id': spec['id'], 'method': method, 'path': spec['path']}
+    try:
+        with app.test_request_context(spec['path'], base_url=base_url, method=method, json=spec.get('body'),
+                                      headers=spec.get('headers')) as ctx:
+            sub = ctx.request
+            if sub.routing_exception is not None:
+                raise sub.routing_exception
+            route = sub.url_rule.rule
+            if sub.url_rule.endpoint in BATCH_EXCLUDED:
+                status = 400
+                raise ValueError(f"{route} cannot be batched")
+            response = app.make_response(app.view_functions[sub.url_rule.endpoint](**sub.view_args))
+            status = response.status_code
+            if response.is_streamed:
+                response.close()
+                status = 400
+                raise ValueError(f"{spec['path']} returned a streamed response, which cannot be batched")
+            data = response.get_data()
+            entry['status'] = status
+            if response.is_json and data.strip():
+                return status, dumps(entry)[:-1].encode() + b', "body": ' + data.rstrip() + b'}'
+            entry['body'] = data.decode('utf-8', 'replace')
+            return status, dumps(entry).encode()
+    except HTTPException as e:
+        status = e.code
+        entry.update(status=status, error=e.description)
+    except ValueError as e:
+        status = 400 if status == 500 else status
+        entry.update(status=status, error=str(e))
+    except Exception as e:
+        log_event(f"Batch sub-request {method} {spec['path']} failed: {type(e).__name__}: {e}", 'error')
+        status = 500
+        entry.update(status=status, error=f"{type(e).__name__}: {e}")
+    finally:
+        BATCH_SUBREQUESTS.inc((method, route, str(status)))
+    return status, dumps(entry).encode()
+
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    """Several API calls in one round trip.
+
+    Body: {"requests": [{"id", "method" (GET), "path", "body", "headers"}]}.
+    Runs of consecutive GET sub-requests execute concurrently; any other
+    method waits for everything before it and runs alone, so writes stay
+    ordered. Each entry reports its own status; the batch itself is 200
+    unless it is malformed or names a non-standard method.
+    """
+    started = time.perf_counter()
+    body = request.get_json(silent=True)
+    specs = body.get('requests') if isinstance(body, dict) else body
+    if not isinstance(specs, list) or not specs:
+        return jsonify({'status': 'error', 'error': 'Expected {"requests": [{"path": ...}, ...]}'}), 400
+    if len(specs) > CONFIG['batch_max_requests']:
+        return jsonify({'status': 'error',
+                        'error': f"At most {CONFIG['batch_max_requests']} sub-requests per batch"}), 400
+    normalized = []
+    for i, spec in enumerate(specs):
+        if isinstance(spec, str):
+            spec = {'path': spec}
+        if not isinstance(spec, dict) or not str(spec.get('path', '')).startswith('/'):
+            return jsonify({'status': 'error', 'error': f"Sub-request {i}: 'path' must start with '/'"}), 400
+        method = str(spec.get('method', 'GET')).upper()
+        if method not in BATCH_METHODS:
+            return jsonify({'status': 'error',
+                            'error': f"Sub-request {i}: unsupported method {method[:16]!r}"}), 400
+        normalized.append(dict(spec, id=spec.get('id', i), method=method))
+
+    # Stages: a run of consecutive GETs, or a single request of any other method
+    stages = []
+    for spec in normalized:
+        if spec['method'] == 'GET' and stages and stages[-1][0]['method'] == 'GET':
+            stages[-1].append(spec)
+        else:
+            stages.append([spec])
+    base_url = request.host_url
+    entries = []
+    for stage in stages:
+        if len(stage) == 1:
+            entries.append(run_subrequest(stage[0], base_url))
+        else:
+            entries.extend(get_batch_executor().map(run_subrequest, stage, [base_url] * len(stage)))
+
+    failed = sum(status >= 400 for status, _ in entries)
+    head = app.json.dumps({
+        'status': 'success' if not failed else 'partial',
+        'count': len(entries),
+        'failed': failed,
+        'processing_time_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+    responses = b', '.join(entry for _, entry in entries)
+    return app.response_class(head[:-1].encode() + b', "responses": [' + responses + b']}\n',
+                              mimetype='application/json')
+
 @app.route('/api/test')
 def api_test():
     """Test endpoint"""
@@ -838,11 +2061,21 @@ def api_test():
     })
 
 def initialize_system():
-    """Initialize the system"""
-    CONFIG['public_ip'] = get_public_ip()
+    """Initialize the system.
+
+    With fast_startup the public IP comes from the on-disk cache (possibly
+    stale or missing) and signal warm-up is left to start_background_tasks().
+    """
+    cached_ip, fresh = read_cached_public_ip()
+    if fresh or CONFIG['fast_startup']:
+        CONFIG['public_ip'] = cached_ip
+    else:
+        resolve_public_ip()
     
     log_event(f"Numerai Electric Trading Lab starting - Version {CONFIG['version']}")
     log_event(f"Configuration: {CONFIG}")
+    if not CONFIG['fast_startup']:
+        warm_up_signals()
     log_event("All systems initialized and ready")
     
     # Simulate initial model states
@@ -853,18 +2086,111 @@ def initialize_system():
         'predictions_ready': True
     }
 
+def start_background_tasks(warm_up: bool = True):
+    """Fast-startup work that runs after the server is accepting requests"""
+    if not read_cached_public_ip()[1]:
+        threading.Thread(target=resolve_public_ip, name='public-ip', daemon=True).start()
+    if warm_up:
+        threading.Thread(target=warm_up_signals, name='signal-warm-up', daemon=True).start()
+
+def enable_shared_state():
+    """Move counters, logs, signals and predictions into shared memory before forking"""
+    global SHARED, LOG_BUFFER, TICK_QUEUE
+    import multiprocessing
+    from lab import sharedstate
+    SHARED = sharedstate.SharedState(
+        counters=('request_count',),
+        slots=dict({
+            'signals': CONFIG['shared_signals_bytes'],
+            'predictions': CONFIG['shared_predictions_bytes'],
+            'scores': CONFIG['shared_scores_bytes'],
+            'config': CONFIG['shared_config_bytes']
+        }, **{f'metrics-{i}': CONFIG['shared_metrics_bytes'] for i in range(CONFIG['workers'])},
+           **{f'profile-{i}': CONFIG['shared_profile_bytes'] for i in range(CONFIG['workers'])}),
+        log_capacity=CONFIG['log_capacity'],
+        log_message_bytes=CONFIG['shared_log_message_bytes']
+    )
+    SHARED.increment('request_count', SYSTEM_STATE['request_count'])
+    for record in LOG_BUFFER.recent(CONFIG['log_capacity']):
+        SHARED.log.append(record['message'], record['level'])
+    LOG_BUFFER = SHARED.log
+    TICK_QUEUE = multiprocessing.Queue(CONFIG['tick_queue_size'])
+
+def init_worker(index: int):
+    """Runs in each pre-forked worker before it starts serving"""
+    global WORKER_INDEX
+    WORKER_INDEX = index
+    threading.Thread(target=run_metrics_publisher, name='metrics-publisher', daemon=True).start()
+
+def publish_signals():
+    try:
+        SHARED.publish('signals', SIGNAL_ENGINE.export())
+    except ValueError as e:
+        log_event(f"Signal snapshot not published: {e}", 'warning')
+
+def run_signal_owner():
+    """Helper process that owns SIGNAL_ENGINE in production mode.
+
+    Applies queued ticks in order and publishes a snapshot at most every
+    signal_publish_interval seconds while signals keep changing. With
+    fast_startup it also does the signal warm-up.
+    """
+    if CONFIG['fast_startup']:
+        warm_up_signals()
+    publish_signals()
+    published_version = SIGNAL_ENGINE.version
+    last_publish = time.monotonic()
+    while True:
+        try:
+            ticks = TICK_QUEUE.get(timeout=CONFIG['signal_publish_interval'])
+            SIGNAL_ENGINE.update_many(ticks)
+        except queue.Empty:
+            pass
+        except (KeyError, TypeError, ValueError) as e:
+            log_event(f"Dropped invalid tick batch: {e}", 'warning')
+        
+        now = time.monotonic()
+        if SIGNAL_ENGINE.version != published_version and now - last_publish >= CONFIG['signal_publish_interval']:
+            published_version = SIGNAL_ENGINE.version
+            last_publish = now
+            publish_signals()
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Numerai Electric Trading Lab')
+    parser.add_argument('--production', action='store_true',
+                        help='serve from pre-forked worker processes sharing state in shared memory')
+    parser.add_argument('--workers', type=int, default=CONFIG['workers'],
+                        help='worker processes in production mode (default: CPU count)')
+    parser.add_argument('--port', type=int, default=CONFIG['port'])
+    parser.add_argument('--fast-startup', action=argparse.BooleanOptionalAction, default=CONFIG['fast_startup'],
+                        help='bind immediately and resolve the public IP / warm up signals in the background')
+    args = parser.parse_args()
+    
+    CONFIG['port'] = args.port
+    CONFIG['fast_startup'] = args.fast_startup
+    if args.production:
+        CONFIG['debug'] = False
+        CONFIG['workers'] = args.workers or os.cpu_count() or 1
+        enable_shared_state()
     initialize_system()
     
     print(f"🚀 Starting Numerai Electric Trading Lab v{CONFIG['version']}")
-    print(f"🌐 Global access: http://{CONFIG['public_ip']}:{CONFIG['port']}")
+    print(f"🌐 Global access: http://{CONFIG['public_ip'] or '<resolving>'}:{CONFIG['port']}")
     print(f"📊 Local access: http://localhost:{CONFIG['port']}")
     print(f"🔗 Domain: http://{CONFIG['domain']}")
     print("⚡ Electric Clojure + Numerai integration ready!")
     
-    app.run(
-        host=CONFIG['host'],
-        port=CONFIG['port'],
-        debug=CONFIG['debug'],
-        threaded=True
-    )
\ No newline at end of file
+    if args.production:
+        from lab import prefork
+        prefork.serve_prefork(app, CONFIG['host'], CONFIG['port'], CONFIG['workers'],
+                              helpers=[run_signal_owner], log=log_event, worker_init=init_worker,
+                              on_start=lambda: start_background_tasks(warm_up=False) if args.fast_startup else None)
+    else:
+        if args.fast_startup:
+            start_background_tasks()
+        app.run(
+            host=CONFIG['host'],
+            port=CONFIG['port'],
+            debug=CONFIG['debug'],
+            threaded=True
+        )
\ No newline at end of file
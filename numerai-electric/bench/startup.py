@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark
+Launches app.py in production mode on a free port and measures the time
+until /health first answers, over several runs. Exits non-zero when the
+median exceeds --max-seconds so deploy pipelines catch regressions.
+
+    python bench/startup.py --runs 5 --max-seconds 2.0
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_response(extra_args, timeout: float) -> float:
+    """Seconds from process launch until GET /health returns 200"""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, APP, '--production', '--workers', '1', '--port', str(port)] + extra_args,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"app.py exited with status {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"No response within {timeout}s")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def time_import() -> float:
+    """Seconds to import the app module in a fresh interpreter"""
+    code = 'import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)'
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=os.path.dirname(APP),
+                                     stderr=subprocess.DEVNULL)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='fail when the median time to first response exceeds this')
+    parser.add_argument('--no-fast-startup', action='store_true',
+                        help='measure the blocking startup path instead')
+    args = parser.parse_args()
+
+    extra = ['--no-fast-startup'] if args.no_fast_startup else []
+    imports = [time_import() for _ in range(args.runs)]
+    first_response = [time_to_first_response(extra, args.timeout) for _ in range(args.runs)]
+
+    result = {
+        'runs': args.runs,
+        'fast_startup': not args.no_fast_startup,
+        'import_median_s': round(statistics.median(imports), 4),
+        'first_response_median_s': round(statistics.median(first_response), 4),
+        'first_response_max_s': round(max(first_response), 4)
+    }
+    print(json.dumps(result, indent=2))
+
+    if args.max_seconds is not None and result['first_response_median_s'] > args.max_seconds:
+        print(f"FAIL: median startup {result['first_response_median_s']}s > {args.max_seconds}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Endpoint and compute benchmark suite
+Drives every app.py route at several concurrency levels, either in-process
+through Flask's test client over generated data (fully offline) or against
+a running server with --url, and records throughput plus p50/p95/p99
+latency. Microbenchmarks time the backtest, indicator and metric code on
+synthetic OHLCV bars of several sizes. Results are compared against a
+stored baseline; any route p50 or micro median more than --threshold slower
+fails the run. Tail latency under concurrency is reported but not gated:
+on a small machine it is mostly scheduler noise. A baseline keeps the
+slowest of several rounds and a comparison the fastest of its rounds, so
+ordinary run-to-run noise is not reported as a regression.
+
+    python bench/suite.py                        # compare (best of 2 rounds) against bench/baseline.json
+    python bench/suite.py --save-baseline        # record a new baseline (3 rounds) on this machine
+    python bench/suite.py --only micro --sizes 10000,1000000
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lab import backtest, indicators, metrics, portfolio, scoring  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'bench', 'baseline.json')
+
+SYMBOLS = ('AAPL', 'GOOGL', 'MSFT')
+
+
+# ============================================================================
+# Synthetic data
+# ============================================================================
+
+def synthetic_bars(symbol: str, n: int, seed: int = 0) -> backtest.Bars:
+    """Geometric random-walk minute bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = np.abs(rng.normal(0, 0.001, n)) * close
+    opens = np.concatenate(([close[0]], close[:-1]))
+    timestamps = np.datetime64('2020-01-01T00:00', 'ns') + np.arange(n) * np.timedelta64(60, 's')
+    return backtest.Bars(symbol, timestamps, opens, np.maximum(opens, close) + spread,
+                         np.minimum(opens, close) - spread, close, rng.integers(100, 10000, n).astype(np.float64))
+
+
+def write_bars_csv(bars: backtest.Bars, path: str):
+    stamps = np.datetime_as_string(bars.timestamp, unit='s')
+    with open(path, 'w') as f:
+        f.write('timestamp,open,high,low,close,volume\n')
+        for row in zip(stamps.tolist(), bars.open.tolist(), bars.high.tolist(), bars.low.tolist(),
+                       bars.close.tolist(), bars.volume.tolist()):
+            f.write('{}Z,{},{},{},{},{}\n'.format(*row))
+
+
+def write_numerai_csv(path: str, rows: int, features: int, eras: int, targets: bool, seed: int = 0):
+    """Numerai-style CSV with quarter-step feature bins"""
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 5, (rows, features)) / 4
+    weights = rng.normal(0, 1, features)
+    y = np.clip(0.5 + (X - 0.5) @ weights / (4 * np.sqrt(features)) + rng.normal(0, 0.05, rows), 0, 1)
+    header = ['id', 'era', 'data_type'] + [f'feature_{i}' for i in range(features)] + (['target'] if targets else [])
+    with open(path, 'w') as f:
+        f.write(','.join(header) + '\n')
+        for i in range(rows):
+            values = [f'n{i:07d}', f'era{1 + i * eras // rows}', 'validation'] + [repr(v) for v in X[i].tolist()]
+            if targets:
+                values.append(f'{y[i]:.4f}')
+            f.write(','.join(values) + '\n')
+
+
+def prepare_app(directory: str, bars_per_symbol: int):
+    """Import app.py and point its data, model, job and every other writable path into `directory`"""
+    import app
+    from lab import jobs
+
+    logging.disable(logging.INFO)  # log_event would otherwise print every request
+    market = os.path.join(directory, 'market')
+    numerai = os.path.join(directory, 'numerai')
+    os.makedirs(market)
+    os.makedirs(numerai)
+    for seed, symbol in enumerate(SYMBOLS):
+        write_bars_csv(synthetic_bars(symbol, bars_per_symbol, seed), os.path.join(market, f'{symbol}.csv'))
+    write_numerai_csv(os.path.join(numerai, 'tournament.csv'), 5000, 100, 10, targets=False)
+    write_numerai_csv(os.path.join(numerai, 'training.csv'), 5000, 100, 10, targets=True, seed=1)
+
+    app.CONFIG.update({
+        'data_path': market,
+        'store_path': os.path.join(market, 'columnar'),
+        'result_cache_path': os.path.join(market, 'results'),
+        'tournament_path': os.path.join(numerai, 'tournament.csv'),
+        'training_path': os.path.join(numerai, 'training.csv'),
+        'validation_path': os.path.join(numerai, 'training.csv'),
+        'candidate_models_path': os.path.join(numerai, 'candidates'),
+        'meta_model_path': os.path.join(numerai, 'meta_model.csv'),
+        'model_path': os.path.join(numerai, 'ensemble.npz'),
+        'predictions_path': os.path.join(numerai, 'predictions.csv'),
+        'dataset_cache': os.path.join(numerai, 'cache'),
+        'jobs_path': os.path.join(numerai, 'jobs'),
+        'profiles_path': os.path.join(numerai, 'profiles'),
+        'public_ip_cache': os.path.join(directory, 'public_ip.json'),
+        'optimize_workers': 2,
+        'public_ip': '127.0.0.1'
+    })
+    app.JOB_SCHEDULER = jobs.JobScheduler(app.CONFIG['job_workers'], app.CONFIG['job_queue_size'],
+                                          app.CONFIG['jobs_path'])
+    app.warm_up_signals()
+    return app
+
+
+# ============================================================================
+# Route benchmarks
+# ============================================================================
+
+def _ticks(batch: int = 100) -> Dict[str, Any]:
+    rng = np.random.default_rng()
+    return {'ticks': [{'symbol': SYMBOLS[i % len(SYMBOLS)], 'price': float(p)}
+                      for i, p in enumerate(100 + rng.normal(0, 1, batch))]}
+
+
+# (name, method, path, JSON body or factory, heavy). Heavy routes get --heavy-requests
+# requests instead of --requests. /api/stream is timed to its first event.
+ROUTES = [
+    ('index', 'GET', '/', None, False),
+    ('asset', 'GET', '/assets/dashboard.css', None, False),
+    ('health', 'GET', '/health', None, False),
+    ('status', 'GET', '/api/status', None, False),
+    ('numerai', 'GET', '/api/numerai', None, False),
+    ('predictions', 'GET', '/api/predictions', None, False),
+    ('signals', 'GET', '/api/signals', None, False),
+    ('ticks', 'POST', '/api/ticks', _ticks, False),
+    ('replay', 'POST', '/api/replay?wait=60', {'symbols': list(SYMBOLS), 'speed': 'max', 'isolated': True}, True),
+    # Result-cache hits would hide the engine's cost
+    ('backtest', 'POST', '/api/backtest', {'strategy': 'sma', 'symbols': list(SYMBOLS), 'cache': False}, True),
+    ('optimize', 'POST', '/api/optimize', {'strategy': 'sma', 'symbols': list(SYMBOLS[:1]),
+                                           'parameter_ranges': {'short_window': [5, 10],
+                                                                'long_window': [20, 40]},
+                                           'cache': False}, True),
+    ('walkforward', 'POST', '/api/walkforward', {'strategy': 'sma', 'symbols': list(SYMBOLS[:1]), 'folds': 4,
+                                                 'parameter_ranges': {'short_window': [5, 10]}, 'workers': 2},
+     True),
+    ('predict', 'GET', '/api/predict?wait=60', None, True),
+    ('train', 'GET', '/api/train?wait=60&priority=normal', None, True),
+    ('score', 'GET', '/api/score?wait=60&priority=normal', None, True),
+    ('jobs', 'GET', '/api/jobs', None, False),
+    ('job', 'GET', '/api/jobs/{job_id}', None, False),
+    ('repl', 'GET', '/api/repl', None, False),
+    ('logs', 'GET', '/api/logs', None, False),
+    ('stream', 'GET', '/api/stream', None, True),
+    ('batch', 'POST', '/api/batch', {'requests': ['/api/status', '/api/signals', '/api/predictions', '/api/numerai',
+                                                  '/api/logs?limit=50']}, False),
+    ('metrics', 'GET', '/metrics', None, False),
+    ('profiles', 'GET', '/api/profiles?top=20', None, False),
+    ('test', 'GET', '/api/test', None, False),
+]
+
+# Routes that run one at a time server-side (concurrent requests get 409); timed at concurrency 1 only
+SERIAL_ROUTES = {'replay'}
+
+
+class TestClientTransport:
+    """Requests through Flask's test client (one client per thread)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client
+
+    def request(self, method: str, path: str, body) -> int:
+        if path == '/api/stream':
+            response = self._client().get(path, buffered=False)
+            next(iter(response.response), None)  # First event
+            response.close()
+            return response.status_code
+        response = self._client().open(path, method=method, json=body)
+        response.get_data()
+        return response.status_code
+
+
+class HTTPTransport:
+    """Requests to a running server"""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, body) -> int:
+        data = None if body is None else json.dumps(body).encode()
+        req = urllib.request.Request(self.url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'} if data else {})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                if path == '/api/stream':
+                    response.readline()
+                else:
+                    response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(np.ceil(q / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def run_load(transport, method: str, path: str, body, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Issue `requests` requests from `concurrency` threads; latency stats in milliseconds"""
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker():
+        local, failed = [], 0
+        while next(counter) < requests:
+            payload = body() if callable(body) else body
+            started = time.perf_counter()
+            try:
+                status = transport.request(method, path, payload)
+            except Exception:
+                status = 0
+            local.append(time.perf_counter() - started)
+            failed += status == 0 or status >= 400
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'errors': errors[0],
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3)
+    }
+
+
+def bench_routes(transport, concurrency: List[int], requests: int, heavy_requests: int,
+                 selected: List[str] = None) -> Dict[str, Any]:
+    # A finished job for /api/jobs/<id>
+    job_id = 'unknown'
+    if hasattr(transport, 'app'):
+        response = transport._client().get('/api/predict?wait=60')
+        job_id = response.get_json().get('job_id', job_id)
+    else:
+        try:
+            with urllib.request.urlopen(transport.url + '/api/jobs', timeout=transport.timeout) as response:
+                jobs = json.load(response).get('jobs', [])
+                job_id = jobs[0]['job_id'] if jobs else job_id
+        except (OSError, ValueError):
+            pass
+
+    results = {}
+    for name, method, path, body, heavy in ROUTES:
+        if selected and name not in selected:
+            continue
+        path = path.format(job_id=job_id)
+        count = heavy_requests if heavy else requests
+        transport.request(method, path, body() if callable(body) else body)  # Warm caches and imports
+        for level in ([1] if name in SERIAL_ROUTES else concurrency):
+            stats = run_load(transport, method, path, body, count, level)
+            results[f'{name}@c{level}'] = dict(stats, route=f'{method} {path}')
+            print(f"  {name:<12} c={level:<3} {stats['throughput_rps']:>9.1f} req/s  "
+                  f"p50 {stats['p50_ms']:>8.2f}ms  p95 {stats['p95_ms']:>8.2f}ms  "
+                  f"p99 {stats['p99_ms']:>8.2f}ms  errors {stats['errors']}", file=sys.stderr)
+    return results
+
+
+# ============================================================================
+# Microbenchmarks
+# ============================================================================
+
+def _backtest(strategy: str):
+    def setup(n: int):
+        data = [synthetic_bars(symbol, n, seed) for seed, symbol in enumerate(SYMBOLS)]
+        return lambda: backtest.run_backtest(strategy, {}, data)
+    return setup
+
+
+def _signal_engine(n: int):
+    rng = np.random.default_rng(0)
+    ticks = [{'symbol': SYMBOLS[i % len(SYMBOLS)], 'price': float(p)}
+             for i, p in enumerate(100 * np.exp(np.cumsum(rng.normal(0, 0.002, n))))]
+    return lambda: indicators.SignalEngine().update_many(ticks)
+
+
+def _mark_to_market(n: int):
+    """Revalue a portfolio holding `n` names at fresh prices"""
+    rng = np.random.default_rng(0)
+    book = portfolio.Portfolio([f'S{i}' for i in range(n)], 1e12, 1e-6)
+    ids = np.arange(n)
+    book.apply_fills(ids, np.full(n, portfolio.BUY), rng.uniform(10, 100, n))
+    prices = rng.uniform(10, 100, n)
+
+    def run():
+        book.mark(ids, prices)
+        return book.value()
+    return run
+
+
+def _pnls(n: int) -> np.ndarray:
+    return np.random.default_rng(0).normal(5, 100, n)
+
+
+def _trade_metrics(n: int):
+    pnls = _pnls(n)
+    times = np.arange(n, dtype=np.int64) * 3600 * 10 ** 9
+    return lambda: metrics.trade_metrics(pnls, 100000.0, times)
+
+
+def _trade_stats(n: int):
+    """The same metrics accumulated one trade at a time"""
+    pnls = _pnls(n).tolist()
+
+    def run():
+        stats = metrics.TradeStats(100000.0)
+        for i, pnl in enumerate(pnls):
+            stats.push(pnl, i * 3600 * 10 ** 9)
+        return stats.snapshot()
+    return run
+
+
+def _score_many(n: int):
+    """Correlation and MMC of ten models over `n` rows in 100 eras"""
+    rng = np.random.default_rng(0)
+    index = scoring.EraIndex([f'era{i}' for i in range(100)], np.linspace(0, n, 101).astype(np.int64))
+    targets = rng.choice([0.0, 0.25, 0.5, 0.75, 1.0], n)
+    models = {f'model{i}': rng.random(n) for i in range(10)}
+    meta = rng.random(n)
+    return lambda: scoring.score_many(models, targets, index, meta)
+
+
+# name -> setup(size) returning the callable to time
+MICRO: Dict[str, Callable[[int], Callable[[], Any]]] = {
+    'backtest.sma': _backtest('sma'),
+    'backtest.mean_reversion': _backtest('mean_reversion'),
+    'backtest.momentum': _backtest('momentum'),
+    'backtest.sma_signals': lambda n: (lambda c: lambda: backtest.sma_signals(c, 10, 20))(
+        synthetic_bars('X', n).close),
+    'backtest.rolling_rsi': lambda n: (lambda c: lambda: backtest.rolling_rsi(c, 14))(
+        synthetic_bars('X', n).close),
+    'indicators.signal_engine': _signal_engine,
+    'portfolio.mark_to_market': _mark_to_market,
+    'metrics.sharpe_ratio': lambda n: (lambda p: lambda: metrics.sharpe_ratio(p))(_pnls(n)),
+    'metrics.max_drawdown': lambda n: (lambda p: lambda: metrics.max_drawdown(p, 100000.0))(_pnls(n)),
+    'metrics.trade_metrics': _trade_metrics,
+    'metrics.trade_stats': _trade_stats,
+    'scoring.score_many': _score_many,
+}
+
+
+def bench_micro(sizes: List[int], repeat: int, selected: List[str] = None) -> Dict[str, Any]:
+    results = {}
+    for name, setup in MICRO.items():
+        if selected and name not in selected:
+            continue
+        for size in sizes:
+            fn = setup(size)
+            fn()  # Warm-up
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - started)
+            stats = {
+                'size': size,
+                'repeat': repeat,
+                'median_ms': round(statistics.median(timings) * 1000, 3),
+                'min_ms': round(min(timings) * 1000, 3)
+            }
+            results[f'{name}@{size}'] = stats
+            print(f"  {name:<26} n={size:<9} median {stats['median_ms']:>10.3f}ms  "
+                  f"min {stats['min_ms']:>10.3f}ms", file=sys.stderr)
+    return results
+
+
+# ============================================================================
+# Baseline comparison
+# ============================================================================
+
+COMPARED = {'routes': 'p50_ms', 'micro': 'median_ms'}
+
+
+def combine(rounds: List[Dict[str, Any]], pick: Callable = max) -> Dict[str, Any]:
+    """One result from several rounds: per entry, the round whose compared field `pick` selects"""
+    combined = dict(rounds[0])
+    for section, field in COMPARED.items():
+        if section in combined:
+            combined[section] = {key: pick((r[section][key] for r in rounds), key=lambda stats: stats[field])
+                                 for key in rounds[0][section]}
+    combined['meta'] = dict(rounds[0]['meta'], rounds=len(rounds))
+    return combined
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_ms: float) -> List[str]:
+    """Descriptions of every entry slower than baseline * (1 + threshold) by more than `min_ms`"""
+    regressions = []
+    for section, field in COMPARED.items():
+        for key, stats in result.get(section, {}).items():
+            base = baseline.get(section, {}).get(key)
+            if base is None:
+                continue
+            current, previous = stats[field], base[field]
+            if current > previous * (1 + threshold) and current - previous > min_ms:
+                regressions.append(f"{section} {key}: {field} {previous} -> {current} "
+                                   f"(+{(current / previous - 1) * 100 if previous else float('inf'):.0f}%)")
+    return regressions
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', choices=('routes', 'micro'), default=None)
+    parser.add_argument('--url', default=None, help='benchmark a running server instead of the test client')
+    parser.add_argument('--concurrency', type=_csv, default=['1', '8'])
+    parser.add_argument('--requests', type=int, default=200, help='requests per route and concurrency level')
+    parser.add_argument('--heavy-requests', type=int, default=8,
+                        help='requests for backtest, optimize, walkforward, predict, train, score and stream')
+    parser.add_argument('--routes', type=_csv, default=None, help='route names to run (default: all)')
+    parser.add_argument('--bars', type=int, default=20000, help='bars per symbol behind the test client')
+    parser.add_argument('--sizes', type=_csv, default=['10000', '100000'], help='microbenchmark bar counts')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--micro', type=_csv, default=None, help='microbenchmark names to run (default: all)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.5, help='allowed slowdown before failing (0.5 = 50%%)')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='ignore slowdowns smaller than this')
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--rounds', type=int, default=None,
+                        help='times to run everything (default: 3 with --save-baseline, else 2)')
+    parser.add_argument('--output', default=None, help='also write the results JSON here')
+    args = parser.parse_args()
+
+    meta = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'transport': args.url or 'test-client'
+    }
+    rounds = args.rounds or (3 if args.save_baseline else 2)
+    runs = []
+    directory = None
+    try:
+        if args.only in (None, 'routes'):
+            concurrency = [int(c) for c in args.concurrency]
+            if args.url:
+                transport = HTTPTransport(args.url, args.timeout)
+            else:
+                directory = tempfile.mkdtemp(prefix='electric-bench-')
+                transport = TestClientTransport(prepare_app(directory, args.bars).app)
+        for n in range(rounds):
+            run: Dict[str, Any] = {'meta': meta}
+            if rounds > 1:
+                print(f'Round {n + 1}/{rounds}', file=sys.stderr)
+            if args.only in (None, 'routes'):
+                print('Routes', file=sys.stderr)
+                run['routes'] = bench_routes(transport, concurrency, args.requests, args.heavy_requests,
+                                             args.routes)
+            if args.only in (None, 'micro'):
+                print('Microbenchmarks', file=sys.stderr)
+                run['micro'] = bench_micro([int(s) for s in args.sizes], args.repeat, args.micro)
+            runs.append(run)
+    finally:
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+    # Baselines record the slowest round, comparisons the fastest
+    result = combine(runs, max if args.save_baseline else min)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(result, baseline, args.threshold, args.min_ms)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%})", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
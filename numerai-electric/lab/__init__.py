@@ -0,0 +1,4 @@
+"""
+Numerai Electric compute engines
+Array-based backtesting and market data components served by app.py
+"""
@@ -0,0 +1,113 @@
+"""
+Precompressed page assets
+Static bodies are encoded once, on first request, into identity, gzip and
+(when the optional brotli package is installed) brotli blobs. Pages with a
+few dynamic values are pre-rendered into static byte segments joined
+around per-request fragments.
+"""
+
+import gzip
+import hashlib
+import struct
+import zlib
+from typing import Dict, List, Tuple
+
+# Member header (no name, mtime 0, unknown OS) and the empty final block that closes a raw deflate stream
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+_DEFLATE_END = b'\x03\x00'
+
+_brotli = False  # Unresolved; None once the import has failed
+
+
+def _brotli_module():
+    """The optional brotli module, imported on first use"""
+    global _brotli
+    if _brotli is False:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = None
+    return _brotli
+
+
+class StaticAsset:
+    """A fixed body with an ETag and encodings compressed on first use"""
+
+    __slots__ = ('content_type', 'etag', '_encodings')
+
+    def __init__(self, body: str, content_type: str):
+        raw = body.encode('utf-8')
+        self.content_type = content_type
+        self.etag = hashlib.blake2b(raw, digest_size=12).hexdigest()
+        self._encodings: Dict[str, bytes] = {'identity': raw}
+
+    @property
+    def encodings(self) -> Dict[str, bytes]:
+        if len(self._encodings) == 1:
+            raw = self._encodings['identity']
+            encodings = {'identity': raw, 'gzip': gzip.compress(raw, compresslevel=9)}
+            brotli = _brotli_module()
+            if brotli is not None:
+                encodings['br'] = brotli.compress(raw, quality=11)
+            self._encodings = encodings
+        return self._encodings
+
+    def negotiate(self, accept_encodings) -> Tuple[str, bytes]:
+        """Smallest encoding the client accepts, as (encoding, body)"""
+        if 'br' not in accept_encodings and 'gzip' not in accept_encodings:
+            return 'identity', self._encodings['identity']
+        for encoding in ('br', 'gzip'):
+            if encoding in self.encodings and encoding in accept_encodings:
+                return encoding, self.encodings[encoding]
+        return 'identity', self.encodings['identity']
+
+
+class FragmentPage:
+    """Pre-rendered page split into static segments around named fragments.
+
+    `shell` is the fully rendered page with each dynamic value replaced by
+    the marker returned from `FragmentPage.marker(name)`.
+    """
+
+    def __init__(self, shell: str):
+        parts = shell.split('\x00')
+        self.segments: List[bytes] = [p.encode('utf-8') for p in parts[0::2]]
+        self.fragments: List[str] = parts[1::2]
+        self._deflated: List[bytes] = None
+
+    @staticmethod
+    def _deflate(data: bytes, level: int) -> bytes:
+        """Raw deflate blocks ending on a byte boundary with no final block, so they can be concatenated"""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    @staticmethod
+    def marker(name: str) -> str:
+        return f'\x00{name}\x00'
+
+    def render(self, values: Dict[str, str]) -> bytes:
+        """Join the static segments with the per-request fragment values"""
+        out = [self.segments[0]]
+        for name, segment in zip(self.fragments, self.segments[1:]):
+            out.append(str(values[name]).encode('utf-8'))
+            out.append(segment)
+        return b''.join(out)
+
+    def render_gzip(self, values: Dict[str, str], level: int = 5) -> bytes:
+        """render() as a gzip body: the static segments are compressed once, on first
+        use, and only the fragment values are compressed per request"""
+        if self._deflated is None:
+            self._deflated = [self._deflate(segment, 9) for segment in self.segments]
+        crc = zlib.crc32(self.segments[0])
+        size = len(self.segments[0])
+        out = [_GZIP_HEADER, self._deflated[0]]
+        for name, segment, deflated in zip(self.fragments, self.segments[1:], self._deflated[1:]):
+            value = str(values[name]).encode('utf-8')
+            crc = zlib.crc32(segment, zlib.crc32(value, crc))
+            size += len(value) + len(segment)
+            out.append(self._deflate(value, level))
+            out.append(deflated)
+        out.append(_DEFLATE_END)
+        out.append(struct.pack('<II', crc, size & 0xffffffff))
+        return b''.join(out)
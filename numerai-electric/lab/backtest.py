@@ -0,0 +1,351 @@
+"""
+Vectorized backtesting engine
+NumPy port of backtesting.core: strategies are evaluated over whole price arrays
+with cumulative-sum rolling windows, so cost grows linearly with bar count.
+"""
+
+import csv
+import heapq
+import itertools
+import operator
+import time
+from typing import Dict, Iterable, Iterator, List, Any, Sequence
+
+import numpy as np
+
+from lab import metrics, portfolio
+
+BUY, HOLD, SELL = 1, 0, -1
+SIGNAL_NAMES = {BUY: 'buy', HOLD: 'hold', SELL: 'sell'}
+
+DEFAULT_CHUNK_ROWS = 65536
+
+
+class Bars:
+    """Column-oriented OHLCV bars for a single symbol, sorted by timestamp"""
+
+    __slots__ = ('symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol, timestamp, open, high, low, close, volume):
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def between(self, start=None, end=None) -> 'Bars':
+        """Bars strictly inside (start, end), matching CSVDataProvider.fetch-historical"""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.timestamp > start
+        if end is not None:
+            mask &= self.timestamp < end
+        return Bars(self.symbol, *(getattr(self, f)[mask] for f in Bars.__slots__[1:]))
+
+    def window(self, start=None, end=None) -> 'Bars':
+        """Bars with start <= timestamp < end, as views rather than copies"""
+        lo = 0 if start is None else int(np.searchsorted(self.timestamp, start, side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamp, end, side='left'))
+        return Bars(self.symbol, *(getattr(self, f)[lo:hi] for f in Bars.__slots__[1:]))
+
+
+def iter_chunks(bars: Bars, rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Bars]:
+    """Consecutive slices of `bars`; views, so memory-mapped columns are paged in chunk by chunk"""
+    for start in range(0, len(bars), rows):
+        yield Bars(bars.symbol, *(getattr(bars, f)[start:start + rows] for f in Bars.__slots__[1:]))
+
+
+def parse_timestamp(value) -> np.datetime64:
+    """Parse an ISO-8601 instant (trailing Z allowed) into datetime64[ns]"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text.endswith('Z'):
+        text = text[:-1]
+    return np.datetime64(text, 'ns')
+
+
+def format_timestamp(value) -> str:
+    """Format a datetime64 as an ISO-8601 instant"""
+    return np.datetime_as_string(np.datetime64(value, 'ns'), unit='s') + 'Z'
+
+
+def _format_ns(values: np.ndarray) -> List[str]:
+    """format_timestamp over an array of int64 nanoseconds since the epoch"""
+    return [text + 'Z' for text in np.datetime_as_string(values.astype('datetime64[ns]'), unit='s').tolist()]
+
+
+def load_csv_bars(path: str, symbol: str) -> Bars:
+    """Load a timestamp,open,high,low,close,volume CSV into column arrays"""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # Skip header
+        rows = [row for row in reader if row]
+
+    if not rows:
+        empty = np.empty(0)
+        return Bars(symbol, np.empty(0, dtype='datetime64[ns]'), empty, empty, empty, empty, empty)
+
+    columns = list(zip(*rows))
+    timestamps = np.array([t[:-1] if t.endswith('Z') else t for t in columns[0]], dtype='datetime64[ns]')
+    values = [np.asarray(c, dtype=np.float64) for c in columns[1:6]]
+    return Bars(symbol, timestamps, *values)
+
+
+# ============================================================================
+# Rolling windows
+# ============================================================================
+
+def trailing_sum(values: np.ndarray, window: int):
+    """Sum and count of the last `window` values at every index.
+
+    Early indices use the shorter available history, exactly like
+    `(take window (reverse history))` in the Clojure strategies. Values are
+    centred on their first element before the cumulative sum to keep
+    rounding error independent of the series length.
+    """
+    n = len(values)
+    if n == 0:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    ref = values[0]
+    cs = np.concatenate(([0.0], np.cumsum(values - ref)))
+    hi = np.arange(1, n + 1)
+    lo = np.maximum(hi - window, 0)
+    counts = hi - lo
+    return cs[hi] - cs[lo] + ref * counts, counts
+
+
+# ============================================================================
+# Strategies
+# ============================================================================
+
+def sma_signals(close: np.ndarray, short_window: int, long_window: int):
+    """SimpleMovingAverageStrategy: short MA above long MA buys, below sells"""
+    short_ma = trailing_sum(close, short_window)[0] / short_window
+    long_ma = trailing_sum(close, long_window)[0] / long_window
+    signals = np.where(short_ma > long_ma, BUY, np.where(short_ma < long_ma, SELL, HOLD)).astype(np.int8)
+    confidence = np.where(signals == HOLD, 0.5, 0.7)
+    return signals, confidence
+
+
+def mean_reversion_signals(close: np.ndarray, lookback_period: int, threshold: float):
+    """MeanReversionStrategy: buy below and sell above the lookback mean by `threshold`"""
+    sums, counts = trailing_sum(close, lookback_period)
+    mean_price = sums / counts
+    deviation = (close - mean_price) / mean_price
+    signals = np.where(deviation < -threshold, BUY, np.where(deviation > threshold, SELL, HOLD)).astype(np.int8)
+    confidence = np.where(signals == HOLD, 0.3, 0.8)
+    return signals, confidence
+
+
+def rolling_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """Simple-average RSI over the last `period` bars (calculate-rsi), NaN until a change exists"""
+    changes = np.diff(close, prepend=close[:1])
+    gains, _ = trailing_sum(np.maximum(changes, 0.0)[1:], period - 1)
+    losses, counts = trailing_sum(np.maximum(-changes, 0.0)[1:], period - 1)
+    rsi = np.full(len(close), np.nan)
+    if len(close) > 1:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = 100.0 - 100.0 / (1.0 + gains / losses)
+        value = np.where(losses == 0, np.where(gains > 0, 100.0, 50.0), value)
+        rsi[1:] = np.where(counts > 0, value, np.nan)
+    return rsi
+
+
+def momentum_signals(close: np.ndarray, momentum_period: int, rsi_period: int,
+                     overbought: float, oversold: float):
+    """MomentumStrategy: summed returns over the window gated by RSI.
+
+    Like the Clojure version, the window is walked newest bar first, so each
+    return is (previous - current) / current and RSI counts falling closes
+    as gains; both come out sign-flipped against their textbook forms.
+    """
+    returns = np.zeros(len(close))
+    returns[1:] = (close[:-1] - close[1:]) / close[1:]
+    momentum = np.zeros(len(close))
+    momentum[1:] = trailing_sum(returns[1:], momentum_period - 1)[0]
+    rsi = rolling_rsi(-close, min(rsi_period, momentum_period))  # Negated closes: reversed-window changes
+    with np.errstate(invalid='ignore'):
+        buy = (momentum > 0.02) & (rsi < oversold)
+        sell = (momentum < -0.02) & (rsi > overbought)
+    signals = np.where(buy, BUY, np.where(sell, SELL, HOLD)).astype(np.int8)
+    confidence = np.where(signals == HOLD, 0.4, 0.85)
+    return signals, confidence
+
+
+# Strategy factory: name -> (signal function, parameter names, defaults)
+STRATEGIES = {
+    'sma': (sma_signals, ('short_window', 'long_window'),
+            {'short_window': 10, 'long_window': 20}),
+    'mean_reversion': (mean_reversion_signals, ('lookback_period', 'threshold'),
+                       {'lookback_period': 14, 'threshold': 0.02}),
+    'momentum': (momentum_signals, ('momentum_period', 'rsi_period', 'overbought', 'oversold'),
+                 {'momentum_period': 10, 'rsi_period': 14, 'overbought': 70, 'oversold': 30}),
+}
+
+INTEGER_PARAMS = {'short_window', 'long_window', 'lookback_period', 'momentum_period', 'rsi_period'}
+
+
+def resolve_strategy(strategy_type: str, params: Dict[str, Any] = None):
+    """Look up a strategy and merge `params` over its defaults"""
+    key = strategy_type.replace('-', '_')
+    if key not in STRATEGIES:
+        raise ValueError(f"Unknown strategy type: {strategy_type}")
+    fn, names, defaults = STRATEGIES[key]
+    merged = dict(defaults)
+    merged.update({k.replace('-', '_'): v for k, v in (params or {}).items()})
+    unknown = set(merged) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {key}: {sorted(unknown)}")
+    resolved = {}
+    for name in names:
+        value = merged[name]
+        resolved[name] = int(value) if name in INTEGER_PARAMS else float(value)
+        if name in INTEGER_PARAMS and resolved[name] < 1:
+            raise ValueError(f"{name} must be a positive integer")
+    # A short window at least as long as the long one is degenerate: the Clojure
+    # strategy sums only long_window bars into short_ma, which this port doesn't mimic
+    if key == 'sma' and resolved['short_window'] >= resolved['long_window']:
+        raise ValueError("short_window must be less than long_window")
+    return key, fn, resolved
+
+
+def generate_signals(strategy_type: str, params: Dict[str, Any], close: np.ndarray):
+    """Signal and confidence arrays for every bar of `close`"""
+    _, fn, resolved = resolve_strategy(strategy_type, params)
+    return fn(close, **resolved)
+
+
+# ============================================================================
+# Portfolio simulation
+# ============================================================================
+
+def _transitions(signals: np.ndarray, previous: int = HOLD, retry_buys: bool = False) -> np.ndarray:
+    """Indices where a non-hold signal differs from the previous non-hold signal.
+
+    Repeated buys while a position is open and repeated sells while flat are
+    no-ops in execute-trade, so only these bars can change the portfolio.
+    `previous` is the last non-hold signal before `signals` starts. With
+    `retry_buys` every buy is kept: when a buy can be refused for lack of
+    cash, execute-trade tries again on each following buy bar.
+    """
+    active = np.flatnonzero(signals != HOLD)
+    if len(active) == 0:
+        return active
+    keep = np.ones(len(active), dtype=bool)
+    keep[0] = signals[active[0]] != previous
+    keep[1:] = signals[active[1:]] != signals[active[:-1]]
+    if retry_buys:
+        keep |= signals[active] == BUY
+    return active[keep]
+
+
+def buys_can_fail(max_position_size: float, commission: float) -> bool:
+    """Whether execute-trade can refuse a buy while flat: the order plus commission may exceed cash.
+
+    Sizing takes max_position_size of cash, so a buy always fits when
+    max_position_size * (1 + commission) < 1.
+    """
+    return max_position_size * (1 + commission) >= 1
+
+
+class _StreamTotals:
+    """Per-run tallies filled in while the symbol streams are consumed"""
+
+    __slots__ = ('signal_counts', 'bars', 'last_close')
+
+    def __init__(self, n_symbols: int):
+        self.signal_counts = np.zeros(3, dtype=np.int64)  # sell, hold, buy
+        self.bars = 0
+        self.last_close: List[float] = [None] * n_symbols
+
+
+def symbol_events(symbol_id: int, chunks: Iterable[Bars], fn, resolved: Dict[str, Any],
+                  totals: _StreamTotals, retry_buys: bool = False) -> Iterator[tuple]:
+    """(time_ns, symbol_id, price, signal) for each candidate trade of one symbol, in time order.
+
+    Signals are computed chunk by chunk with enough trailing history carried
+    over for every strategy window, so only one chunk per symbol is held.
+    """
+    context = max([v for k, v in resolved.items() if k in INTEGER_PARAMS] + [0]) + 1
+    tail = np.empty(0)
+    previous = HOLD
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        close = np.concatenate((tail, chunk.close))
+        signals = fn(close, **resolved)[0][len(tail):]
+        totals.signal_counts += np.bincount(signals.astype(np.int64) + 1, minlength=3)
+        totals.bars += len(chunk)
+        totals.last_close[symbol_id] = float(close[-1])
+        tail = close[-context:].copy()  # Lets the chunk be freed
+
+        idx = _transitions(signals, previous, retry_buys)
+        if len(idx):
+            previous = int(signals[idx[-1]])
+            times = chunk.timestamp[idx].astype('datetime64[ns]').view(np.int64)
+            yield from zip(times.tolist(), itertools.repeat(symbol_id), chunk.close[idx].tolist(),
+                           signals[idx].tolist())
+
+
+def run_backtest(strategy_type: str, params: Dict[str, Any], market_data: Sequence[Bars],
+                 initial_cash: float = 100000, max_position_size: float = 0.1,
+                 commission: float = 0.001, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, Any]:
+    """Run a backtest over per-symbol bars and return metrics, trades and signal counts.
+
+    Each symbol is read `chunk_rows` bars at a time and the candidate trades
+    of all symbols are merged by timestamp as they are produced, so memory
+    grows with the number of symbols rather than total bars.
+    """
+    started = time.perf_counter()
+    key, fn, resolved = resolve_strategy(strategy_type, params)
+
+    # Lazily merge the per-symbol event streams by timestamp (ties in symbol order)
+    totals = _StreamTotals(len(market_data))
+    retry_buys = buys_can_fail(max_position_size, commission)
+    streams = [symbol_events(i, iter_chunks(bars, chunk_rows), fn, resolved, totals, retry_buys)
+               for i, bars in enumerate(market_data)]
+    merged = heapq.merge(*streams)
+
+    names = list(dict.fromkeys(bars.symbol for bars in market_data))
+    book = portfolio.Portfolio(names, initial_cash, max_position_size, commission)
+    book_ids = book.symbol_ids([bars.symbol for bars in market_data]).tolist()
+    if len(names) == len(market_data):
+        batches = (list(events) for _, events in itertools.groupby(merged, key=operator.itemgetter(0)))
+    else:
+        batches = ([event] for event in merged)  # Repeated symbols share a position: one fill at a time
+    for events in batches:
+        book.apply_fills([book_ids[e[1]] for e in events], [e[3] for e in events], [e[2] for e in events],
+                         events[0][0])
+
+    for i, close in enumerate(totals.last_close):
+        if close is not None:
+            book.mark(book_ids[i], close)
+    final_value = book.value()
+    initial_value = float(initial_cash)
+    cash = book.cash
+    positions = book.positions(_format_ns)
+    trades = book.trade_records(_format_ns)
+
+    log = book.trades
+    per_trade = metrics.trade_metrics(np.nan_to_num(log.column('pnl')), initial_value, log.column('time'))
+
+    return {
+        'status': 'success',
+        'strategy': key,
+        'strategy_params': resolved,
+        'metrics': dict({'total_return': (final_value - initial_value) / initial_value,
+                         'final_value': final_value,
+                         'initial_value': initial_value}, **per_trade),
+        'final_portfolio': {'cash': cash, 'positions': positions},
+        'trades': trades,
+        'signal_counts': {'buy': int(totals.signal_counts[2]), 'sell': int(totals.signal_counts[0]),
+                          'hold': int(totals.signal_counts[1])},
+        'bars_processed': totals.bars,
+        'processing_time_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,106 @@
+"""
+Memory-mapped columnar OHLCV store
+One .npy file per field per symbol, with the timestamp column doubling as a
+sorted index. Range reads binary-search the index and return zero-copy
+slices of the mapped columns.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from lab.backtest import Bars, load_csv_bars
+
+FIELDS = Bars.__slots__[1:]
+SYMBOL_PATTERN = re.compile(r'[A-Za-z0-9._-]+')
+
+
+def valid_symbol(symbol) -> bool:
+    """True for a plain file-name-safe symbol: no separators, not '.' or '..'"""
+    return isinstance(symbol, str) and SYMBOL_PATTERN.fullmatch(symbol) is not None and symbol not in ('.', '..')
+
+
+class BarStore:
+    """Columnar bar store rooted at `root` (root/SYMBOL/field.npy)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._mapped: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _symbol_dir(self, symbol: str) -> str:
+        if not valid_symbol(symbol):
+            raise ValueError(f"Invalid symbol name: {symbol!r}")
+        return os.path.join(self.root, symbol)
+
+    def _index_path(self, symbol: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), 'timestamp.npy')
+
+    def symbols(self) -> List[str]:
+        """Symbols with an ingested timestamp index"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(s for s in os.listdir(self.root) if valid_symbol(s) and os.path.exists(self._index_path(s)))
+
+    def has(self, symbol: str) -> bool:
+        return os.path.exists(self._index_path(symbol))
+
+    def mtime(self, symbol: str) -> float:
+        return os.stat(self._index_path(symbol)).st_mtime
+
+    def fingerprint(self, symbol: str) -> List[int]:
+        """Modification time (ns) and size of the symbol's index; changes whenever it is rewritten"""
+        stat = os.stat(self._index_path(symbol))
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def write(self, bars: Bars):
+        """Store `bars` sorted by timestamp, replacing any existing columns"""
+        order = np.argsort(bars.timestamp, kind='stable')
+        directory = self._symbol_dir(bars.symbol)
+        os.makedirs(directory, exist_ok=True)
+        # The timestamp index goes last so readers never see an index longer than its columns
+        for field in FIELDS[1:] + FIELDS[:1]:
+            column = getattr(bars, field)[order]
+            if field != 'timestamp':
+                column = column.astype(np.float64)
+            path = os.path.join(directory, f'{field}.npy')
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'wb') as f:
+                np.save(f, column)
+            os.replace(tmp, path)
+        with self._lock:
+            self._mapped.pop(bars.symbol, None)
+
+    def ingest_csv(self, path: str, symbol: str):
+        """Parse a CSV once and store it in columnar form"""
+        self.write(load_csv_bars(path, symbol))
+
+    def bars(self, symbol: str) -> Bars:
+        """All bars for `symbol` as read-only memory-mapped columns"""
+        mtime = self.mtime(symbol)
+        with self._lock:
+            cached = self._mapped.get(symbol)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            directory = self._symbol_dir(symbol)
+            columns = [np.load(os.path.join(directory, f'{field}.npy'), mmap_mode='r') for field in FIELDS]
+            n = min(len(c) for c in columns)
+            mapped = Bars(symbol, *(c[:n] for c in columns))
+            self._mapped[symbol] = (mtime, mapped)
+            return mapped
+
+    def read(self, symbol: str, start=None, end=None) -> Bars:
+        """Bars strictly inside (start, end), located by binary search without copying"""
+        bars = self.bars(symbol)
+        lo = 0 if start is None else int(np.searchsorted(bars.timestamp, np.datetime64(start, 'ns'), side='right'))
+        hi = len(bars) if end is None else int(np.searchsorted(bars.timestamp, np.datetime64(end, 'ns'), side='left'))
+        hi = max(lo, hi)
+        return Bars(symbol, *(getattr(bars, field)[lo:hi] for field in FIELDS))
+
+    def last_close(self, symbol: str) -> float:
+        """Most recent close without touching the rest of the column"""
+        close = self.bars(symbol).close
+        return float(close[-1]) if len(close) else None
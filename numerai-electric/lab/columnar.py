@@ -0,0 +1,137 @@
+"""
+Binary columnar response format
+A stream of record batches, each a little-endian uint32 header length, a
+JSON header and a body of raw little-endian column buffers (8-byte
+aligned), ended by a zero header length. Numbers travel as float32 or
+int64 arrays that clients load with np.frombuffer / Float32Array, instead
+of being printed and parsed as JSON text. Strings stay in the header,
+either inline or as a dictionary plus int32 codes.
+
+    header: {"rows": n, "body_length": bytes, "meta": {...} (first batch only),
+             "columns": [{"name", "dtype", "kind", "offset", "length"}],
+             "strings": {name: [...]}, "dictionaries": {name: [...]}}
+"""
+
+import json
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+MIMETYPE = 'application/vnd.numerai-electric.columnar'
+
+# Column kinds: how a list of Python values is encoded
+KINDS = {
+    'float32': '<f4',  # None -> NaN
+    'int64': '<i8',
+    'time': '<i8',  # ISO-8601 instants -> nanoseconds since the epoch
+    'category': '<i4',  # Codes into the batch's dictionary
+    'string': None,  # Inline in the header
+}
+
+_LENGTH = struct.Struct('<I')
+END = _LENGTH.pack(0)
+
+
+def _encode_column(values: Sequence[Any], kind: str) -> Tuple[np.ndarray, List[str]]:
+    if kind == 'float32':
+        return np.array([np.nan if v is None else v for v in values], dtype='<f4'), None
+    if kind == 'int64':
+        return np.asarray(values, dtype='<i8'), None
+    if kind == 'time':
+        instants = [v[:-1] if isinstance(v, str) and v.endswith('Z') else v for v in values]
+        return np.array(instants, dtype='datetime64[ns]').astype('<i8'), None
+    if kind == 'category':
+        dictionary: Dict[Any, int] = {}
+        codes = np.fromiter((dictionary.setdefault(v, len(dictionary)) for v in values), dtype='<i4',
+                            count=len(values))
+        return codes, list(dictionary)
+    raise ValueError(f"Unknown column kind '{kind}'. Available: {list(KINDS)}")
+
+
+def batch(columns: Dict[str, Sequence[Any]], schema: Dict[str, str], meta: Dict[str, Any] = None) -> bytes:
+    """One encoded record batch of equal-length `columns`, each encoded as schema[name]"""
+    header: Dict[str, Any] = {'rows': 0, 'columns': []}
+    if meta is not None:
+        header['meta'] = meta
+    buffers = []
+    offset = 0
+    for name, kind in schema.items():
+        values = columns[name]
+        header['rows'] = len(values)
+        if kind == 'string':
+            header.setdefault('strings', {})[name] = [None if v is None else str(v) for v in values]
+            continue
+        array, dictionary = _encode_column(values, kind)
+        if dictionary is not None:
+            header.setdefault('dictionaries', {})[name] = dictionary
+        data = array.tobytes()
+        header['columns'].append({'name': name, 'dtype': KINDS[kind], 'kind': kind, 'offset': offset,
+                                  'length': len(array)})
+        padding = -len(data) % 8
+        buffers.append(data + b'\0' * padding)
+        offset += len(data) + padding
+    header['body_length'] = offset
+    text = json.dumps(header, separators=(',', ':'), default=str).encode()
+    text += b' ' * (-(len(text) + _LENGTH.size) % 8)  # Keep the body 8-byte aligned
+    return _LENGTH.pack(len(text)) + text + b''.join(buffers)
+
+
+def stream(meta: Dict[str, Any], batches: Iterable[Dict[str, Sequence[Any]]],
+           schema: Dict[str, str]) -> Iterator[bytes]:
+    """Encoded stream: `meta` rides on the first batch (an empty one when there are none)"""
+    first = True
+    for columns in batches:
+        yield batch(columns, schema, meta if first else None)
+        first = False
+    if first:
+        yield batch({name: [] for name in schema}, schema, meta)
+    yield END
+
+
+def record_batches(records: Sequence[Dict[str, Any]], names: Sequence[str],
+                   rows: int = 65536) -> Iterator[Dict[str, List[Any]]]:
+    """Slices of a list of dicts as column dicts (missing keys become None)"""
+    for start in range(0, len(records), rows):
+        chunk = records[start:start + rows]
+        yield {name: [record.get(name) for record in chunk] for name in names}
+
+
+def rows(batches: Iterable[Dict[str, Sequence[Any]]]) -> Iterator[Dict[str, Any]]:
+    """Column batches back to per-row dicts"""
+    for columns in batches:
+        names = list(columns)
+        for values in zip(*(columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+
+def read(data: bytes) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Decode a whole stream into (meta, columns): arrays for numeric columns, lists for strings"""
+    meta = {}
+    parts: Dict[str, List[Any]] = {}
+    position = 0
+    while True:
+        (length,) = _LENGTH.unpack_from(data, position)
+        position += _LENGTH.size
+        if length == 0:
+            break
+        header = json.loads(data[position:position + length])
+        position += length
+        meta = header.get('meta', meta)
+        body = position
+        for column in header['columns']:
+            array = np.frombuffer(data, dtype=column['dtype'], count=column['length'],
+                                  offset=body + column['offset'])
+            dictionary = header.get('dictionaries', {}).get(column['name'])
+            parts.setdefault(column['name'], []).append(
+                [dictionary[code] for code in array.tolist()] if dictionary is not None else array)
+        for name, values in header.get('strings', {}).items():
+            parts.setdefault(name, []).append(values)
+        position = body + header['body_length']
+    columns = {}
+    for name, chunks in parts.items():
+        if chunks and isinstance(chunks[0], np.ndarray):
+            columns[name] = np.concatenate(chunks)
+        else:
+            columns[name] = [value for chunk in chunks for value in chunk]
+    return meta, columns
@@ -0,0 +1,249 @@
+"""
+Compact Numerai feature matrices
+Feature values are small integer bins, so each dataset is converted once
+from CSV into a contiguous uint8 matrix (8x smaller than float64) with ids,
+era boundaries and targets alongside, cached on disk and memory-mapped on
+later loads. Feature subsets and era ranges are selected as views, or as
+per-chunk float32 copies for the model code.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from lab.inference import TournamentChunk, feature_columns, iter_chunks, read_header
+
+FORMAT_VERSION = 1
+
+EraRange = Tuple[Union[int, None], Union[int, None]]
+
+
+def era_number(label: str):
+    """Numeric part of an era label ('era123' -> 123); None for e.g. the live era 'X'"""
+    match = re.search(r'\d+', label)
+    return int(match.group()) if match else None
+
+
+def _era_sort_key(label: str):
+    number = era_number(label)
+    return (number is None, number if number is not None else 0, label)
+
+
+class FeatureMatrix:
+    """A converted dataset: uint8 feature bins plus ids, eras and targets.
+
+    Rows are grouped by era in numeric era order, so an era range is one
+    contiguous block of rows described by `era_starts`.
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.feature_names: List[str] = meta['features']
+        self.scale: int = meta['scale']
+        self.eras: List[str] = meta['eras']
+        self.era_starts = np.asarray(meta['era_starts'], dtype=np.int64)
+        self.source: Dict[str, Any] = meta.get('source', {})  # Path, size and mtime it was converted from
+        self.features = np.load(os.path.join(directory, 'features.npy'), mmap_mode='r')
+        self.ids = np.load(os.path.join(directory, 'ids.npy'), mmap_mode='r')
+        targets_path = os.path.join(directory, 'targets.npy')
+        self.targets = np.load(targets_path, mmap_mode='r') if os.path.exists(targets_path) else None
+        self._column_index = {name: i for i, name in enumerate(self.feature_names)}
+
+    def __len__(self):
+        return self.features.shape[0]
+
+    def feature_indices(self, features: Sequence[str] = None) -> np.ndarray:
+        """Column indices of the named features (all when None)"""
+        if features is None:
+            return np.arange(len(self.feature_names))
+        missing = [name for name in features if name not in self._column_index]
+        if missing:
+            raise ValueError(f"Unknown features: {missing[:5]}")
+        return np.array([self._column_index[name] for name in features], dtype=np.int64)
+
+    def _columns(self, features: Sequence[str] = None):
+        """Column selector: a slice (zero-copy) when the indices are contiguous"""
+        indices = self.feature_indices(features)
+        if len(indices) and np.all(np.diff(indices) == 1):
+            return slice(int(indices[0]), int(indices[-1]) + 1)
+        return indices
+
+    def row_range(self, era_range: EraRange = None) -> slice:
+        """Rows of eras numbered within `era_range` (inclusive, None for open ends)"""
+        if era_range is None or era_range == (None, None):
+            return slice(0, len(self))
+        lo, hi = era_range
+        selected = [i for i, label in enumerate(self.eras)
+                    if era_number(label) is not None
+                    and (lo is None or era_number(label) >= lo)
+                    and (hi is None or era_number(label) <= hi)]
+        if not selected:
+            return slice(0, 0)
+        return slice(int(self.era_starts[selected[0]]), int(self.era_starts[selected[-1] + 1]))
+
+    def matrix(self, features: Sequence[str] = None, era_range: EraRange = None) -> np.ndarray:
+        """uint8 bins for the selection: a view for contiguous columns, else a compact copy"""
+        return self.features[self.row_range(era_range), self._columns(features)]
+
+    def take(self, rows: np.ndarray, features: Sequence[str] = None) -> np.ndarray:
+        """float32 features of the given row indices"""
+        X = self.features[rows][:, self._columns(features)].astype(np.float32)
+        if self.scale != 1:
+            X *= np.float32(1 / self.scale)
+        return X
+
+    def iter_chunks(self, chunk_rows: int = 5000, features: Sequence[str] = None,
+                    era_range: EraRange = None) -> Iterator[TournamentChunk]:
+        """Selected rows as float32 TournamentChunks, materialising one chunk at a time"""
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        rows = self.row_range(era_range)
+        columns = self._columns(features)
+        inverse_scale = np.float32(1 / self.scale)
+        for start in range(rows.start, rows.stop, chunk_rows):
+            stop = min(start + chunk_rows, rows.stop)
+            X = self.features[start:stop, columns].astype(np.float32)
+            if self.scale != 1:
+                X *= inverse_scale
+            era_index = np.searchsorted(self.era_starts, np.arange(start, stop), side='right') - 1
+            yield TournamentChunk(
+                self.ids[start:stop].tolist(),
+                [self.eras[i] for i in era_index],
+                X,
+                None if self.targets is None else np.array(self.targets[start:stop])
+            )
+
+
+def _to_bins(X: np.ndarray, scale: int) -> np.ndarray:
+    bins = X * scale
+    rounded = np.rint(bins)
+    if not np.array_equal(bins, rounded) or rounded.min(initial=0) < 0 or rounded.max(initial=0) > 255:
+        raise ValueError("Feature values are not small integer bins")
+    return rounded.astype(np.uint8)
+
+
+def convert_csv(path: str, directory: str, chunk_rows: int = 5000):
+    """Convert a Numerai CSV into a FeatureMatrix directory, streaming `chunk_rows` at a time"""
+    header = read_header(path)
+    names = [header[i] for i in feature_columns(header)]
+    with open(path, 'rb') as f:
+        n_rows = sum(1 for line in f if line.strip()) - 1
+
+    tmp = f'{directory}.{os.getpid()}.{threading.get_ident()}.tmp'
+    os.makedirs(tmp, exist_ok=True)
+    try:
+        features = np.lib.format.open_memmap(os.path.join(tmp, 'features.npy'), mode='w+',
+                                             dtype=np.uint8, shape=(n_rows, len(names)))
+        ids: List[str] = []
+        eras: List[str] = []
+        targets = None
+        scale = None
+        offset = 0
+        for chunk in iter_chunks(path, chunk_rows):
+            if scale is None:
+                # Legacy data stores bins as 0, 0.25, ..., 1; newer data as 0..4
+                scale = 1 if np.array_equal(chunk.features, np.rint(chunk.features)) else 4
+            features[offset:offset + len(chunk)] = _to_bins(chunk.features, scale)
+            if chunk.targets is not None:
+                if targets is None:
+                    targets = np.full(n_rows, np.nan, dtype=np.float32)
+                targets[offset:offset + len(chunk)] = chunk.targets
+            ids.extend(chunk.ids)
+            eras.extend(chunk.eras)
+            offset += len(chunk)
+
+        # Group rows by era in numeric order so era ranges are contiguous
+        labels = sorted(set(eras), key=_era_sort_key)
+        position = {label: i for i, label in enumerate(labels)}
+        codes = np.fromiter((position[e] for e in eras), dtype=np.int64, count=len(eras))
+        if np.any(np.diff(codes) < 0):
+            order = np.argsort(codes, kind='stable')
+            ordered = np.lib.format.open_memmap(os.path.join(tmp, 'features.sorted.npy'), mode='w+',
+                                                dtype=np.uint8, shape=features.shape)
+            for start in range(0, n_rows, chunk_rows):
+                ordered[start:start + chunk_rows] = features[order[start:start + chunk_rows]]
+            ordered.flush()
+            del features, ordered
+            os.replace(os.path.join(tmp, 'features.sorted.npy'), os.path.join(tmp, 'features.npy'))
+            ids = [ids[i] for i in order]
+            codes = codes[order]
+            if targets is not None:
+                targets = targets[order]
+        else:
+            features.flush()
+            del features
+
+        np.save(os.path.join(tmp, 'ids.npy'), np.array(ids, dtype=str))
+        if targets is not None:
+            np.save(os.path.join(tmp, 'targets.npy'), targets)
+        stat = os.stat(path)
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump({
+                'format': FORMAT_VERSION,
+                'source': {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime},
+                'rows': n_rows,
+                'features': names,
+                'scale': scale or 1,
+                'eras': labels,
+                'era_starts': np.searchsorted(codes, np.arange(len(labels) + 1)).tolist()
+            }, f)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory, ignore_errors=True)
+        try:
+            os.rename(tmp, directory)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # Another process finished the same conversion first
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def cache_dir(cache_root: str, path: str) -> str:
+    name = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=6).hexdigest()
+    return os.path.join(cache_root, f'{name}-{digest}')
+
+
+def _is_current(directory: str, stat: os.stat_result) -> bool:
+    try:
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (meta.get('format') == FORMAT_VERSION and meta['source']['size'] == stat.st_size
+            and meta['source']['mtime'] == stat.st_mtime)
+
+
+def is_cached(path: str, cache_root: str) -> bool:
+    """Whether `path` has an up-to-date conversion in `cache_root`"""
+    return _is_current(cache_dir(cache_root, path), os.stat(path))
+
+
+_loaded: Dict[str, Tuple[tuple, FeatureMatrix]] = {}
+_load_lock = threading.Lock()
+
+
+def load(path: str, cache_root: str, chunk_rows: int = 5000) -> FeatureMatrix:
+    """FeatureMatrix for the CSV at `path`, converted into `cache_root` on first use
+    or whenever the source file changes"""
+    stat = os.stat(path)
+    directory = cache_dir(cache_root, path)
+    key = (stat.st_size, stat.st_mtime)
+    with _load_lock:
+        loaded = _loaded.get(directory)
+        if loaded is not None and loaded[0] == key:
+            return loaded[1]
+        if not _is_current(directory, stat):
+            convert_csv(path, directory, chunk_rows)
+        matrix = FeatureMatrix(directory)
+        _loaded[directory] = (key, matrix)
+        return matrix
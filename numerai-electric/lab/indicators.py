@@ -0,0 +1,237 @@
+"""
+Streaming indicators
+Fixed-size per-symbol state updated in constant time per tick: rolling SMA,
+rolling mean/std, momentum and Wilder RSI, combined into live signals.
+"""
+
+import math
+import threading
+from typing import Dict, List, Any, Iterable
+
+
+class RollingMeanStd:
+    """Mean and population std over the last `size` values (sliding Welford)"""
+
+    __slots__ = ('size', 'values', 'index', 'count', 'mean', 'm2')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = [0.0] * size
+        self.index = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float):
+        if self.count < self.size:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            old = self.values[self.index]
+            old_mean = self.mean
+            self.mean += (x - old) / self.size
+            self.m2 += (x - old) * (x - self.mean + old - old_mean)
+        self.values[self.index] = x
+        self.index = (self.index + 1) % self.size
+        return self.mean
+
+    @property
+    def ready(self) -> bool:
+        return self.count == self.size
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(max(self.m2, 0.0) / self.count) if self.count else 0.0
+
+
+class RollingSum:
+    """Sum of the last `size` values"""
+
+    __slots__ = ('size', 'values', 'index', 'count', 'total')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = [0.0] * size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def push(self, x: float):
+        self.total += x - self.values[self.index]
+        self.values[self.index] = x
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        return self.total
+
+
+class RollingSMA(RollingSum):
+    """Simple moving average of the last `size` values"""
+
+    __slots__ = ()
+
+    def push(self, x: float):
+        return super().push(x) / self.count
+
+    @property
+    def value(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class WilderRSI:
+    """Wilder-smoothed RSI; seeded with a simple average of the first `period` changes"""
+
+    __slots__ = ('period', 'previous', 'count', 'avg_gain', 'avg_loss')
+
+    def __init__(self, period: int):
+        self.period = period
+        self.previous = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def push(self, price: float):
+        if self.previous is not None:
+            change = price - self.previous
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            self.count += 1
+            if self.count <= self.period:
+                self.avg_gain += (gain - self.avg_gain) / self.count
+                self.avg_loss += (loss - self.avg_loss) / self.count
+            else:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        self.previous = price
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    @property
+    def value(self) -> float:
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+class SymbolState:
+    """All indicator state for one symbol"""
+
+    __slots__ = ('short_ma', 'long_ma', 'stats', 'momentum', 'rsi',
+                 'price', 'timestamp', 'ticks', 'signal', 'version')
+
+    def __init__(self, params: Dict[str, Any]):
+        self.short_ma = RollingSMA(params['short_window'])
+        self.long_ma = RollingSMA(params['long_window'])
+        self.stats = RollingMeanStd(params['lookback_period'])
+        self.momentum = RollingSum(max(1, params['momentum_period'] - 1))
+        self.rsi = WilderRSI(params['rsi_period'])
+        self.price = None
+        self.timestamp = None
+        self.ticks = 0
+        self.signal = None
+        self.version = 0
+
+
+class SignalEngine:
+    """Live ensemble signals for many symbols, updated one tick at a time.
+
+    Each symbol votes with SMA crossover, mean reversion, Wilder RSI and
+    momentum using the same thresholds as the backtest strategies.
+    """
+
+    DEFAULTS = {
+        'short_window': 10, 'long_window': 20,
+        'lookback_period': 14, 'threshold': 0.02,
+        'momentum_period': 10, 'rsi_period': 14, 'overbought': 70, 'oversold': 30,
+    }
+
+    def __init__(self, **params):
+        self.params = dict(self.DEFAULTS, **params)
+        self.states: Dict[str, SymbolState] = {}
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def update(self, symbol: str, price: float, timestamp: str = None) -> Dict[str, Any]:
+        """Apply one tick; returns the symbol's current signal record (None while warming up)"""
+        with self._lock:
+            state = self.states.get(symbol)
+            if state is None:
+                state = self.states[symbol] = SymbolState(self.params)
+            previous = state.price
+            state.price = price
+            state.timestamp = timestamp
+            state.ticks += 1
+            state.short_ma.push(price)
+            state.long_ma.push(price)
+            state.stats.push(price)
+            state.rsi.push(price)
+            if previous:
+                state.momentum.push((price - previous) / previous)
+
+            if state.ticks < max(self.params['long_window'], self.params['lookback_period'],
+                                 self.params['rsi_period'] + 1, self.params['momentum_period']):
+                return None
+
+            record = self._evaluate(symbol, state)
+            if state.signal is None or state.signal['signal'] != record['signal'] \
+                    or state.signal['confidence'] != record['confidence']:
+                self.version += 1
+                state.version = self.version
+            state.signal = record
+            return record
+
+    def _evaluate(self, symbol: str, state: SymbolState) -> Dict[str, Any]:
+        p = self.params
+        short_ma, long_ma = state.short_ma.value, state.long_ma.value
+        mean = state.stats.mean
+        deviation = (state.price - mean) / mean if mean else 0.0
+        rsi = state.rsi.value
+        momentum = state.momentum.total
+
+        votes = (short_ma > long_ma) - (short_ma < long_ma)
+        votes += (deviation < -p['threshold']) - (deviation > p['threshold'])
+        votes += (rsi < p['oversold']) - (rsi > p['overbought'])
+        votes += (momentum > 0.02) - (momentum < -0.02)
+        score = votes / 4
+
+        return {
+            'symbol': symbol,
+            'signal': 'BUY' if score >= 0.5 else 'SELL' if score <= -0.5 else 'HOLD',
+            'confidence': round(0.5 + abs(score) / 2, 2),
+            'expected_return': round((short_ma - long_ma) / long_ma, 4) if long_ma else 0.0,
+            'price': state.price,
+            'rsi': round(rsi, 2),
+            'zscore': round((state.price - mean) / state.stats.std, 3) if state.stats.std else 0.0,
+            'timestamp': state.timestamp,
+        }
+
+    def update_many(self, ticks: Iterable[Dict[str, Any]]) -> int:
+        """Apply a batch of {'symbol', 'price', 'timestamp'} ticks; returns how many were applied"""
+        applied = 0
+        for tick in ticks:
+            self.update(tick['symbol'], float(tick['price']), tick.get('timestamp'))
+            applied += 1
+        return applied
+
+    def snapshot(self, symbols: Iterable[str] = None, since_version: int = 0) -> List[Dict[str, Any]]:
+        """Current signals, optionally limited to `symbols` or to those changed after `since_version`"""
+        with self._lock:
+            keys = self.states.keys() if symbols is None else [s for s in symbols if s in self.states]
+            return [dict(self.states[s].signal, version=self.states[s].version) for s in keys
+                    if self.states[s].signal is not None and self.states[s].version > since_version]
+
+    def export(self) -> Dict[str, Any]:
+        """Full snapshot for publishing to other processes"""
+        signals = self.snapshot()
+        return {'version': self.version, 'symbols_tracked': len(self.states), 'signals': signals}
+
+
+def filter_signals(signals: List[Dict[str, Any]], symbols: Iterable[str] = None,
+                   since_version: int = 0) -> List[Dict[str, Any]]:
+    """Apply SignalEngine.snapshot's filters to an exported signal list"""
+    wanted = None if symbols is None else set(symbols)
+    return [s for s in signals if s['version'] > since_version and (wanted is None or s['symbol'] in wanted)]
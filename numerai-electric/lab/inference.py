@@ -0,0 +1,352 @@
+"""
+Chunked batch inference
+Tournament rows are streamed from CSV in fixed-size chunks, converted to a
+float32 matrix and scored by every ensemble member as one batch. Each
+chunk's predictions are written out before the next chunk is read, so peak
+memory follows the chunk size rather than the dataset size. Training
+accumulates ridge normal equations over the same chunks.
+"""
+
+import datetime
+import itertools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+FEATURE_PREFIX = 'feature'
+TARGET_COLUMN = 'target'
+
+
+class TournamentChunk:
+    """One block of tournament rows; `targets` is None when the data has none"""
+
+    __slots__ = ('ids', 'eras', 'features', 'targets')
+
+    def __init__(self, ids: List[str], eras: List[str], features: np.ndarray, targets: np.ndarray = None):
+        self.ids = ids
+        self.eras = eras
+        self.features = features
+        self.targets = targets
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def read_header(path: str) -> List[str]:
+    with open(path, newline='') as f:
+        return f.readline().rstrip('\r\n').split(',')
+
+
+def feature_columns(header: List[str]) -> List[int]:
+    columns = [i for i, name in enumerate(header) if name.startswith(FEATURE_PREFIX)]
+    if not columns:
+        raise ValueError(f"No '{FEATURE_PREFIX}*' columns in tournament data")
+    return columns
+
+
+def _parse_target(value: str) -> float:
+    return float(value) if value else np.nan  # Live rows have no target
+
+
+def iter_chunks(path: str, chunk_rows: int = 5000) -> Iterator[TournamentChunk]:
+    """Stream an id,era,...,feature_*[,target] CSV as float32 chunks of `chunk_rows` rows"""
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    with open(path, newline='') as f:
+        header = f.readline().rstrip('\r\n').split(',')
+        columns = feature_columns(header)
+        if 'id' not in header:
+            raise ValueError("Tournament data has no 'id' column")
+        id_col = header.index('id')
+        era_col = header.index('era') if 'era' in header else None
+        key_cols = max(id_col, era_col or 0) + 1
+        target_col = header.index(TARGET_COLUMN) if TARGET_COLUMN in header else None
+        usecols = columns if target_col is None else columns + [target_col]
+        converters = None if target_col is None else {target_col: _parse_target}
+
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                return
+            keys = [line.split(',', key_cols)[:key_cols] for line in lines]
+            values = np.loadtxt(lines, delimiter=',', usecols=usecols, converters=converters,
+                                dtype=np.float32, ndmin=2)
+            yield TournamentChunk(
+                [k[id_col] for k in keys],
+                [k[era_col] for k in keys] if era_col is not None else [''] * len(keys),
+                values if target_col is None else values[:, :-1],
+                None if target_col is None else values[:, -1].copy()
+            )
+
+
+# ============================================================================
+# Models
+# ============================================================================
+
+class LinearModel:
+    """z = X @ weights + bias"""
+
+    __slots__ = ('weights', 'bias')
+
+    def __init__(self, weights: np.ndarray, bias: float = 0.0):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.float32(bias)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.weights)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        z = X @ self.weights
+        z += self.bias
+        return z
+
+    def params(self) -> Dict[str, np.ndarray]:
+        return {'weights': self.weights, 'bias': np.array(self.bias)}
+
+
+class MLPModel:
+    """One tanh hidden layer: z = tanh(X @ w1 + b1) @ w2 + b2"""
+
+    __slots__ = ('w1', 'b1', 'w2', 'b2')
+
+    def __init__(self, w1: np.ndarray, b1: np.ndarray, w2: np.ndarray, b2: float = 0.0):
+        self.w1 = np.asarray(w1, dtype=np.float32)
+        self.b1 = np.asarray(b1, dtype=np.float32)
+        self.w2 = np.asarray(w2, dtype=np.float32)
+        self.b2 = np.float32(b2)
+
+    @property
+    def n_features(self) -> int:
+        return self.w1.shape[0]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        hidden = X @ self.w1
+        hidden += self.b1
+        np.tanh(hidden, out=hidden)
+        z = hidden @ self.w2
+        z += self.b2
+        return z
+
+    def params(self) -> Dict[str, np.ndarray]:
+        return {'w1': self.w1, 'b1': self.b1, 'w2': self.w2, 'b2': np.array(self.b2)}
+
+
+MODEL_TYPES = {'linear': LinearModel, 'mlp': MLPModel}
+
+
+class Ensemble:
+    """Equal-weight average of member probabilities, sigmoid(z), in float32.
+
+    `features` optionally names the input columns the members were fit on.
+    """
+
+    def __init__(self, name: str, members: Dict[str, Any], features: List[str] = None):
+        if not members:
+            raise ValueError("Ensemble needs at least one member")
+        widths = {m.n_features for m in members.values()}
+        if len(widths) != 1:
+            raise ValueError(f"Ensemble members disagree on feature count: {sorted(widths)}")
+        self.name = name
+        self.members = members
+        self.n_features = widths.pop()
+        if features is not None and len(features) != self.n_features:
+            raise ValueError(f"Ensemble has {self.n_features} inputs but {len(features)} feature names")
+        self.features = features
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Model {self.name} expects {self.n_features} features, data has {X.shape[1]}")
+        total = np.zeros(len(X), dtype=np.float32)
+        for model in self.members.values():
+            z = model.predict(X)
+            np.negative(z, out=z)
+            np.exp(z, out=z)
+            z += 1
+            np.reciprocal(z, out=z)
+            total += z
+        total /= len(self.members)
+        return total
+
+    @classmethod
+    def initial(cls, n_features: int, name: str = 'ensemble-v1', hidden: int = 32, seed: int = 0) -> 'Ensemble':
+        """Small seeded members for when no trained weights are on disk"""
+        rng = np.random.default_rng(seed)
+        scale = 1 / np.sqrt(n_features)
+        return cls(name, {
+            'linear-v1': LinearModel(rng.normal(0, scale, n_features), 0.0),
+            'neural-net-v1': MLPModel(rng.normal(0, scale, (n_features, hidden)), np.zeros(hidden),
+                                      rng.normal(0, 1 / np.sqrt(hidden), hidden), 0.0)
+        })
+
+    def save(self, path: str):
+        """Write members as '<kind>:<member>:<param>' arrays in one .npz"""
+        kinds = {model_type: kind for kind, model_type in MODEL_TYPES.items()}
+        arrays = {} if self.features is None else {'features': np.array(self.features)}
+        for member, model in self.members.items():
+            for param, value in model.params().items():
+                arrays[f'{kinds[type(model)]}:{member}:{param}'] = value
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, name: str = None) -> 'Ensemble':
+        grouped: Dict[str, Dict[str, Any]] = {}
+        features = None
+        with np.load(path) as data:
+            for key in data.files:
+                if key == 'features':
+                    features = data[key].tolist()
+                    continue
+                kind, member, param = key.split(':')
+                grouped.setdefault(member, {'kind': kind})[param] = data[key]
+        members = {}
+        for member, params in grouped.items():
+            kind = params.pop('kind')
+            if kind not in MODEL_TYPES:
+                raise ValueError(f"Unknown model kind '{kind}' in {path}")
+            members[member] = MODEL_TYPES[kind](**params)
+        return cls(name or os.path.splitext(os.path.basename(path))[0], members, features)
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+def predict_chunks(chunks: Iterator[TournamentChunk], ensemble: Ensemble, output_path: str,
+                   progress: Callable[[int], None] = None) -> Dict[str, Any]:
+    """Score `chunks` and write id,prediction rows to `output_path` as they finish.
+
+    The file is written under a temporary name and moved into place at the
+    end, so readers never see a partial prediction set. `progress` is called
+    with the number of rows done after each chunk; an exception raised there
+    aborts the run.
+    """
+    start = time.perf_counter()
+    rows = n_chunks = peak_chunk_bytes = 0
+    total = total_sq = 0.0
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    tmp = f'{output_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp, 'w') as out:
+            out.write('id,prediction\n')
+            for chunk in chunks:
+                predictions = ensemble.predict(chunk.features)
+                out.writelines(f'{i},{p:.6f}\n' for i, p in zip(chunk.ids, predictions.tolist()))
+                rows += len(chunk)
+                n_chunks += 1
+                peak_chunk_bytes = max(peak_chunk_bytes, chunk.features.nbytes)
+                as_double = predictions.astype(np.float64)
+                total += float(as_double.sum())
+                total_sq += float(as_double @ as_double)
+                if progress is not None:
+                    progress(rows)
+        os.replace(tmp, output_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    elapsed = time.perf_counter() - start
+    mean = total / rows if rows else 0.0
+    return {
+        'count': rows,
+        'chunks': n_chunks,
+        'model': ensemble.name,
+        'members': list(ensemble.members),
+        'features_used': ensemble.n_features,
+        'generated_at': datetime.datetime.now().isoformat(),
+        'processing_time_ms': round(elapsed * 1000, 2),
+        'rows_per_sec': round(rows / elapsed, 1) if elapsed > 0 else None,
+        'peak_chunk_bytes': peak_chunk_bytes,
+        'mean_prediction': round(mean, 6),
+        'std_prediction': round(max(total_sq / rows - mean * mean, 0.0) ** 0.5, 6) if rows else 0.0,
+        'output_path': output_path
+    }
+
+
+def read_prediction_batches(path: str, rows: int = 65536) -> Iterator[Dict[str, list]]:
+    """An id,prediction file as {'id': [...], 'prediction': [...]} batches of up to `rows` rows"""
+    with open(path, newline='') as f:
+        f.readline()
+        while True:
+            lines = list(itertools.islice(f, rows))
+            if not lines:
+                return
+            pairs = [line.rstrip('\r\n').split(',', 1) for line in lines]
+            yield {'id': [pair[0] for pair in pairs], 'prediction': [float(pair[1]) for pair in pairs]}
+
+
+def _with_bias(X: np.ndarray) -> np.ndarray:
+    return np.hstack([X, np.ones((len(X), 1), dtype=X.dtype)])
+
+
+def fit_ensemble(chunks: Iterator[TournamentChunk], features: List[str], name: str = 'ensemble-v1',
+                 alpha: float = 10.0, hidden: int = 32, seed: int = 0,
+                 progress: Callable[[int], None] = None) -> Tuple[Ensemble, Dict[str, Any]]:
+    """Ridge-fit the linear member and the MLP output layer in one pass over `chunks`.
+
+    Only the normal equations are accumulated, so memory is bounded by the
+    chunk size. The MLP hidden layer keeps its seeded weights. Targets are
+    mapped to 4 * (target - 0.5), the linearisation of the sigmoid at 0.
+    Rows without a target are skipped. `progress` is called with the number
+    of rows read after each chunk.
+    """
+    start = time.perf_counter()
+    n_features = len(features)
+    ensemble = Ensemble.initial(n_features, name, hidden, seed)
+    ensemble.features = list(features)
+    mlp = ensemble.members['neural-net-v1']
+    linear_xtx = np.zeros((n_features + 1, n_features + 1))
+    linear_xty = np.zeros(n_features + 1)
+    hidden_xtx = np.zeros((hidden + 1, hidden + 1))
+    hidden_xty = np.zeros(hidden + 1)
+    rows = n_chunks = seen = 0
+
+    for chunk in chunks:
+        seen += len(chunk)
+        if progress is not None:
+            progress(seen)
+        if chunk.targets is None:
+            raise ValueError("Training data has no target column")
+        labelled = ~np.isnan(chunk.targets)
+        if not labelled.any():
+            continue
+        X = _with_bias(chunk.features[labelled])
+        y = (chunk.targets[labelled] - np.float32(0.5)) * np.float32(4)
+        H = np.tanh(chunk.features[labelled] @ mlp.w1 + mlp.b1)
+        H = _with_bias(H)
+        linear_xtx += X.T @ X
+        linear_xty += X.T @ y
+        hidden_xtx += H.T @ H
+        hidden_xty += H.T @ y
+        rows += int(labelled.sum())
+        n_chunks += 1
+
+    if rows == 0:
+        raise ValueError("Training data has no labelled rows")
+
+    def ridge(xtx, xty):
+        penalty = np.full(len(xtx), alpha)
+        penalty[-1] = 0.0  # Leave the bias unpenalised
+        return np.linalg.solve(xtx + np.diag(penalty), xty)
+
+    coef = ridge(linear_xtx, linear_xty)
+    ensemble.members['linear-v1'] = LinearModel(coef[:-1], coef[-1])
+    coef = ridge(hidden_xtx, hidden_xty)
+    ensemble.members['neural-net-v1'] = MLPModel(mlp.w1, mlp.b1, coef[:-1], coef[-1])
+
+    elapsed = time.perf_counter() - start
+    return ensemble, {
+        'rows': rows,
+        'chunks': n_chunks,
+        'features_used': n_features,
+        'processing_time_ms': round(elapsed * 1000, 2),
+        'rows_per_sec': round(rows / elapsed, 1) if elapsed > 0 else None
+    }
@@ -0,0 +1,253 @@
+"""
+Background jobs
+A bounded pool of worker threads runs training and prediction jobs taken
+from a priority queue, so a deadline prediction jumps ahead of exploratory
+training. Jobs report progress and are cancelled cooperatively: the next
+progress report after a cancel request raises JobCancelled inside the job.
+
+Job records are mirrored to a directory as JSON so any pre-forked worker
+can answer status queries and forward cancellations for jobs running in
+another process.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+PRIORITIES = {'deadline': 0, 'normal': 1, 'exploratory': 2}
+
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = 'queued', 'running', 'completed', 'failed', 'cancelled'
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """One submitted unit of work and its observable state"""
+
+    def __init__(self, scheduler: 'JobScheduler', kind: str, fn: Callable[['Job'], Any], priority: str,
+                 params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.priority = priority
+        self.params = params
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ''
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._fn = fn
+        self._scheduler = scheduler
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._last_persist = 0.0
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set() or self._scheduler._cancel_marked(self.id)
+
+    def report(self, progress: float = None, message: str = None):
+        """Record progress (0..1); raises JobCancelled once a cancel was requested"""
+        if self.cancel_requested:
+            raise JobCancelled()
+        if progress is not None:
+            self.progress = round(min(max(progress, 0.0), 1.0), 4)
+        if message is not None:
+            self.message = message
+        now = time.monotonic()
+        if now - self._last_persist >= self._scheduler.persist_interval:
+            self._last_persist = now
+            self._scheduler._persist(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'priority': self.priority,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'params': self.params,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'pid': os.getpid()
+        }
+
+
+class JobScheduler:
+    """Priority queue of jobs drained by `workers` daemon threads (started on first submit)"""
+
+    def __init__(self, workers: int = 2, max_queued: int = 100, directory: str = None, history: int = 200,
+                 persist_interval: float = 0.5):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.directory = directory
+        self.history = history
+        self.persist_interval = persist_interval
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = 0
+
+    # -- submission ---------------------------------------------------------
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], priority: str = 'normal',
+               params: Dict[str, Any] = None) -> Job:
+        """Queue `fn(job)`; its return value becomes the job result"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'. Available: {list(PRIORITIES)}")
+        job = Job(self, kind, fn, priority, params or {})
+        with self._condition:
+            queued = sum(1 for _, _, j in self._heap if j.status == QUEUED)
+            if queued >= self.max_queued:
+                raise QueueFull(f"Job queue is full ({self.max_queued} queued)")
+            heapq.heappush(self._heap, (PRIORITIES[priority], next(self._sequence), job))
+            self._jobs[job.id] = job
+            self._trim()
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f'job-worker-{len(self._threads)}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._condition.notify()
+        self._persist(job)
+        return job
+
+    def _trim(self):
+        finished = [j for j in self._jobs.values() if j.status in FINISHED]
+        for job in sorted(finished, key=lambda j: j.finished_at)[:max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job.id]
+            self._remove_files(job.id)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                _, _, job = heapq.heappop(self._heap)
+                if job.status != QUEUED:
+                    continue  # Cancelled while queued
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._running += 1
+            self._persist(job)
+            try:
+                job.result = job._fn(job)
+                job.status = COMPLETED
+                job.progress = 1.0
+            except JobCancelled:
+                job.status = CANCELLED
+            except Exception as e:
+                job.status = FAILED
+                job.error = f"{type(e).__name__}: {e}"
+            finally:
+                job.finished_at = time.time()
+                with self._condition:
+                    self._running -= 1
+                self._persist(job)
+                self._remove_files(job.id, record=False)
+                job._done.set()
+
+    # -- queries ------------------------------------------------------------
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Job record from this process, or from another worker's persisted copy; None if unknown"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self._load(job_id)
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs first (this process only)"""
+        jobs = sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+        return [j.to_dict() for j in jobs[:limit]]
+
+    def wait(self, job_id: str, timeout: float) -> Dict[str, Any]:
+        """Block up to `timeout` seconds for a local job to finish; returns its record"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job._done.wait(timeout)
+        return self.get(job_id)
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued job now, or ask a running one to stop; None if unknown"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            record = self._load(job_id)
+            if record is not None and record['status'] not in FINISHED and self.directory:
+                open(self._path(job_id, 'cancel'), 'w').close()  # Picked up by the owning worker
+                record['message'] = 'cancel requested'
+            return record
+        with self._condition:
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                job._done.set()
+            elif job.status == RUNNING:
+                job._cancel.set()
+                job.message = 'cancel requested'
+        self._persist(job)
+        return job.to_dict()
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {status: 0 for status in (QUEUED, RUNNING) + FINISHED}
+        for job in list(self._jobs.values()):
+            counts[job.status] += 1
+        return dict(counts, workers=self.workers, max_queued=self.max_queued)
+
+    # -- persistence --------------------------------------------------------
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f'{job_id}.{suffix}')
+
+    def _persist(self, job: Job):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(job.id, 'json')
+            tmp = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(job.to_dict(), f, default=str)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # Status stays available from this process
+
+    def _load(self, job_id: str) -> Dict[str, Any]:
+        if not self.directory or not job_id.isalnum():
+            return None
+        try:
+            with open(self._path(job_id, 'json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _cancel_marked(self, job_id: str) -> bool:
+        return bool(self.directory) and os.path.exists(self._path(job_id, 'cancel'))
+
+    def _remove_files(self, job_id: str, record: bool = True):
+        if not self.directory:
+            return
+        for suffix in (('json', 'cancel') if record else ('cancel',)):
+            try:
+                os.remove(self._path(job_id, suffix))
+            except OSError:
+                pass
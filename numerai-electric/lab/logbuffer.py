@@ -0,0 +1,56 @@
+"""
+Structured log ring buffer
+Fixed-capacity, lock-protected storage of log records with monotonically
+increasing sequence numbers, so readers can fetch only what is new.
+"""
+
+import datetime
+import threading
+from typing import Dict, List, Any
+
+
+class LogBuffer:
+    """Ring buffer of {'seq', 'timestamp', 'level', 'message'} records"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._records: List[Dict[str, Any]] = [None] * capacity
+        self._next_seq = 1
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._next_seq - 1, self.capacity)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest record (0 when empty)"""
+        return self._next_seq - 1
+
+    def append(self, message: str, level: str = 'info') -> Dict[str, Any]:
+        """Record `message`, overwriting the oldest record once full"""
+        with self._lock:
+            record = {
+                'seq': self._next_seq,
+                'timestamp': datetime.datetime.now().isoformat(),
+                'level': level,
+                'message': message
+            }
+            self._records[self._next_seq % self.capacity] = record
+            self._next_seq += 1
+        return record
+
+    def since(self, seq: int = 0, limit: int = None) -> List[Dict[str, Any]]:
+        """Records newer than `seq`, oldest first; at most the `limit` oldest of them"""
+        with self._lock:
+            start = max(seq + 1, self._next_seq - self.capacity, 1)
+            stop = self._next_seq if limit is None else min(self._next_seq, start + limit)
+            return [self._records[i % self.capacity] for i in range(start, stop)]
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        """The newest `count` records, oldest first"""
+        return self.since(max(self.last_seq - count, 0))
+
+
+def format_record(record: Dict[str, Any]) -> str:
+    """Plain-text form of a record, as written by the download endpoint"""
+    return f"{record['timestamp']} - {record['message']}"
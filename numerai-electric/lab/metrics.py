@@ -0,0 +1,179 @@
+"""
+Trade performance metrics
+Ports of calculate-sharpe-ratio, calculate-max-drawdown, calculate-volatility
+and calculate-avg-trade-duration from backtesting.core. Batch results are
+computed in one vectorized pass over the P&L and timestamp columns; the
+running accumulators give the same numbers for a live trade stream at
+constant cost per trade.
+"""
+
+import math
+from typing import Any, Dict
+
+import numpy as np
+
+HOUR_NS = 3600 * 10 ** 9
+
+
+def sharpe_ratio(pnls: np.ndarray) -> float:
+    """Mean over population std of per-trade P&L (0 for fewer than two trades)"""
+    if len(pnls) <= 1:
+        return 0.0
+    std = pnls.std()
+    return float(pnls.mean() / std) if std > 0 else 0.0
+
+
+def volatility(pnls: np.ndarray) -> float:
+    """Population std of per-trade P&L"""
+    return float(pnls.std()) if len(pnls) else 0.0
+
+
+def max_drawdown(pnls: np.ndarray, initial_value: float) -> float:
+    """Most negative fractional drop of cumulative trade value from its running peak"""
+    if len(pnls) == 0:
+        return 0.0
+    values = initial_value + np.concatenate(([0.0], np.cumsum(pnls)))
+    peaks = np.maximum.accumulate(values)
+    return float(((values - peaks) / peaks).min())
+
+
+def avg_trade_duration(times: np.ndarray) -> float:
+    """Mean whole hours between trades paired in order (1st with 2nd, 3rd with 4th, ...).
+
+    `times` are int64 nanoseconds. A trailing unpaired trade is ignored, as
+    with (partition 2 trades).
+    """
+    pairs = np.asarray(times, dtype=np.int64)[:len(times) // 2 * 2].reshape(-1, 2)
+    if len(pairs) == 0:
+        return 0.0
+    return float(((pairs[:, 1] - pairs[:, 0]) // HOUR_NS).mean())
+
+
+def trade_metrics(pnls: np.ndarray, initial_value: float, times: np.ndarray = None) -> Dict[str, Any]:
+    """Every per-trade metric in one pass; `pnls` holds 0 for opening trades"""
+    n = len(pnls)
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls < 0]
+    mean = pnls.mean() if n else 0.0
+    centred = pnls - mean
+    std = math.sqrt(float(np.dot(centred, centred)) / n) if n else 0.0
+    return {
+        'total_trades': n,
+        'winning_trades': len(wins),
+        'losing_trades': len(losses),
+        'win_rate': len(wins) / n if n else 0,
+        'avg_win': float(wins.mean()) if len(wins) else 0,
+        'avg_loss': float(losses.mean()) if len(losses) else 0,
+        'sharpe_ratio': float(mean / std) if n > 1 and std > 0 else 0.0,
+        'max_drawdown': max_drawdown(pnls, initial_value),
+        'volatility': std,
+        'avg_trade_duration_hours': avg_trade_duration(times) if times is not None else 0.0,
+    }
+
+
+# ============================================================================
+# Running accumulators
+# ============================================================================
+
+class RunningMeanStd:
+    """Mean and population std of every value pushed so far (Welford)"""
+
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(max(self.m2, 0.0) / self.count) if self.count else 0.0
+
+
+class RunningDrawdown:
+    """Cumulative value, its running peak and the worst fractional drawdown so far"""
+
+    __slots__ = ('value', 'peak', 'max_drawdown')
+
+    def __init__(self, initial_value: float):
+        self.value = float(initial_value)
+        self.peak = self.value
+        self.max_drawdown = 0.0
+
+    def push(self, pnl: float):
+        self.value += pnl
+        if self.value > self.peak:
+            self.peak = self.value
+        elif self.peak:
+            self.max_drawdown = min(self.max_drawdown, (self.value - self.peak) / self.peak)
+
+
+class RunningDuration:
+    """Average whole hours between trades paired in arrival order"""
+
+    __slots__ = ('pending', 'pairs', 'total_hours')
+
+    def __init__(self):
+        self.pending = None
+        self.pairs = 0
+        self.total_hours = 0
+
+    def push(self, time_ns: int):
+        if self.pending is None:
+            self.pending = time_ns
+            return
+        self.total_hours += (time_ns - self.pending) // HOUR_NS
+        self.pairs += 1
+        self.pending = None
+
+    @property
+    def average(self) -> float:
+        return self.total_hours / self.pairs if self.pairs else 0.0
+
+
+class TradeStats:
+    """trade_metrics() for a stream of trades, updated in O(1) per trade"""
+
+    __slots__ = ('pnl', 'drawdown', 'duration', 'wins', 'losses', 'win_total', 'loss_total')
+
+    def __init__(self, initial_value: float):
+        self.pnl = RunningMeanStd()
+        self.drawdown = RunningDrawdown(initial_value)
+        self.duration = RunningDuration()
+        self.wins = self.losses = 0
+        self.win_total = self.loss_total = 0.0
+
+    def push(self, pnl: float, time_ns: int = None):
+        """Record one trade; opening trades carry a P&L of 0"""
+        self.pnl.push(pnl)
+        self.drawdown.push(pnl)
+        if time_ns is not None:
+            self.duration.push(time_ns)
+        if pnl > 0:
+            self.wins += 1
+            self.win_total += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.loss_total += pnl
+
+    def snapshot(self) -> Dict[str, Any]:
+        n = self.pnl.count
+        std = self.pnl.std
+        return {
+            'total_trades': n,
+            'winning_trades': self.wins,
+            'losing_trades': self.losses,
+            'win_rate': self.wins / n if n else 0,
+            'avg_win': self.win_total / self.wins if self.wins else 0,
+            'avg_loss': self.loss_total / self.losses if self.losses else 0,
+            'sharpe_ratio': self.pnl.mean / std if n > 1 and std > 0 else 0.0,
+            'max_drawdown': self.drawdown.max_drawdown,
+            'volatility': std,
+            'avg_trade_duration_hours': self.duration.average,
+        }
@@ -0,0 +1,108 @@
+"""
+Parallel parameter grid search
+Spreads the cartesian product of strategy parameters across a process pool.
+Workers attach to one shared-memory copy of the market data and results are
+yielded as each combination finishes.
+"""
+
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Iterator, Sequence
+
+from lab import backtest, sharedmem
+
+# Worker-process state, populated once per worker by _init_worker
+_WORKER = {}
+
+
+def _init_worker(descriptor):
+    shm, market_data = sharedmem.attach(descriptor)
+    _WORKER['shm'] = shm
+    _WORKER['market_data'] = market_data
+
+
+def _run_combination(strategy_type: str, params: Dict[str, Any], options: Dict[str, Any]):
+    result = backtest.run_backtest(strategy_type, params, _WORKER['market_data'], **options)
+    return {
+        'parameters': params,
+        'metrics': result['metrics'],
+        'processing_time_ms': result['processing_time_ms'],
+    }
+
+
+def parameter_grid(parameter_ranges: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of parameter ranges as a list of parameter dicts"""
+    keys = list(parameter_ranges)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(parameter_ranges[k] for k in keys))]
+
+
+def optimize_strategy(strategy_type: str, market_data: Sequence[backtest.Bars],
+                      parameter_ranges: Dict[str, Sequence[Any]], workers: int = None, cache=None,
+                      cache_key: Callable[[Dict[str, Any]], str] = None,
+                      **options) -> Iterator[Dict[str, Any]]:
+    """Grid-search `parameter_ranges`, returning an iterator of per-combination records.
+
+    Parameters are validated before any worker starts. The last record is a
+    summary with the best combination by Sharpe ratio, matching
+    optimize-strategy in backtesting.core. Closing the iterator early cancels
+    outstanding combinations. With a ResultCache and `cache_key(params)`,
+    cached combinations are yielded first and only the rest are computed.
+    """
+    started = time.perf_counter()
+    grid = parameter_grid(parameter_ranges)
+    for params in grid:
+        backtest.resolve_strategy(strategy_type, params)  # Fail fast on bad parameters
+    workers = max(1, min(workers or os.cpu_count() or 1, len(grid) or 1))
+    return _stream(strategy_type, market_data, grid, workers, options, started, cache, cache_key)
+
+
+def _stream(strategy_type, market_data, grid, workers, options, started, cache=None, cache_key=None):
+    total = len(grid)
+    best = None
+    completed = 0
+    pending = []
+    for params in grid:
+        result = cache.get(cache_key(params)) if cache is not None else None
+        if result is None:
+            pending.append(params)
+            continue
+        completed += 1
+        if best is None or result['metrics']['sharpe_ratio'] > best['metrics']['sharpe_ratio']:
+            best = result
+        yield dict(result, parameters=params, type='result', completed=completed, total=total, cached=True)
+    cache_hits = completed
+
+    with sharedmem.SharedMarketData(market_data if pending else []) as shared:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(shared.descriptor,)
+        )
+        try:
+            futures = [executor.submit(_run_combination, strategy_type, params, options) for params in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                if cache is not None:
+                    cache.put(cache_key(result['parameters']), result)
+                completed += 1
+                if best is None or result['metrics']['sharpe_ratio'] > best['metrics']['sharpe_ratio']:
+                    best = result
+                yield dict(result, type='result', completed=completed, total=total, cached=False)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    yield {
+        'type': 'summary',
+        'status': 'success',
+        'strategy': strategy_type,
+        'best_strategy': best,
+        'total': total,
+        'completed': completed,
+        'cache_hits': cache_hits,
+        'workers': workers,
+        'processing_time_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
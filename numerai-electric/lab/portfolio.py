@@ -0,0 +1,270 @@
+"""
+Array-backed portfolio accounting
+Positions, entry prices, last prices and realized P&L live in parallel
+NumPy arrays indexed by symbol id instead of a map of position records, so
+fills and mark-to-market are applied to a whole batch of symbols per
+timestamp and revaluing thousands of names is a couple of array reductions.
+Trade semantics match execute-trade in backtesting.core.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from lab.metrics import TradeStats
+
+BUY, SELL = 1, -1
+
+# Batches up to this size are filled element by element: cheaper than NumPy's per-call overhead
+SMALL_BATCH = 8
+
+
+class TradeLog:
+    """Executed trades as growable parallel columns"""
+
+    __slots__ = ('size', 'side', 'symbol_id', 'quantity', 'price', 'time', 'commission', 'pnl')
+
+    def __init__(self, capacity: int = 256):
+        self.size = 0
+        self.side = np.empty(capacity, dtype=np.int8)
+        self.symbol_id = np.empty(capacity, dtype=np.int64)
+        self.quantity = np.empty(capacity, dtype=np.int64)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.time = np.empty(capacity, dtype=np.int64)
+        self.commission = np.empty(capacity, dtype=np.float64)
+        self.pnl = np.empty(capacity, dtype=np.float64)  # NaN for buys
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, n: int):
+        if self.size + n > len(self.side):
+            capacity = max(2 * len(self.side), self.size + n)
+            for name in TradeLog.__slots__[1:]:
+                column = getattr(self, name)
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                setattr(self, name, grown)
+
+    def append(self, side, symbol_id, quantity, price, time, commission, pnl):
+        """Append a batch of trades (scalars broadcast)"""
+        n = len(symbol_id)
+        self._reserve(n)
+        end = self.size + n
+        self.side[self.size:end] = side
+        self.symbol_id[self.size:end] = symbol_id
+        self.quantity[self.size:end] = quantity
+        self.price[self.size:end] = price
+        self.time[self.size:end] = time
+        self.commission[self.size:end] = commission
+        self.pnl[self.size:end] = pnl
+        self.size = end
+
+    def add(self, side: int, symbol_id: int, quantity: int, price: float, time: int, commission: float,
+            pnl: float):
+        """Append a single trade"""
+        self._reserve(1)
+        i = self.size
+        self.side[i] = side
+        self.symbol_id[i] = symbol_id
+        self.quantity[i] = quantity
+        self.price[i] = price
+        self.time[i] = time
+        self.commission[i] = commission
+        self.pnl[i] = pnl
+        self.size = i + 1
+
+    def column(self, name: str) -> np.ndarray:
+        return getattr(self, name)[:self.size]
+
+
+class Portfolio:
+    """Cash plus per-symbol position arrays for a fixed universe of symbols.
+
+    A buy opens a position of int(cash * max_position_size / price) shares
+    when the symbol is flat and cash covers cost plus commission; a sell
+    closes an open position in full. Within one batch, fills settle in batch
+    order, so cash freed by an earlier sell can fund a later buy.
+    """
+
+    __slots__ = ('symbols', 'index', 'cash', 'max_position_size', 'commission', 'open', 'quantity',
+                 'entry_price', 'entry_time', 'entry_sequence', 'last_price', 'realized_pnl', 'trades',
+                 'stats', '_sequence')
+
+    def __init__(self, symbols: Sequence[str], cash: float, max_position_size: float = 0.1,
+                 commission: float = 0.001, track_stats: bool = False):
+        n = len(symbols)
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.cash = float(cash)
+        self.max_position_size = float(max_position_size)
+        self.commission = float(commission)
+        self.open = np.zeros(n, dtype=bool)
+        self.quantity = np.zeros(n, dtype=np.int64)
+        self.entry_price = np.zeros(n, dtype=np.float64)
+        self.entry_time = np.zeros(n, dtype=np.int64)
+        self.entry_sequence = np.zeros(n, dtype=np.int64)
+        self.last_price = np.full(n, np.nan)
+        self.realized_pnl = np.zeros(n, dtype=np.float64)
+        self.trades = TradeLog()
+        self.stats = TradeStats(cash) if track_stats else None  # Live metrics, updated per trade
+        self._sequence = 0
+
+    def symbol_ids(self, symbols: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.index[s] for s in symbols), dtype=np.int64, count=len(symbols))
+
+    def apply_fills(self, ids: np.ndarray, sides: np.ndarray, prices: np.ndarray, time: int = 0) -> int:
+        """Apply one timestamp's buy/sell orders for distinct symbol `ids`; returns trades executed.
+
+        Sells are settled as a vector. Buys are sized one at a time because
+        each one's quantity depends on the cash left by the orders before it.
+        """
+        if len(ids) <= SMALL_BATCH:
+            if isinstance(ids, np.ndarray):
+                ids, sides, prices = ids.tolist(), np.asarray(sides).tolist(), np.asarray(prices).tolist()
+            return self._apply_small(ids, sides, prices, int(time))
+        ids = np.asarray(ids, dtype=np.int64)
+        sides = np.asarray(sides)
+        prices = np.asarray(prices, dtype=np.float64)
+        held = self.open[ids]
+        sell = (sides != BUY) & held
+        buy = (sides == BUY) & ~held
+
+        quantity = np.where(sell, self.quantity[ids], 0)
+        gross = prices * quantity
+        commission = gross * self.commission
+        net = np.where(sell, gross - commission, 0.0)
+        pnl = np.where(sell, net - self.entry_price[ids] * quantity, np.nan)
+
+        cash = self.cash
+        if buy.any():
+            start = 0
+            for j in np.flatnonzero(buy).tolist():
+                if j > start:
+                    cash = float(np.add.accumulate(np.concatenate(([cash], net[start:j])))[-1])
+                start = j + 1
+                price = float(prices[j])
+                size = int(cash * self.max_position_size / price)
+                cost = price * size * self.commission
+                total = price * size + cost
+                if cash > total:
+                    cash -= total
+                    quantity[j] = size
+                    commission[j] = cost
+                else:
+                    buy[j] = False
+            net = net[start:]
+        if len(net):
+            cash = float(np.add.accumulate(np.concatenate(([cash], net)))[-1])
+        self.cash = cash
+
+        if sell.any():
+            closed = ids[sell]
+            self.open[closed] = False
+            self.quantity[closed] = 0
+            self.realized_pnl[closed] += pnl[sell]
+        if buy.any():
+            opened = ids[buy]
+            count = len(opened)
+            self.open[opened] = True
+            self.quantity[opened] = quantity[buy]
+            self.entry_price[opened] = prices[buy]
+            self.entry_time[opened] = time
+            self.entry_sequence[opened] = np.arange(self._sequence, self._sequence + count)
+            self._sequence += count
+        self.last_price[ids] = prices
+
+        filled = buy | sell
+        count = int(filled.sum())
+        if count:
+            self.trades.append(np.where(buy, BUY, SELL)[filled], ids[filled], quantity[filled], prices[filled],
+                               time, commission[filled], pnl[filled])
+            if self.stats is not None:
+                for value in np.nan_to_num(pnl[filled]).tolist():
+                    self.stats.push(value, int(time))
+        return count
+
+    def _apply_small(self, ids: List[int], sides: List[int], prices: List[float], time: int) -> int:
+        """apply_fills one order at a time, with the same arithmetic"""
+        executed = 0
+        for i, side, price in zip(ids, sides, prices):
+            price = float(price)
+            self.last_price[i] = price
+            if side == BUY:
+                if self.open[i]:
+                    continue
+                size = int(self.cash * self.max_position_size / price)
+                cost = price * size * self.commission
+                total = price * size + cost
+                if self.cash > total:
+                    self.cash -= total
+                    self.open[i] = True
+                    self.quantity[i] = size
+                    self.entry_price[i] = price
+                    self.entry_time[i] = time
+                    self.entry_sequence[i] = self._sequence
+                    self._sequence += 1
+                    self.trades.add(BUY, i, size, price, time, cost, np.nan)
+                    if self.stats is not None:
+                        self.stats.push(0.0, time)
+                    executed += 1
+            elif self.open[i]:
+                quantity = int(self.quantity[i])
+                gross = price * quantity
+                cost = gross * self.commission
+                net = gross - cost
+                pnl = net - float(self.entry_price[i]) * quantity
+                self.cash += net
+                self.open[i] = False
+                self.quantity[i] = 0
+                self.realized_pnl[i] += pnl
+                self.trades.add(SELL, i, quantity, price, time, cost, pnl)
+                if self.stats is not None:
+                    self.stats.push(pnl, time)
+                executed += 1
+        return executed
+
+    def mark(self, ids: np.ndarray, prices: np.ndarray):
+        """Mark-to-market: record the latest prices of symbol `ids`"""
+        self.last_price[ids] = prices
+
+    def market_value(self) -> float:
+        """Open positions at their last prices (entry price where never marked)"""
+        prices = np.where(np.isnan(self.last_price), self.entry_price, self.last_price)
+        return float(np.dot(self.quantity[self.open], prices[self.open]))
+
+    def value(self) -> float:
+        return self.cash + self.market_value()
+
+    def unrealized_pnl(self) -> np.ndarray:
+        """Per-symbol open P&L at the last prices (0 for flat symbols)"""
+        marked = np.where(np.isnan(self.last_price), self.entry_price, self.last_price)
+        return np.where(self.open, (marked - self.entry_price) * self.quantity, 0.0)
+
+    def positions(self, format_time=None) -> Dict[str, Dict[str, Any]]:
+        """Open positions as records keyed by symbol, in the order they were opened"""
+        ids = np.flatnonzero(self.open)
+        ids = ids[np.argsort(self.entry_sequence[ids], kind='stable')]
+        times = self.entry_time[ids]
+        times = format_time(times) if format_time is not None else times.tolist()
+        return {self.symbols[i]: {'symbol': self.symbols[i], 'quantity': q, 'entry_price': p,
+                                  'entry_time': t, 'status': 'open'}
+                for i, q, p, t in zip(ids.tolist(), self.quantity[ids].tolist(),
+                                      self.entry_price[ids].tolist(), times)}
+
+    def trade_records(self, format_time=None) -> List[Dict[str, Any]]:
+        """Executed trades as dicts ('pnl' on sells only)"""
+        log = self.trades
+        times = log.column('time')
+        times = format_time(times) if format_time is not None else times.tolist()
+        records = []
+        for side, symbol_id, quantity, price, timestamp, commission, pnl in zip(
+                log.column('side').tolist(), log.column('symbol_id').tolist(), log.column('quantity').tolist(),
+                log.column('price').tolist(), times, log.column('commission').tolist(),
+                log.column('pnl').tolist()):
+            record = {'type': 'buy' if side == BUY else 'sell', 'symbol': self.symbols[symbol_id],
+                      'quantity': quantity, 'price': price, 'timestamp': timestamp, 'commission': commission}
+            if side != BUY:
+                record['pnl'] = pnl
+            records.append(record)
+        return records
@@ -0,0 +1,100 @@
+"""
+Pre-forked production server
+The master binds one listening socket, forks worker processes that each run
+a threaded WSGI server accepting on that socket, and respawns workers that
+exit. Helper processes (e.g. the signal engine owner) are supervised the same
+way.
+"""
+
+import functools
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Dict, List
+
+from werkzeug.serving import make_server
+
+
+class _Shutdown(Exception):
+    pass
+
+
+def _fork(target: Callable[[], None]) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        code = 0
+        try:
+            target()
+        except BaseException:
+            code = 1
+            import traceback
+            traceback.print_exc()
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve_prefork(app, host: str, port: int, workers: int, helpers: List[Callable[[], None]] = (),
+                  backlog: int = 1024, log: Callable[[str], None] = print, on_start: Callable[[], None] = None,
+                  worker_init: Callable[[int], None] = None):
+    """Serve `app` from `workers` forked processes sharing one socket until SIGTERM/SIGINT.
+
+    `on_start` runs in the master once the children are forked, e.g. to
+    start background threads that must not be inherited by them.
+    `worker_init(index)` runs in each worker before it serves; a respawned
+    worker gets the index of the one it replaces.
+    """
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+
+    def run_worker(index: int):
+        if worker_init is not None:
+            worker_init(index)
+        server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+        server.serve_forever()
+
+    children: Dict[int, Callable[[], None]] = {}
+    for target in list(helpers) + [functools.partial(run_worker, i) for i in range(workers)]:
+        children[_fork(target)] = target
+    log(f"Pre-forked {workers} workers and {len(helpers)} helpers on {host}:{port}")
+    if on_start is not None:
+        on_start()
+
+    def stop(signum, frame):
+        raise _Shutdown()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while True:
+        try:
+            pid, status = os.waitpid(-1, 0)
+        except (ChildProcessError, _Shutdown):
+            break
+        target = children.pop(pid, None)
+        if target is not None:
+            log(f"Process {pid} exited with status {status}; respawning")
+            time.sleep(0.5)  # Avoid a tight crash loop
+            children[_fork(target)] = target
+
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+    sys.exit(0)
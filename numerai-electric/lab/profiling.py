@@ -0,0 +1,258 @@
+"""
+Request profiling
+A single request is profiled on demand, either deterministically with
+cProfile (saved as pstats) or by sampling the handling thread's stack
+(saved as collapsed stacks for flamegraph.pl or speedscope). A low-rate
+background sampler watches every in-flight request and tallies the hottest
+functions across all of them.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+MODES = ('cprofile', 'sample')
+SUFFIXES = ('.pstats', '.folded', '.json')
+
+
+def frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def stack_labels(frame) -> List[str]:
+    """Function labels of `frame` and its callers, outermost first"""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class StackSampler:
+    """Samples the stacks of registered threads every `interval` seconds from a daemon thread.
+
+    Counts whole collapsed stacks (up to `max_stacks` distinct ones) and,
+    per function, the samples it was running in (self) or on the stack for
+    (total).
+    """
+
+    def __init__(self, interval: float, max_stacks: int = 10000):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self._threads: Dict[int, int] = {}  # ident -> nesting depth
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def remove_thread(self, ident: int):
+        with self._lock:
+            depth = self._threads.get(ident, 0) - 1
+            if depth > 0:
+                self._threads[ident] = depth
+            else:
+                self._threads.pop(ident, None)
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                idents = list(self._threads)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self._record(stack_labels(frame))
+            del frames
+
+    def _record(self, labels: List[str]):
+        with self._lock:
+            self.samples += 1
+            key = ';'.join(labels)
+            if key in self.stacks or len(self.stacks) < self.max_stacks:
+                self.stacks[key] += 1
+            else:
+                self.stacks['[other stacks]'] += 1
+            self.self_counts[labels[-1]] += 1
+            self.total_counts.update(set(labels))
+
+    def folded(self) -> str:
+        """Collapsed-stack text: one 'outer;...;inner count' line per distinct stack"""
+        with self._lock:
+            return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def snapshot(self, limit: int = 200) -> Dict[str, Any]:
+        """JSON-serialisable tallies of the `limit` hottest functions"""
+        with self._lock:
+            return {
+                'interval': self.interval,
+                'samples': self.samples,
+                'self': dict(self.self_counts.most_common(limit)),
+                'total': dict(self.total_counts.most_common(limit))
+            }
+
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum sampler snapshots from several processes"""
+    merged = {'interval': None, 'samples': 0, 'self': Counter(), 'total': Counter()}
+    for snapshot in snapshots:
+        if not snapshot:
+            continue
+        merged['interval'] = snapshot['interval']
+        merged['samples'] += snapshot['samples']
+        merged['self'].update(snapshot['self'])
+        merged['total'].update(snapshot['total'])
+    return merged
+
+
+def top_functions(snapshot: Dict[str, Any], limit: int = 20) -> List[Dict[str, Any]]:
+    """Hottest functions of a snapshot by self samples"""
+    samples = snapshot['samples'] or 1
+    return [{
+        'function': label,
+        'self_samples': count,
+        'total_samples': snapshot['total'].get(label, count),
+        'self_percent': round(100 * count / samples, 2)
+    } for label, count in Counter(snapshot['self']).most_common(limit)]
+
+
+class RequestProfile:
+    """Profile of the calling thread from construction until stop()"""
+
+    def __init__(self, mode: str, sample_interval: float = 0.001):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Available: {list(MODES)}")
+        self.mode = mode
+        self.started_at = time.time()
+        self.duration = None
+        self._start = time.perf_counter()
+        if mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = StackSampler(sample_interval)
+            self._profiler.add_thread(threading.get_ident())
+            self._profiler.start()
+
+    def stop(self):
+        if self.duration is not None:
+            return
+        if self.mode == 'cprofile':
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+        self.duration = time.perf_counter() - self._start
+
+    def _top(self, limit: int) -> List[Dict[str, Any]]:
+        if self.mode == 'sample':
+            return top_functions(self._profiler.snapshot(limit), limit)
+        stats = pstats.Stats(self._profiler, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [{
+            'function': f"{name} ({os.path.basename(filename)}:{line})",
+            'calls': calls,
+            'self_ms': round(tottime * 1000, 3),
+            'cumulative_ms': round(cumtime * 1000, 3)
+        } for (filename, line, name), (_, calls, tottime, cumtime, _) in rows]
+
+    def save(self, directory: str, route: str, method: str, keep: int = 200) -> Dict[str, Any]:
+        """Stop, write the profile and its JSON record into `directory`; returns the record"""
+        self.stop()
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(self.started_at))
+        slug = ''.join(c if c.isalnum() else '_' for c in route).strip('_') or 'root'
+        profile_id = f'{stamp}-{slug}-{uuid.uuid4().hex[:6]}'
+
+        data_file = profile_id + ('.pstats' if self.mode == 'cprofile' else '.folded')
+        path = os.path.join(directory, data_file)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        if self.mode == 'cprofile':
+            self._profiler.dump_stats(tmp)
+        else:
+            with open(tmp, 'w') as f:
+                f.write(self._profiler.folded())
+        os.replace(tmp, path)
+
+        record = {
+            'profile_id': profile_id,
+            'route': route,
+            'method': method,
+            'mode': self.mode,
+            'created_at': self.started_at,
+            'duration_ms': round(self.duration * 1000, 3),
+            'file': data_file,
+            'top_functions': self._top(20)
+        }
+        path = os.path.join(directory, profile_id + '.json')
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+        prune(directory, keep)
+        return record
+
+
+def list_profiles(directory: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """Saved profile records, newest first (without their top-function tables)"""
+    try:
+        names = sorted((n for n in os.listdir(directory) if n.endswith('.json')), reverse=True)
+    except OSError:
+        return []
+    records = []
+    for name in names[:limit]:
+        try:
+            with open(os.path.join(directory, name)) as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue  # Pruned or half-written by another worker
+        record.pop('top_functions', None)
+        records.append(record)
+    return records
+
+
+def prune(directory: str, keep: int):
+    """Delete all but the newest `keep` profiles"""
+    try:
+        ids = sorted((n[:-5] for n in os.listdir(directory) if n.endswith('.json')), reverse=True)
+    except OSError:
+        return
+    for profile_id in ids[keep:]:
+        for suffix in SUFFIXES:
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except OSError:
+                pass
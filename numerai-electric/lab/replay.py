@@ -0,0 +1,249 @@
+"""
+Market-data replay feed
+Replays stored bars of many symbols in timestamp order as price ticks, at a
+speed multiplier over the bars' own clock (0 = as fast as possible). A
+producer thread publishes into a bounded queue that either blocks it or
+drops the oldest queued tick when full; a consumer thread feeds a
+SignalEngine and records the latency from publication to evaluated signal.
+Given a Portfolio, the consumer also paper-trades each BUY/SELL signal and
+keeps its trade metrics current as trades happen.
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from lab.backtest import Bars, iter_chunks
+from lab.portfolio import BUY, SELL
+
+POLICIES = ('block', 'drop')
+SIDES = {'BUY': BUY, 'SELL': SELL}
+LATENCY_SAMPLES = 65536  # Most recent latencies kept for percentiles
+
+Tick = Tuple[int, int, float, str]  # (timestamp ns, symbol id, close, ISO timestamp)
+
+
+def _ticks(symbol_id: int, bars: Bars, chunk_rows: int = 4096) -> Iterator[Tick]:
+    for chunk in iter_chunks(bars, chunk_rows):
+        texts = [text + 'Z' for text in np.datetime_as_string(chunk.timestamp, unit='s').tolist()]
+        yield from zip(chunk.timestamp.astype(np.int64).tolist(), [symbol_id] * len(chunk),
+                       chunk.close.tolist(), texts)
+
+
+class ReplayFeed:
+    """One replay of `market_data` into `engine`, started with start()"""
+
+    def __init__(self, market_data: Sequence[Bars], engine, speed: float = 1.0, queue_size: int = 10000,
+                 policy: str = 'block', batch_size: int = 256, observe: Callable[[float], None] = None,
+                 portfolio=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}'. Available: {list(POLICIES)}")
+        if speed < 0:
+            raise ValueError("speed must be >= 0 (0 replays as fast as possible)")
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("queue_size and batch_size must be positive")
+        self.market_data = list(market_data)
+        self.symbols = [bars.symbol for bars in self.market_data]
+        self.engine = engine
+        self.speed = float(speed)
+        self.queue_size = queue_size
+        self.policy = policy
+        self.batch_size = batch_size
+        self.observe = observe
+        self.portfolio = portfolio  # Over self.symbols, with track_stats for live metrics
+        self.state = 'created'
+        self.error = None
+        self.published = 0
+        self.processed = 0
+        self.dropped = 0
+        self.blocked_seconds = 0.0
+        self.max_depth = 0
+        self.max_lag = 0.0  # Furthest the producer fell behind the requested schedule, seconds
+        self.replayed_ns = 0  # Span of bar time published so far
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._producer_done = False
+        self._latencies = np.zeros(LATENCY_SAMPLES, dtype=np.float64)
+        self._latency_count = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._started = None
+        self._finished = None
+        self._start_version = 0
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return self.state == 'running'
+
+    def start(self) -> 'ReplayFeed':
+        self.state = 'running'
+        self._started = time.perf_counter()
+        self._start_version = self.engine.version
+        self._threads = [threading.Thread(target=self._produce, name='replay-producer', daemon=True),
+                         threading.Thread(target=self._consume, name='replay-consumer', daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Stop both threads; ticks still queued are discarded"""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the replay ends; True if it has"""
+        for thread in self._threads:
+            thread.join(timeout)
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def _produce(self):
+        try:
+            merged = heapq.merge(*(_ticks(i, bars) for i, bars in enumerate(self.market_data)))
+            first = None
+            for tick in merged:
+                if self._stop.is_set():
+                    break
+                if first is None:
+                    first = tick[0]
+                    origin = time.perf_counter()
+                self.replayed_ns = tick[0] - first
+                if self.speed:
+                    ahead = origin + self.replayed_ns / 1e9 / self.speed - time.perf_counter()
+                    if ahead > 0.001:
+                        self._stop.wait(ahead)
+                    elif -ahead > self.max_lag:
+                        self.max_lag = -ahead
+                self._put(tick)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self._stop.set()
+        finally:
+            with self._condition:
+                self._producer_done = True
+                self._condition.notify_all()
+
+    def _put(self, tick: Tick):
+        with self._condition:
+            if len(self._queue) >= self.queue_size:
+                if self.policy == 'drop':
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    blocked = time.perf_counter()
+                    while len(self._queue) >= self.queue_size and not self._stop.is_set():
+                        self._condition.wait(0.1)
+                    self.blocked_seconds += time.perf_counter() - blocked
+            self._queue.append((tick, time.perf_counter_ns()))
+            self.published += 1
+            if len(self._queue) > self.max_depth:
+                self.max_depth = len(self._queue)
+            self._condition.notify_all()
+
+    def _consume(self):
+        symbols = self.symbols
+        update = self.engine.update
+        book = self.portfolio
+        try:
+            while True:
+                with self._condition:
+                    while not self._queue and not self._producer_done and not self._stop.is_set():
+                        self._condition.wait(0.1)
+                    if self._stop.is_set() or (not self._queue and self._producer_done):
+                        break
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                    self._condition.notify_all()  # Room for a blocked producer
+                latencies = []
+                for (time_ns, symbol_id, price, timestamp), published in batch:
+                    record = update(symbols[symbol_id], price, timestamp)
+                    if book is not None:
+                        side = SIDES.get(record['signal']) if record is not None else None
+                        if side is None:
+                            book.last_price[symbol_id] = price
+                        else:
+                            book.apply_fills([symbol_id], [side], [price], time_ns)
+                    latencies.append(time.perf_counter_ns() - published)
+                self._record(np.array(latencies, dtype=np.float64) / 1e9)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self._stop.set()
+        self._finished = time.perf_counter()
+        if self.error:
+            self.state = 'failed'
+        elif self._stop.is_set():
+            self.state = 'stopped'
+        else:
+            self.state = 'finished'
+
+    def _record(self, latencies: np.ndarray):
+        n = len(latencies)
+        slots = (self._latency_count + np.arange(n)) % LATENCY_SAMPLES
+        self._latencies[slots] = latencies
+        self._latency_count += n
+        self._latency_total += float(latencies.sum())
+        self._latency_max = max(self._latency_max, float(latencies.max()))
+        self.processed += n
+        if self.observe is not None:
+            for value in latencies.tolist():
+                self.observe(value)
+
+    def latency(self) -> Dict[str, Any]:
+        """Tick-to-signal latency in milliseconds; percentiles over the most recent samples"""
+        count = self._latency_count
+        if not count:
+            return {'count': 0}
+        recent = self._latencies[:min(count, LATENCY_SAMPLES)] * 1000
+        p50, p95, p99 = np.percentile(recent, [50, 95, 99]).tolist()
+        return {
+            'count': count,
+            'mean_ms': round(self._latency_total / count * 1000, 4),
+            'p50_ms': round(p50, 4),
+            'p95_ms': round(p95, 4),
+            'p99_ms': round(p99, 4),
+            'max_ms': round(self._latency_max * 1000, 4)
+        }
+
+    def paper_trading(self) -> Dict[str, Any]:
+        """The paper portfolio's value and running trade metrics"""
+        book = self.portfolio
+        return {
+            'cash': round(book.cash, 2),
+            'value': round(book.value(), 2),
+            'open_positions': int(book.open.sum()),
+            'metrics': book.stats.snapshot() if book.stats is not None else None
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        end = self._finished or time.perf_counter()
+        elapsed = end - self._started if self._started else 0.0
+        stats = {
+            'state': self.state,
+            'error': self.error,
+            'symbols': len(self.symbols),
+            'speed': self.speed or 'max',
+            'policy': self.policy,
+            'queue_size': self.queue_size,
+            'queue_depth': len(self._queue),
+            'max_queue_depth': self.max_depth,
+            'published': self.published,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'producer_blocked_seconds': round(self.blocked_seconds, 4),
+            'max_schedule_lag_ms': round(self.max_lag * 1000, 3),
+            'elapsed_seconds': round(elapsed, 3),
+            'replayed_seconds': round(self.replayed_ns / 1e9, 3),
+            'ticks_per_second': round(self.processed / elapsed, 1) if elapsed else 0.0,
+            'signal_changes': self.engine.version - self._start_version,
+            'latency': self.latency()
+        }
+        if self.portfolio is not None:
+            stats['paper_trading'] = self.paper_trading()
+        return stats
@@ -0,0 +1,113 @@
+"""
+Precomputed response cache
+Serialized JSON bodies stored per route together with an ETag and an
+optional gzipped copy. Entries are rebuilt when the state fields they were
+built from change version, or when their TTL runs out.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+
+class TrackedDict(dict):
+    """dict that versions each key on assignment.
+
+    Only top-level assignment is tracked: replace nested values
+    (state['x'] = {...}) rather than mutating them in place.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self.versions: Dict[str, int] = {}
+
+    def _touch(self, key):
+        self.version += 1
+        self.versions[key] = self.version
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._touch(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        self._touch(key)
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def version_of(self, keys: Iterable[str] = None) -> Tuple[int, ...]:
+        """Version stamp of `keys`, or of the whole dict when omitted"""
+        if keys is None:
+            return (self.version,)
+        return tuple(self.versions.get(k, 0) for k in keys)
+
+
+class CachedResponse:
+    """Serialized body plus validators for one route"""
+
+    __slots__ = ('body', 'etag', 'version', 'expires', '_gzipped')
+
+    def __init__(self, body: bytes, version, expires: float):
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.version = version
+        self.expires = expires
+        self._gzipped = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+class ResponseCache:
+    """Route-keyed cache of CachedResponse entries"""
+
+    def __init__(self):
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, version, build: Callable[[], bytes], ttl: float = None) -> CachedResponse:
+        """Cached entry for `key` at `version`, calling `build` to refresh it"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version and entry.expires > now:
+            self.hits += 1
+            return entry
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version and entry.expires > now:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = CachedResponse(build(), version, now + ttl if ttl else float('inf'))
+            self._entries[key] = entry
+            return entry
+
+    def invalidate(self, key: str = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
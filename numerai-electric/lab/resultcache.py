@@ -0,0 +1,174 @@
+"""
+Content-addressed result cache
+Results are stored under a hash of everything that determines them
+(strategy, parameters, symbols, date range, data fingerprints, options).
+Recently used entries sit in an in-memory LRU; every entry is also written
+gzipped to a directory that is bounded in total size, evicting the least
+recently used files first. Pre-forked workers share the disk tier.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+SUFFIX = '.json.gz'
+
+
+def content_key(parts: Dict[str, Any]) -> str:
+    """Stable hex digest of a JSON-serialisable description of a computation"""
+    text = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(text.encode(), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache of JSON-serialisable results keyed by content_key()"""
+
+    def __init__(self, directory: str, memory_entries: int = 256, disk_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self._memory: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_usage = None  # Bytes on disk, measured on first write
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_errors = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + SUFFIX)
+
+    def _remember(self, key: str, value: Any):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached result for `key`, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rb') as f:
+                value = json.loads(f.read())
+            os.utime(path)  # Recency for disk eviction
+        except (OSError, ValueError, EOFError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store `value` in both tiers; only in memory when the disk tier can't be written"""
+        data = gzip.compress(json.dumps(value).encode(), compresslevel=1)
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_bytes <= 0 or len(data) > self.disk_bytes:
+            return
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            with self._lock:
+                self.write_errors += 1  # The entry stays available from the memory tier
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._disk_usage is None:
+                self._disk_usage = self._scan_usage()
+            else:
+                self._disk_usage += len(data)
+            over = self._disk_usage > self.disk_bytes
+        if over:
+            self._evict()
+
+    def _files(self):
+        """(last use, size, path) of every entry on disk"""
+        files = []
+        try:
+            shards = os.listdir(self.directory)
+        except OSError:
+            return files
+        for shard in shards:
+            directory = os.path.join(self.directory, shard)
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                if not name.endswith(SUFFIX):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Evicted by another worker
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _scan_usage(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def _evict(self):
+        """Delete least recently used files until the disk tier is within 90% of its bound"""
+        files = sorted(self._files())
+        usage = sum(size for _, size, _ in files)
+        target = self.disk_bytes * 0.9
+        evicted = 0
+        for _, size, path in files:
+            if usage <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            usage -= size
+            evicted += 1
+        with self._lock:
+            self._disk_usage = usage
+            self.evictions += evicted
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        for _, _, path in self._files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_usage = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'write_errors': self.write_errors,
+                'disk_bytes': self._disk_usage,
+                'disk_limit_bytes': self.disk_bytes,
+            }
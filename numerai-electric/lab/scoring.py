@@ -0,0 +1,229 @@
+"""
+Numerai-style scoring
+Per-era rank correlation and meta-model contribution (MMC) for whole
+prediction sets. Rows are grouped by era in contiguous slices, so ranking
+is one stable sort by prediction followed by a stable sort by era code,
+and every per-era statistic is a segment sum (np.add.reduceat) instead of
+a loop over eras. Era boundaries are computed once per dataset and cached,
+as are the meta-model ranks when several models are scored together.
+"""
+
+import csv
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Std of a uniform rank vector, the scale of the legacy MMC formula
+UNIFORM_STD = 0.29
+
+
+class EraIndex:
+    """Boundaries of contiguous, non-empty era slices over a set of rows"""
+
+    __slots__ = ('eras', 'starts', 'sizes', 'codes', '_offsets')
+
+    def __init__(self, eras: Sequence[str], starts: np.ndarray):
+        starts = np.asarray(starts, dtype=np.int64)
+        sizes = np.diff(starts)
+        keep = sizes > 0  # reduceat needs every slice non-empty
+        self.eras = [era for era, k in zip(eras, keep.tolist()) if k]
+        self.starts = np.concatenate((starts[:-1][keep], starts[-1:]))
+        self.sizes = sizes[keep]
+        self.codes = np.repeat(np.arange(len(self.sizes)), self.sizes)
+        self._offsets = np.repeat(self.starts[:-1], self.sizes)
+
+    def __len__(self):
+        return int(self.starts[-1] - self.starts[0]) if len(self.sizes) else 0
+
+    @classmethod
+    def from_labels(cls, labels: Sequence[str]) -> 'EraIndex':
+        """Index of per-row era labels, which must already be grouped by era"""
+        labels = np.asarray(labels)
+        if len(labels) == 0:
+            return cls([], np.zeros(1, dtype=np.int64))
+        change = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+        starts = np.concatenate(([0], change, [len(labels)]))
+        eras = labels[starts[:-1]].tolist()
+        if len(set(eras)) != len(eras):
+            raise ValueError("Rows are not grouped by era")
+        return cls(eras, starts)
+
+    def segment_sum(self, values: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(values, self.starts[:-1] - self.starts[0])
+
+    def broadcast(self, per_era: np.ndarray) -> np.ndarray:
+        """Per-era values repeated onto their rows"""
+        return per_era[self.codes]
+
+    def rank(self, values: np.ndarray) -> np.ndarray:
+        """1-based rank within each era; ties keep row order (pandas method='first')"""
+        if len(self.sizes) <= np.iinfo(np.uint16).max + 1:
+            # Stable sort by value, then a stable radix pass on the era codes
+            order = np.argsort(values, kind='stable')
+            order = order[np.argsort(self.codes[order].astype(np.uint16), kind='stable')]
+        else:
+            order = np.lexsort((values, self.codes))
+        ranks = np.empty(len(values), dtype=np.float64)
+        ranks[order] = np.arange(len(values)) - (self._offsets - self.starts[0]) + 1
+        return ranks
+
+
+CACHE_ENTRIES = 8  # Dataset/era-range combinations kept; each holds a row index per target row
+_cache: 'OrderedDict[Tuple, Tuple[np.ndarray, EraIndex]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def target_rows(matrix, era_range=None) -> Tuple[np.ndarray, EraIndex]:
+    """Rows of a FeatureMatrix (within `era_range`) that have targets, and their era index.
+
+    Cached per dataset, source file version and row range, so a dataset
+    reconverted into the same directory is not served stale targets; the
+    CACHE_ENTRIES most recently used are kept.
+    """
+    selected = matrix.row_range(era_range)
+    source = matrix.source
+    key = (matrix.directory, source.get('size'), source.get('mtime'), len(matrix), selected.start, selected.stop)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+    if matrix.targets is None:
+        rows = np.empty(0, dtype=np.int64)
+    else:
+        rows = np.flatnonzero(np.isfinite(np.asarray(matrix.targets[selected]))) + selected.start
+    # Era slices of the full matrix map onto the selected rows by binary search
+    starts = np.searchsorted(rows, matrix.era_starts)
+    result = (rows, EraIndex(matrix.eras, starts))
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return result
+
+
+def predict_rows(ensemble, matrix, rows: np.ndarray, features: Sequence[str] = None,
+                 chunk_rows: int = 5000) -> np.ndarray:
+    """`ensemble` predictions for the given rows of `matrix`, one chunk of features at a time"""
+    values = np.empty(len(rows), dtype=np.float64)
+    for start in range(0, len(rows), chunk_rows):
+        selected = rows[start:start + chunk_rows]
+        values[start:start + len(selected)] = ensemble.predict(matrix.take(selected, features))
+    return values
+
+
+def read_predictions(path: str) -> Dict[str, float]:
+    """id -> prediction from an id,prediction CSV with a header row"""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return {row[0]: float(row[1]) for row in reader if len(row) >= 2}
+
+
+def align(predictions: Dict[str, float], ids: Sequence[str]) -> Tuple[Optional[np.ndarray], int]:
+    """Predictions in `ids` order and how many ids they cover; None unless all are covered"""
+    values = np.fromiter((predictions.get(i, np.nan) for i in ids), dtype=np.float64, count=len(ids))
+    covered = int(np.isfinite(values).sum())
+    return (values if covered == len(ids) else None), covered
+
+
+def _pearson(x: np.ndarray, y: np.ndarray, index: EraIndex) -> np.ndarray:
+    sizes = index.sizes
+    xc = x - index.broadcast(index.segment_sum(x) / sizes)
+    yc = y - index.broadcast(index.segment_sum(y) / sizes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = index.segment_sum(xc * yc) / np.sqrt(index.segment_sum(xc * xc) * index.segment_sum(yc * yc))
+    return np.nan_to_num(corr)  # Constant targets within an era score 0
+
+
+def _correlation(ranks: np.ndarray, targets: np.ndarray, index: EraIndex) -> np.ndarray:
+    return _pearson(ranks / index.broadcast(index.sizes), targets, index)
+
+
+def _mmc(ranks: np.ndarray, meta_ranks: np.ndarray, targets: np.ndarray, index: EraIndex) -> np.ndarray:
+    sizes = index.sizes
+    per_row_sizes = index.broadcast(sizes)
+    p = (ranks - 0.5) / per_row_sizes
+    m = (meta_ranks - 0.5) / per_row_sizes
+    pc = p - index.broadcast(index.segment_sum(p) / sizes)
+    mc = m - index.broadcast(index.segment_sum(m) / sizes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.nan_to_num(index.segment_sum(pc * mc) / index.segment_sum(mc * mc))
+    residual = pc - index.broadcast(beta) * mc
+    yc = targets - index.broadcast(index.segment_sum(targets) / sizes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = index.segment_sum(residual * yc) / (sizes - 1)
+    return np.nan_to_num(covariance) / UNIFORM_STD ** 2
+
+
+def era_correlation(predictions: np.ndarray, targets: np.ndarray, index: EraIndex) -> np.ndarray:
+    """Per-era Pearson correlation of targets with percentile-ranked predictions"""
+    return _correlation(index.rank(predictions), np.asarray(targets, dtype=np.float64), index)
+
+
+def era_mmc(predictions: np.ndarray, meta: np.ndarray, targets: np.ndarray, index: EraIndex) -> np.ndarray:
+    """Per-era meta-model contribution: uniform-ranked predictions neutralized against the
+    uniform-ranked meta model (with intercept), covaried with the target, over 0.29^2"""
+    return _mmc(index.rank(predictions), index.rank(meta), np.asarray(targets, dtype=np.float64), index)
+
+
+def summarize(per_era: np.ndarray) -> Dict[str, Any]:
+    """Mean, std, Sharpe and worst era of a per-era score series"""
+    n = len(per_era)
+    std = float(per_era.std(ddof=1)) if n > 1 else 0.0
+    mean = float(per_era.mean()) if n else 0.0
+    return {
+        'mean': round(mean, 6),
+        'std': round(std, 6),
+        'sharpe': round(mean / std, 4) if std > 0 else 0.0,
+        'worst_era': round(float(per_era.min()), 6) if n else 0.0,
+        'positive_eras': int((per_era > 0).sum())
+    }
+
+
+def _check(predictions: np.ndarray, index: EraIndex, name: str = 'Predictions') -> np.ndarray:
+    predictions = np.asarray(predictions, dtype=np.float64)
+    if len(index) == 0:
+        raise ValueError("No rows with targets to score against")
+    if len(predictions) != len(index):
+        raise ValueError(f"{name}: expected {len(index)} values, got {len(predictions)}")
+    if not np.all(np.isfinite(predictions)):
+        raise ValueError(f"{name} contain NaN or infinite values")
+    return predictions
+
+
+def _score_ranked(ranks: np.ndarray, targets: np.ndarray, index: EraIndex, meta_ranks: np.ndarray = None,
+                  per_era: bool = False) -> Dict[str, Any]:
+    corr = _correlation(ranks, targets, index)
+    result = {'eras': len(index.sizes), 'rows': len(index), 'correlation': summarize(corr)}
+    if meta_ranks is not None:
+        mmc = _mmc(ranks, meta_ranks, targets, index)
+        result['mmc'] = summarize(mmc)
+    if per_era:
+        result['per_era'] = {era: {'correlation': round(c, 6)} for era, c in zip(index.eras, corr.tolist())}
+        if meta_ranks is not None:
+            for era, value in zip(index.eras, mmc.tolist()):
+                result['per_era'][era]['mmc'] = round(value, 6)
+    return result
+
+
+def score(predictions: np.ndarray, targets: np.ndarray, index: EraIndex, meta: np.ndarray = None,
+          per_era: bool = False) -> Dict[str, Any]:
+    """Correlation (and MMC when meta-model predictions are given) for one prediction set"""
+    predictions = _check(predictions, index)
+    targets = _check(targets, index, 'Targets')
+    meta_ranks = index.rank(_check(meta, index, 'Meta-model predictions')) if meta is not None else None
+    return _score_ranked(index.rank(predictions), targets, index, meta_ranks, per_era)
+
+
+def score_many(candidates: Dict[str, np.ndarray], targets: np.ndarray, index: EraIndex,
+               meta: np.ndarray = None) -> Dict[str, Dict[str, Any]]:
+    """score() for every named prediction set, best mean correlation first"""
+    targets = _check(targets, index, 'Targets')
+    meta_ranks = index.rank(_check(meta, index, 'Meta-model predictions')) if meta is not None else None
+    scored = {name: _score_ranked(index.rank(_check(predictions, index, name)), targets, index, meta_ranks)
+              for name, predictions in candidates.items()}
+    return dict(sorted(scored.items(), key=lambda item: item[1]['correlation']['mean'], reverse=True))
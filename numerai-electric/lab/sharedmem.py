@@ -0,0 +1,76 @@
+"""
+Shared-memory market data
+Packs per-symbol bar columns into one shared-memory segment so worker
+processes can attach read-only views instead of receiving pickled copies.
+"""
+
+from multiprocessing import shared_memory
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from lab.backtest import Bars
+
+FIELDS = Bars.__slots__[1:]
+ITEM_SIZE = 8  # datetime64[ns] and float64 columns are both 8 bytes wide
+
+
+class SharedMarketData:
+    """Owner of a shared-memory segment holding bars for many symbols.
+
+    `descriptor` is a small picklable tuple that workers pass to `attach`.
+    The owner must call `close()` when every worker is done; it also unlinks
+    the segment.
+    """
+
+    def __init__(self, market_data: Sequence[Bars]):
+        layout = []
+        offset = 0
+        for bars in market_data:
+            layout.append((bars.symbol, offset, len(bars)))
+            offset += len(bars) * ITEM_SIZE * len(FIELDS)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.layout: List[Tuple[str, int, int]] = layout
+        for bars, view in zip(market_data, _views(self.shm, layout, writeable=True)):
+            for field in FIELDS:
+                getattr(view, field)[:] = getattr(bars, field)
+
+    @property
+    def descriptor(self):
+        return self.shm.name, self.layout
+
+    def close(self):
+        """Release and unlink the segment"""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _views(shm, layout, writeable=False) -> List[Bars]:
+    market_data = []
+    for symbol, offset, length in layout:
+        columns = []
+        for k, field in enumerate(FIELDS):
+            dtype = 'datetime64[ns]' if field == 'timestamp' else np.float64
+            column = np.ndarray((length,), dtype=dtype, buffer=shm.buf,
+                                offset=offset + k * length * ITEM_SIZE)
+            column.flags.writeable = writeable
+            columns.append(column)
+        market_data.append(Bars(symbol, *columns))
+    return market_data
+
+
+def attach(descriptor):
+    """Attach to a segment created by SharedMarketData; returns (handle, bars).
+
+    Keep the handle referenced for as long as the views are in use.
+    """
+    name, layout = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, _views(shm, layout)
@@ -0,0 +1,137 @@
+"""
+Cross-process shared state
+Counters, the log ring buffer and the latest JSON snapshots (signals,
+predictions) kept in anonymous shared memory created before forking, so every
+pre-forked worker reads and writes the same state.
+"""
+
+import datetime
+import json
+import mmap
+import multiprocessing
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+LEVELS = ['debug', 'info', 'warning', 'error', 'critical']
+
+LOG_FIELDS = [('seq', '<i8'), ('timestamp', '<f8'), ('level', 'u1'), ('message', 'S{}')]
+
+
+class SharedLogBuffer:
+    """LogBuffer-compatible ring of fixed-width records in shared memory.
+
+    Messages longer than `message_bytes` (UTF-8) are truncated.
+    """
+
+    def __init__(self, capacity: int = 1000, message_bytes: int = 256, lock=None):
+        self.capacity = capacity
+        self.dtype = np.dtype([(name, fmt.format(message_bytes)) for name, fmt in LOG_FIELDS])
+        self._lock = lock or multiprocessing.Lock()
+        self._mem = mmap.mmap(-1, 8 + capacity * self.dtype.itemsize)
+        self._next_seq = np.frombuffer(self._mem, dtype='<i8', count=1)
+        self._next_seq[0] = 1
+        self._records = np.frombuffer(self._mem, dtype=self.dtype, count=capacity, offset=8)
+        self._message_bytes = message_bytes
+
+    def __len__(self):
+        return min(self.last_seq, self.capacity)
+
+    @property
+    def last_seq(self) -> int:
+        return int(self._next_seq[0]) - 1
+
+    @staticmethod
+    def _to_dict(row) -> Dict[str, Any]:
+        return {
+            'seq': int(row['seq']),
+            'timestamp': datetime.datetime.fromtimestamp(float(row['timestamp'])).isoformat(),
+            'level': LEVELS[int(row['level'])],
+            'message': bytes(row['message']).decode('utf-8', errors='ignore')
+        }
+
+    def append(self, message: str, level: str = 'info') -> Dict[str, Any]:
+        encoded = message.encode('utf-8')[:self._message_bytes]
+        now = datetime.datetime.now()
+        with self._lock:
+            seq = int(self._next_seq[0])
+            self._records[seq % self.capacity] = (seq, now.timestamp(),
+                                                   LEVELS.index(level) if level in LEVELS else 1, encoded)
+            self._next_seq[0] = seq + 1
+        return {'seq': seq, 'timestamp': now.isoformat(), 'level': level,
+                'message': encoded.decode('utf-8', errors='ignore')}
+
+    def since(self, seq: int = 0, limit: int = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            next_seq = int(self._next_seq[0])
+            start = max(seq + 1, next_seq - self.capacity, 1)
+            stop = next_seq if limit is None else min(next_seq, start + limit)
+            rows = [self._records[i % self.capacity].copy() for i in range(start, stop)]
+        return [self._to_dict(row) for row in rows]
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        return self.since(max(self.last_seq - count, 0))
+
+
+class SharedState:
+    """Named int64 counters and versioned JSON slots in one shared mapping.
+
+    Must be created before the worker processes are forked.
+    """
+
+    def __init__(self, counters: Iterable[str], slots: Dict[str, int], log_capacity: int = 1000,
+                 log_message_bytes: int = 256):
+        self.lock = multiprocessing.Lock()
+        self._counter_index = {name: i for i, name in enumerate(counters)}
+        self._slot_layout: Dict[str, Tuple[int, int]] = {}
+
+        offset = 8 * len(self._counter_index)
+        for name, size in slots.items():
+            self._slot_layout[name] = (offset, size)
+            offset += 16 + size
+        self._mem = mmap.mmap(-1, max(offset, 8))
+        self._counters = np.frombuffer(self._mem, dtype='<i8', count=len(self._counter_index))
+        self._decoded: Dict[str, Tuple[int, Any]] = {}  # Per-process cache of the last decoded slot
+
+        self.log = SharedLogBuffer(log_capacity, log_message_bytes, lock=self.lock)
+
+    def increment(self, name: str, amount: int = 1) -> int:
+        i = self._counter_index[name]
+        with self.lock:
+            self._counters[i] += amount
+            return int(self._counters[i])
+
+    def value(self, name: str) -> int:
+        return int(self._counters[self._counter_index[name]])
+
+    def _header(self, name: str):
+        offset, size = self._slot_layout[name]
+        return np.frombuffer(self._mem, dtype='<i8', count=2, offset=offset), offset + 16, size
+
+    def publish(self, name: str, obj: Any) -> int:
+        """Store `obj` as JSON in slot `name`; returns the slot's new version"""
+        data = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        header, start, size = self._header(name)
+        if len(data) > size:
+            raise ValueError(f"Shared slot '{name}' holds {size} bytes, snapshot is {len(data)}")
+        with self.lock:
+            self._mem[start:start + len(data)] = data
+            header[1] = len(data)
+            header[0] += 1
+            return int(header[0])
+
+    def version(self, name: str) -> int:
+        return int(self._header(name)[0][0])
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Latest object published to slot `name`, decoded at most once per version"""
+        header, start, _ = self._header(name)
+        cached = self._decoded.get(name)
+        if cached is not None and cached[0] == header[0]:
+            return cached[1]
+        with self.lock:
+            version, length = int(header[0]), int(header[1])
+            data = bytes(self._mem[start:start + length])
+        obj = json.loads(data) if version else default
+        self._decoded[name] = (version, obj)
+        return obj
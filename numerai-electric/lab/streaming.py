@@ -0,0 +1,71 @@
+"""
+Server-Sent Events support
+A wake-up broker for stream clients. Events are not queued: clients read
+new log records and signal changes from shared, bounded state (LOG_BUFFER,
+the signal engine) and the broker only tells them when to look, so a slow
+client costs no memory and detects gaps from log sequence numbers.
+"""
+
+import json
+import threading
+from typing import Any
+
+
+class Subscription:
+    """One client's pending-wakeup flag"""
+
+    __slots__ = ('pending',)
+
+    def __init__(self):
+        self.pending = False
+
+
+class EventBroker:
+    """Wakes every subscribed client when shared state changes"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._condition = threading.Condition()
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription()
+        with self._condition:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._condition:
+            self._subscribers.discard(subscription)
+
+    def notify(self):
+        """Wake every client; one that is busy sees the wakeup on its next wait()"""
+        with self._condition:
+            for subscription in self._subscribers:
+                subscription.pending = True
+            self._condition.notify_all()
+
+    def wait(self, subscription: Subscription, timeout: float) -> bool:
+        """Block until notified or `timeout` passes; returns whether a wakeup arrived"""
+        with self._condition:
+            if not subscription.pending:
+                self._condition.wait(timeout)
+            woken, subscription.pending = subscription.pending, False
+        return woken
+
+
+def format_event(event: str, data: Any, event_id=None) -> str:
+    """Encode one SSE message"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def heartbeat() -> str:
+    """SSE comment line that keeps idle connections and proxies alive"""
+    return ': heartbeat\n\n'
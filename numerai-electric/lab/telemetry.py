@@ -0,0 +1,175 @@
+"""
+Request and workload metrics
+Counters, gauges and fixed-bucket histograms keyed by label tuples, cheap
+enough to update on every request, and rendered in the Prometheus text
+exposition format. Registries snapshot to plain JSON so pre-forked workers
+can publish their numbers and any one of them can render the merged total.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; covers sub-millisecond cached routes up to long synchronous runs
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Labels, Any] = {}
+        self._lock = lock
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels: Labels, value: float):
+        with self._lock:
+            self.values[labels] = value
+
+
+class Histogram(_Metric):
+    """Per-label bucket counts (non-cumulative, last slot is +Inf) plus sum"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], lock: threading.Lock,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames, lock)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: Labels, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, labels: Labels = ()):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(labels, time.perf_counter() - start)
+
+
+class Registry:
+    """Named metrics of one process"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> Any:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames, self._lock))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames, self._lock))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, self._lock, buckets))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable copy of every metric"""
+        with self._lock:
+            return {
+                name: {
+                    'kind': m.kind,
+                    'help': m.help,
+                    'labelnames': list(m.labelnames),
+                    'buckets': list(getattr(m, 'buckets', ())),
+                    'values': [[list(labels), [list(v[0]), v[1]] if m.kind == 'histogram' else v]
+                               for labels, v in m.values.items()]
+                }
+                for name, m in self.metrics.items()
+            }
+
+
+def merge(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum snapshots from several processes (counters, gauges and histogram buckets alike)"""
+    merged: Dict[str, Any] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, dict(metric, values={}))
+            for labels, value in metric['values']:
+                key = tuple(labels)
+                if metric['kind'] != 'histogram':
+                    target['values'][key] = target['values'].get(key, 0) + value
+                elif key in target['values']:
+                    counts, total = target['values'][key]
+                    target['values'][key] = [[a + b for a, b in zip(counts, value[0])], total + value[1]]
+                else:
+                    target['values'][key] = [list(value[0]), value[1]]
+    for metric in merged.values():
+        metric['values'] = [[list(k), v] for k, v in metric['values'].items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshot: Dict[str, Any]) -> str:
+    """Prometheus text exposition (format 0.0.4) of a snapshot"""
+    lines: List[str] = []
+    for name in sorted(snapshot):
+        metric = snapshot[name]
+        names = metric['labelnames']
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        for labels, value in sorted(metric['values'], key=lambda item: item[0]):
+            if metric['kind'] != 'histogram':
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(list(metric['buckets']) + ['+Inf'], counts):
+                cumulative += count
+                le = 'le="{}"'.format(bound if bound == '+Inf' else _number(float(bound)))
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(float(total))}")
+            lines.append(f"{name}_count{_labels(names, labels)} {cumulative}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,175 @@
+"""
+Walk-forward evaluation
+Cuts a date range into consecutive train/test folds. In each fold the
+parameter grid is searched on the train window (best in-sample Sharpe
+ratio) and the chosen parameters are run on the test window that follows.
+Folds run in a process pool whose workers attach to one shared-memory copy
+of the bars and slice fold windows out of it as views, so fifty folds use
+about as much memory as one backtest.
+"""
+
+import multiprocessing
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from lab import backtest, sharedmem
+from lab.optimizer import parameter_grid
+
+MODES = ('rolling', 'anchored')
+
+# Worker-process state, populated once per worker by _init_worker
+_WORKER = {}
+
+Fold = Tuple[np.datetime64, np.datetime64, np.datetime64, np.datetime64]
+
+
+def make_folds(start: np.datetime64, end: np.datetime64, folds: int, train_periods: int = 3,
+               mode: str = 'rolling') -> List[Fold]:
+    """(train_start, train_end, test_start, test_end) of `folds` half-open windows over [start, end).
+
+    The range is cut into train_periods + folds equal periods. Fold k tests
+    on period train_periods + k and trains on the train_periods periods
+    before it ('rolling') or on every period before it ('anchored').
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown walk-forward mode '{mode}'. Available: {list(MODES)}")
+    if folds < 1 or train_periods < 1:
+        raise ValueError("folds and train_periods must be positive")
+    start = np.datetime64(start, 'ns').astype(np.int64)
+    end = np.datetime64(end, 'ns').astype(np.int64)
+    periods = folds + train_periods
+    if end - start < periods:
+        raise ValueError("Date range is too short for that many folds")
+    span, steps = end - start, np.arange(periods + 1)
+    edges = (start + span // periods * steps + span % periods * steps // periods).astype('datetime64[ns]')
+    return [(edges[0] if mode == 'anchored' else edges[k], edges[k + train_periods],
+             edges[k + train_periods], edges[k + train_periods + 1]) for k in range(folds)]
+
+
+def _init_worker(descriptor):
+    shm, market_data = sharedmem.attach(descriptor)
+    _WORKER['shm'] = shm
+    _WORKER['market_data'] = market_data
+
+
+def _run_fold(index: int, fold: Fold, strategy_type: str, grid: List[Dict[str, Any]],
+              options: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    train_start, train_end, test_start, test_end = fold
+    train = [bars.window(train_start, train_end) for bars in _WORKER['market_data']]
+    test = [bars.window(test_start, test_end) for bars in _WORKER['market_data']]
+
+    best = None
+    for params in grid:
+        result = backtest.run_backtest(strategy_type, params, train, **options)
+        if best is None or result['metrics']['sharpe_ratio'] > best['metrics']['sharpe_ratio']:
+            best = result
+    out_of_sample = backtest.run_backtest(strategy_type, best['strategy_params'], test, **options)
+    return {
+        'fold': index,
+        'train': {'start': backtest.format_timestamp(train_start), 'end': backtest.format_timestamp(train_end),
+                  'bars': best['bars_processed']},
+        'test': {'start': backtest.format_timestamp(test_start), 'end': backtest.format_timestamp(test_end),
+                 'bars': out_of_sample['bars_processed']},
+        'parameters': best['strategy_params'],
+        'in_sample': best['metrics'],
+        'out_of_sample': out_of_sample['metrics'],
+        'processing_time_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    return {
+        'mean': statistics.fmean(values),
+        'std': statistics.pstdev(values),
+        'min': min(values),
+        'max': max(values),
+    }
+
+
+def aggregate(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-fold results folded into out-of-sample distributions and in/out-of-sample comparisons"""
+    if not results:
+        return {}
+    oos = [r['out_of_sample'] for r in results]
+    ins = [r['in_sample'] for r in results]
+    returns = [m['total_return'] for m in oos]
+    in_sample_return = statistics.fmean(m['total_return'] for m in ins)
+    parameters = Counter(tuple(sorted(r['parameters'].items())) for r in results)
+    return {
+        'out_of_sample': {key: _distribution([m[key] for m in oos])
+                          for key in ('total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate')},
+        'compounded_return': float(np.prod([1 + r for r in returns]) - 1),
+        'positive_folds': sum(r > 0 for r in returns),
+        'in_sample_sharpe': statistics.fmean(m['sharpe_ratio'] for m in ins),
+        # Out-of-sample over in-sample mean return; near 1 when the edge survives past the train window
+        'walk_forward_efficiency': statistics.fmean(returns) / in_sample_return if in_sample_return else None,
+        'parameter_choices': [{'parameters': dict(params), 'folds': count}
+                              for params, count in parameters.most_common()],
+    }
+
+
+def walk_forward(strategy_type: str, market_data: Sequence[backtest.Bars], folds: int,
+                 parameter_ranges: Dict[str, Sequence[Any]] = None, params: Dict[str, Any] = None,
+                 train_periods: int = 3, mode: str = 'rolling', start=None, end=None, workers: int = None,
+                 **options) -> Iterator[Dict[str, Any]]:
+    """Walk-forward evaluation, returning an iterator of per-fold records and a final summary.
+
+    With `parameter_ranges` each fold picks its parameters on the train
+    window; otherwise the fixed `params` are run on both windows. The date
+    range defaults to the span of `market_data`. Everything is validated
+    before any worker starts; closing the iterator early cancels outstanding
+    folds.
+    """
+    started = time.perf_counter()
+    grid = parameter_grid(parameter_ranges) if parameter_ranges else [params or {}]
+    for combination in grid:
+        backtest.resolve_strategy(strategy_type, combination)  # Fail fast on bad parameters
+    spans = [bars for bars in market_data if len(bars)]
+    if not spans:
+        raise ValueError("No market data in the requested range")
+    start = start if start is not None else min(bars.timestamp[0] for bars in spans)
+    end = end if end is not None else max(bars.timestamp[-1] for bars in spans) + np.timedelta64(1, 'ns')
+    fold_bounds = make_folds(start, end, folds, train_periods, mode)
+    workers = max(1, min(workers or os.cpu_count() or 1, folds))
+    return _stream(strategy_type, market_data, fold_bounds, grid, workers, options, started, mode)
+
+
+def _stream(strategy_type, market_data, fold_bounds, grid, workers, options, started, mode):
+    total = len(fold_bounds)
+    results = []
+    with sharedmem.SharedMarketData(market_data) as shared:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(shared.descriptor,)
+        )
+        try:
+            futures = [executor.submit(_run_fold, index, fold, strategy_type, grid, options)
+                       for index, fold in enumerate(fold_bounds)]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                yield dict(result, type='fold', completed=len(results), total=total)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    yield {
+        'type': 'summary',
+        'status': 'success',
+        'strategy': strategy_type,
+        'mode': mode,
+        'folds': total,
+        'combinations_per_fold': len(grid),
+        'completed': len(results),
+        'workers': workers,
+        'aggregate': aggregate(sorted(results, key=lambda r: r['fold'])),
+        'processing_time_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
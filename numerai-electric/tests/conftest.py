@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+
+def write_numerai_csv(path, rows=600, features=6, eras=12, seed=0, targets=True, shuffle=True):
+    """A small Numerai-style CSV: integer bin features, eras in random row order"""
+    rng = np.random.default_rng(seed)
+    era = rng.integers(1, eras + 1, rows) if shuffle else np.sort(rng.integers(1, eras + 1, rows))
+    values = rng.integers(0, 5, (rows, features))
+    target = rng.choice([0.0, 0.25, 0.5, 0.75, 1.0], rows)
+    header = ['id', 'era', 'data_type'] + [f'feature_{j}' for j in range(features)]
+    if targets:
+        header.append('target')
+    with open(path, 'w') as f:
+        f.write(','.join(header) + '\n')
+        for i in range(rows):
+            fields = [f'n{i:06d}', f'era{era[i]}', 'train'] + [str(v) for v in values[i]]
+            if targets:
+                fields.append('' if i % 17 == 0 else str(target[i]))  # Some live rows
+            f.write(','.join(fields) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def numerai_csv(tmp_path):
+    return write_numerai_csv(tmp_path / 'train.csv')
+
+
+def write_bars_csv(path, n=300, seed=0, start=1000.0):
+    """Minute bars of a random walk in the CSVDataProvider layout"""
+    rng = np.random.default_rng(seed)
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    stamps = np.datetime_as_string(np.datetime64('2024-01-01T00:00') + np.arange(n) * np.timedelta64(60, 's'),
+                                   unit='s')
+    with open(path, 'w') as f:
+        f.write('timestamp,open,high,low,close,volume\n')
+        for stamp, price in zip(stamps.tolist(), close.tolist()):
+            f.write(f'{stamp}Z,{price},{price * 1.001},{price * 0.999},{price},100\n')
+    return str(path)
+
+
+@pytest.fixture
+def electric(tmp_path, monkeypatch):
+    """app.py with its data, store, cache and job paths in a temporary directory"""
+    import logging
+
+    import app
+    from lab import jobs
+
+    market = tmp_path / 'market'
+    market.mkdir()
+    for seed, symbol in enumerate(('AAPL', 'GOOGL')):
+        write_bars_csv(market / f'{symbol}.csv', seed=seed, start=1000.0 + 500 * seed)
+    paths = {
+        'data_path': str(market),
+        'store_path': str(market / 'columnar'),
+        'result_cache_path': str(market / 'results'),
+        'jobs_path': str(tmp_path / 'jobs'),
+        'profiles_path': str(tmp_path / 'profiles'),
+        'public_ip_cache': str(tmp_path / 'public_ip.json'),
+        'optimize_workers': 2,
+        'public_ip': '127.0.0.1',
+    }
+    for key, value in paths.items():
+        monkeypatch.setitem(app.CONFIG, key, value)
+    monkeypatch.setattr(app, 'JOB_SCHEDULER', jobs.JobScheduler(1, 4, paths['jobs_path']))
+    logging.disable(logging.INFO)
+    yield app
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def client(electric):
+    return electric.app.test_client()
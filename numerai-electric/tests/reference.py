@@ -0,0 +1,88 @@
+"""
+Bar-by-bar port of the Clojure backtester (src/backtesting/core.clj)
+Each strategy's generate-signal, calculate-rsi, execute-trade and the
+run-backtest reduce, transcribed one bar at a time with no vectorization.
+The vectorized engine in lab.backtest must reproduce it trade for trade.
+Where Clojure would throw (RSI over fewer than two bars, or 0/0), the port
+uses the engine's conventions: hold, and an RSI of 50.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from lab.backtest import Bars, resolve_strategy
+
+
+def calculate_rsi(prices: Sequence[float]) -> float:
+    changes = [p2 - p1 for p1, p2 in zip(prices[:-1], prices[1:])]
+    gains = sum(c for c in changes if c > 0) / len(changes)
+    losses = sum(-c for c in changes if c < 0) / len(changes)
+    if losses == 0:
+        return 100.0 if gains > 0 else 50.0
+    return 100 - 100 / (1 + gains / losses)
+
+
+def generate_signal(strategy: str, params: Dict[str, Any], history: List[float]) -> str:
+    """:buy, :sell or :hold for the newest bar of one symbol's close history"""
+    current = history[-1]
+    if strategy == 'sma':
+        recent = history[::-1][:params['long_window']]
+        short_ma = sum(recent[:params['short_window']]) / params['short_window']
+        long_ma = sum(recent) / params['long_window']
+        return 'buy' if short_ma > long_ma else 'sell' if short_ma < long_ma else 'hold'
+    if strategy == 'mean_reversion':
+        recent = history[::-1][:params['lookback_period']]
+        mean_price = sum(recent) / len(recent)
+        deviation = (current - mean_price) / mean_price
+        threshold = params['threshold']
+        return 'buy' if deviation < -threshold else 'sell' if deviation > threshold else 'hold'
+    if strategy == 'momentum':
+        recent = history[::-1][:params['momentum_period']]
+        rsi_bars = recent[:params['rsi_period']]
+        if len(rsi_bars) < 2:
+            return 'hold'
+        momentum = sum((p2 - p1) / p1 for p1, p2 in zip(recent[:-1], recent[1:]))
+        rsi = calculate_rsi(rsi_bars)
+        if momentum > 0.02 and rsi < params['oversold']:
+            return 'buy'
+        if momentum < -0.02 and rsi > params['overbought']:
+            return 'sell'
+        return 'hold'
+    raise ValueError(strategy)
+
+
+def run_backtest(strategy: str, params: Dict[str, Any], market_data: Sequence[Bars], initial_cash: float = 100000,
+                 max_position_size: float = 0.1, commission: float = 0.001) -> Dict[str, Any]:
+    """Trades and final value of the Clojure run-backtest over `market_data`"""
+    key, _, resolved = resolve_strategy(strategy, params)
+    bars = sorted(((int(ts), i, j) for i, b in enumerate(market_data)
+                   for j, ts in enumerate(b.timestamp.astype('datetime64[ns]').view('int64').tolist())),
+                  key=lambda bar: bar[0])  # Stable: ties stay in symbol order
+    cash = float(initial_cash)
+    positions: Dict[str, Dict[str, Any]] = {}
+    trades = []
+    history: Dict[str, List[float]] = {}
+    last_price: Dict[str, float] = {}
+    for ts, i, j in bars:
+        symbol = market_data[i].symbol
+        price = float(market_data[i].close[j])
+        history.setdefault(symbol, []).append(price)
+        last_price[symbol] = price
+        signal = generate_signal(key, resolved, history[symbol])
+
+        quantity = int(cash * max_position_size / price)
+        cost = price * quantity * commission
+        if signal == 'buy' and cash > price * quantity + cost and symbol not in positions:
+            cash -= price * quantity + cost
+            positions[symbol] = {'quantity': quantity, 'entry_price': price}
+            trades.append({'type': 'buy', 'symbol': symbol, 'quantity': quantity, 'price': price, 'time': ts,
+                           'commission': cost})
+        elif signal == 'sell' and symbol in positions:
+            position = positions.pop(symbol)
+            proceeds = price * position['quantity']
+            cost = proceeds * commission
+            cash += proceeds - cost
+            trades.append({'type': 'sell', 'symbol': symbol, 'quantity': position['quantity'], 'price': price,
+                           'time': ts, 'commission': cost,
+                           'pnl': proceeds - cost - position['entry_price'] * position['quantity']})
+    final_value = cash + sum(p['quantity'] * last_price[s] for s, p in positions.items())
+    return {'trades': trades, 'final_value': final_value, 'cash': cash}
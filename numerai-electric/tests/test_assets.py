@@ -0,0 +1,41 @@
+import gzip
+
+from lab import assets
+
+
+def _page():
+    return assets.FragmentPage('<html><body>' + 'static text ' * 200 + assets.FragmentPage.marker('status')
+                               + '<p>' + 'more static ' * 200 + assets.FragmentPage.marker('uptime') + '</p>'
+                               + '</body></html>')
+
+
+def test_render_gzip_decompresses_to_render():
+    page = _page()
+    for values in ({'status': 'online', 'uptime': 1}, {'status': '<b>ü</b>' * 50, 'uptime': ''}):
+        body = page.render_gzip(values)
+        assert body[:2] == b'\x1f\x8b'
+        assert gzip.decompress(body) == page.render(values)
+    # Static segments are compressed once and reused
+    deflated = page._deflated
+    page.render_gzip({'status': 'x', 'uptime': 2})
+    assert page._deflated is deflated
+
+
+def test_render_substitutes_fragments():
+    page = assets.FragmentPage('a' + assets.FragmentPage.marker('x') + 'b')
+    assert page.render({'x': 42}) == b'a42b'
+    assert gzip.decompress(page.render_gzip({'x': 42})) == b'a42b'
+
+
+def test_static_asset_negotiation():
+    asset = assets.StaticAsset('console.log(1);' * 100, 'application/javascript')
+    encoding, body = asset.negotiate({'gzip'})
+    assert encoding == 'gzip' and gzip.decompress(body) == asset.encodings['identity']
+    assert asset.negotiate(set())[0] == 'identity'
+
+
+def test_dashboard_is_served_gzipped(client):
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'</html>' in gzip.decompress(response.data)
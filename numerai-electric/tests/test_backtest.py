@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from lab import backtest
+from tests import reference
+
+PARAMS = {
+    'sma': {'short_window': 5, 'long_window': 12},
+    'mean_reversion': {'lookback_period': 8, 'threshold': 0.01},
+    'momentum': {'momentum_period': 6, 'rsi_period': 4, 'overbought': 60, 'oversold': 40},
+}
+
+
+def walk(symbol, n, seed, start=1000.0, step=3):
+    """Random-walk closes; timestamps every `step` minutes so symbols interleave and collide"""
+    rng = np.random.default_rng(seed)
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    ts = np.datetime64('2024-01-01T00:00', 'ns') + np.arange(n) * np.timedelta64(step * 60, 's')
+    return backtest.Bars(symbol, ts, close, close, close, close, np.ones(n))
+
+
+MARKET = [walk('AAA', 700, 1, 900.0, 2), walk('BBB', 500, 2, 1500.0, 3), walk('CCC', 400, 3, 1200.0, 5)]
+
+
+@pytest.mark.parametrize('max_position_size', [0.1, 0.5, 0.999, 1.0, 1.5])
+@pytest.mark.parametrize('strategy', sorted(PARAMS))
+def test_matches_bar_by_bar_reference(strategy, max_position_size):
+    expected = reference.run_backtest(strategy, PARAMS[strategy], MARKET, 100000, max_position_size, 0.001)
+    result = backtest.run_backtest(strategy, PARAMS[strategy], MARKET, 100000, max_position_size, 0.001,
+                                   chunk_rows=64)
+    trades = result['trades']
+    assert len(expected['trades']) > 0 or max_position_size > 1  # Oversized positions are never affordable
+    assert [(t['type'], t['symbol'], t['quantity']) for t in trades] == \
+        [(t['type'], t['symbol'], t['quantity']) for t in expected['trades']]
+    assert [t['price'] for t in trades] == pytest.approx([t['price'] for t in expected['trades']])
+    assert [t.get('pnl') for t in trades if t['type'] == 'sell'] == \
+        pytest.approx([t['pnl'] for t in expected['trades'] if t['type'] == 'sell'])
+    assert result['final_portfolio']['cash'] == pytest.approx(expected['cash'])
+    assert result['metrics']['final_value'] == pytest.approx(expected['final_value'])
+
+
+def test_chunk_size_does_not_change_the_result():
+    whole = backtest.run_backtest('mean_reversion', PARAMS['mean_reversion'], MARKET)
+    chunked = backtest.run_backtest('mean_reversion', PARAMS['mean_reversion'], MARKET, chunk_rows=7)
+    assert chunked['trades'] == whole['trades']
+    assert chunked['signal_counts'] == whole['signal_counts']
+    assert chunked['bars_processed'] == sum(len(bars) for bars in MARKET)
+
+
+def test_rejects_degenerate_sma_windows():
+    with pytest.raises(ValueError):
+        backtest.resolve_strategy('sma', {'short_window': 20, 'long_window': 20})
+
+
+def test_rejects_unknown_strategy_and_bad_params():
+    with pytest.raises(ValueError):
+        backtest.resolve_strategy('martingale')
+    with pytest.raises(ValueError):
+        backtest.resolve_strategy('momentum', {'rsi_period': 0})
+
+
+def test_backtest_route(client):
+    response = client.post('/api/backtest', json={'symbols': ['AAPL', 'GOOGL'], 'strategy': 'mean_reversion',
+                                                  'params': PARAMS['mean_reversion']})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'success'
+    assert body['bars_processed'] == 600
+    assert client.post('/api/backtest', json={'symbols': ['AAPL'], 'params': {'short_window': 30}}).status_code == 400
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from lab import backtest, barstore
+from tests.conftest import write_bars_csv
+
+
+def test_read_matches_between(tmp_path):
+    path = write_bars_csv(tmp_path / 'AAPL.csv', n=500)
+    bars = backtest.load_csv_bars(path, 'AAPL')
+    store = barstore.BarStore(str(tmp_path / 'store'))
+    store.ingest_csv(path, 'AAPL')
+    assert store.symbols() == ['AAPL']
+    start, end = bars.timestamp[100], bars.timestamp[250]
+    expected = bars.between(start, end)
+    got = store.read('AAPL', start, end)
+    assert len(got) == len(expected) == 149
+    for field in barstore.FIELDS:
+        np.testing.assert_array_equal(getattr(got, field), getattr(expected, field))
+    assert isinstance(got.close.base, np.memmap) or isinstance(got.close, np.memmap)
+    assert store.last_close('AAPL') == bars.close[-1]
+
+
+def test_write_sorts_and_rewrites(tmp_path):
+    store = barstore.BarStore(str(tmp_path))
+    ts = np.array(['2024-01-03', '2024-01-01', '2024-01-02'], dtype='datetime64[ns]')
+    close = np.array([3.0, 1.0, 2.0])
+    store.write(backtest.Bars('X', ts, close, close, close, close, close))
+    np.testing.assert_array_equal(store.bars('X').close, [1.0, 2.0, 3.0])
+    store.write(backtest.Bars('X', ts[:1], close[:1], close[:1], close[:1], close[:1], close[:1]))
+    assert len(store.read('X')) == 1
+
+
+@pytest.mark.parametrize('symbol', ['..', '.', '../etc', 'a/b', 'a\\b', '', 'AAPL\n', None])
+def test_rejects_path_like_symbols(tmp_path, symbol):
+    assert not barstore.valid_symbol(symbol)
+    with pytest.raises(ValueError):
+        barstore.BarStore(str(tmp_path)).has(symbol)
+
+
+def test_route_rejects_traversal(client):
+    response = client.post('/api/backtest', json={'symbols': ['../market/AAPL']})
+    assert response.status_code == 400
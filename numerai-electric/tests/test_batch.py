@@ -0,0 +1,34 @@
+from lab import indicators
+
+
+def test_batch_runs_gets_concurrently_and_keeps_writes_ordered(electric, client, monkeypatch):
+    monkeypatch.setattr(electric, 'SIGNAL_ENGINE', indicators.SignalEngine())
+    ticks = [{'symbol': 'ZZZ', 'price': 100 + i % 7, 'timestamp': f'T{i}'} for i in range(80)]
+    response = client.post('/api/batch', json={'requests': [
+        '/api/test',
+        {'id': 'before', 'path': '/api/signals?symbols=ZZZ'},
+        {'id': 'write', 'method': 'post', 'path': '/api/ticks', 'body': {'ticks': ticks}},
+        {'id': 'after', 'path': '/api/signals?symbols=ZZZ'},
+        {'id': 'missing', 'path': '/api/nope'},
+        {'id': 'excluded', 'method': 'POST', 'path': '/api/optimize', 'body': {}},
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'partial' and body['count'] == 6 and body['failed'] == 2
+    entries = {entry['id']: entry for entry in body['responses']}
+    assert [entry['id'] for entry in body['responses']] == [0, 'before', 'write', 'after', 'missing', 'excluded']
+    assert entries[0]['body']['status'] == 'success'
+    assert entries['before']['body']['signals'] == []
+    assert entries['write']['body']['applied'] == 80
+    assert [s['symbol'] for s in entries['after']['body']['signals']] == ['ZZZ']
+    assert entries['missing']['status'] == 404 and entries['excluded']['status'] == 400
+
+    exposition = client.get('/metrics').get_data(as_text=True)
+    assert 'batch_subrequests_total{method="POST",route="/api/ticks",status="200"}' in exposition
+
+
+def test_batch_rejects_malformed_requests(client):
+    assert client.post('/api/batch', json={'requests': []}).status_code == 400
+    assert client.post('/api/batch', json={'requests': ['api/test']}).status_code == 400
+    response = client.post('/api/batch', json={'requests': [{'method': 'TRACE', 'path': '/api/test'}]})
+    assert response.status_code == 400 and 'TRACE' in response.get_json()['error']
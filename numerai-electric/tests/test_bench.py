@@ -0,0 +1,40 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def suite():
+    spec = importlib.util.spec_from_file_location('bench_suite', os.path.join(ROOT, 'bench', 'suite.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_microbenchmarks_match_the_baseline_names(suite):
+    with open(suite.DEFAULT_BASELINE) as f:
+        baseline = json.load(f)
+    assert {'backtest.sma_signals', 'backtest.rolling_rsi'} <= set(suite.MICRO)
+    assert {key.split('@')[0] for key in baseline['micro']} == set(suite.MICRO)
+    result = suite.bench_micro([500], 1, ['backtest.sma_signals', 'backtest.rolling_rsi'])
+    assert set(result) == {'backtest.sma_signals@500', 'backtest.rolling_rsi@500'}
+
+
+def test_combine_and_compare(suite):
+    def run(p50, median):
+        return {'meta': {}, 'routes': {'index@c8': {'p50_ms': p50, 'p95_ms': 100 * p50}},
+                'micro': {'backtest.sma_signals@500': {'median_ms': median}}}
+
+    rounds = [run(10.0, 30.0), run(12.0, 20.0), run(11.0, 25.0)]
+    slowest, fastest = suite.combine(rounds, max), suite.combine(rounds, min)
+    assert slowest['routes']['index@c8']['p50_ms'] == 12.0 and slowest['micro']['backtest.sma_signals@500'] == \
+        {'median_ms': 30.0}
+    assert fastest['routes']['index@c8']['p50_ms'] == 10.0 and fastest['meta']['rounds'] == 3
+
+    assert suite.compare(run(14.0, 40.0), slowest, 0.5, 5.0) == []  # Within tolerance, or under min_ms
+    regressions = suite.compare(run(30.0, 80.0), slowest, 0.5, 5.0)
+    assert len(regressions) == 2 and regressions[0].startswith('routes index@c8: p50_ms 12.0 -> 30.0')
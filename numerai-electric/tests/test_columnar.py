@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+
+from lab import columnar
+
+SCHEMA = {'side': 'category', 'qty': 'int64', 'price': 'float32', 'at': 'time', 'note': 'string'}
+
+
+def _records(n):
+    return [{'side': 'buy' if i % 3 else 'sell', 'qty': i, 'price': None if i % 5 == 0 else i / 4,
+             'at': f'2024-01-01T00:{i % 60:02d}:00Z', 'note': f'n{i}'} for i in range(n)]
+
+
+def test_stream_round_trip():
+    records = _records(25)
+    data = b''.join(columnar.stream({'count': 25}, columnar.record_batches(records, list(SCHEMA), rows=7), SCHEMA))
+    meta, columns = columnar.read(data)
+    assert meta == {'count': 25}
+    assert columns['side'] == [r['side'] for r in records]
+    np.testing.assert_array_equal(columns['qty'], np.arange(25))
+    np.testing.assert_array_equal(columns['price'],
+                                  np.array([np.nan if r['price'] is None else r['price'] for r in records], 'f4'))
+    np.testing.assert_array_equal(columns['at'].astype('datetime64[ns]'),
+                                  np.array([r['at'][:-1] for r in records], 'datetime64[ns]'))
+    assert columns['note'] == [r['note'] for r in records]
+
+
+def test_empty_stream_keeps_meta():
+    meta, columns = columnar.read(b''.join(columnar.stream({'count': 0}, iter(()), SCHEMA)))
+    assert meta == {'count': 0}
+    assert len(columns['qty']) == 0
+
+
+def test_bodies_are_eight_byte_aligned():
+    data = columnar.batch({'qty': [1, 2, 3], 'price': [1.0, 2.0, 3.0]}, {'qty': 'int64', 'price': 'float32'})
+    (length,) = columnar._LENGTH.unpack_from(data)
+    assert (columnar._LENGTH.size + length) % 8 == 0
+    header = json.loads(data[4:4 + length])
+    assert all(column['offset'] % 8 == 0 for column in header['columns'])
+
+
+def test_rows_inverts_record_batches():
+    records = _records(10)
+    assert list(columnar.rows(columnar.record_batches(records, list(SCHEMA), rows=3))) == records
+
+
+def test_backtest_formats_agree(client):
+    body = {'symbols': ['AAPL', 'GOOGL'], 'strategy': 'mean_reversion',
+            'params': {'lookback_period': 8, 'threshold': 0.01}}
+    trades = client.post('/api/backtest', json=body).get_json()['trades']
+    assert trades
+    meta, columns = columnar.read(client.post('/api/backtest?format=columnar', json=body).data)
+    assert meta['trades_count'] == len(trades)
+    assert columns['symbol'] == [t['symbol'] for t in trades]
+    np.testing.assert_array_equal(columns['quantity'], [t['quantity'] for t in trades])
+    lines = client.post('/api/backtest', json=body, headers={'Accept': 'application/x-ndjson'}).data.splitlines()
+    assert json.loads(lines[0])['type'] == 'summary'
+    assert [json.loads(line)['price'] for line in lines[1:]] == [t['price'] for t in trades]
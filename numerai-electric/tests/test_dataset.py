@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+
+from lab import dataset, inference
+from tests.conftest import write_numerai_csv
+
+
+def _csv_rows(path):
+    chunk = next(inference.iter_chunks(path, chunk_rows=10 ** 6))
+    return chunk
+
+
+def test_conversion_groups_eras_and_keeps_rows(numerai_csv, tmp_path):
+    matrix = dataset.load(numerai_csv, str(tmp_path / 'cache'))
+    source = _csv_rows(numerai_csv)
+    assert matrix.features.dtype == np.uint8 and len(matrix) == len(source)
+    assert matrix.eras == sorted(set(source.eras), key=dataset.era_number)
+    order = {row_id: i for i, row_id in enumerate(source.ids)}
+    rows = [order[row_id] for row_id in matrix.ids.tolist()]
+    np.testing.assert_array_equal(matrix.features, source.features[rows])
+    np.testing.assert_array_equal(np.asarray(matrix.targets), source.targets[rows])
+    for k, era in enumerate(matrix.eras):
+        labels = {source.eras[i] for i in rows[matrix.era_starts[k]:matrix.era_starts[k + 1]]}
+        assert labels == {era}
+
+
+def test_selection_and_chunks(numerai_csv, tmp_path):
+    matrix = dataset.load(numerai_csv, str(tmp_path / 'cache'))
+    subset = matrix.row_range((3, 5))
+    assert {dataset.era_number(e) for e in matrix.eras[3 - 1:5]} == {3, 4, 5}
+    chunks = list(matrix.iter_chunks(50, ['feature_1', 'feature_3'], (3, 5)))
+    assert sum(len(c) for c in chunks) == subset.stop - subset.start
+    assert all(c.features.dtype == np.float32 and c.features.shape[1] == 2 for c in chunks)
+    assert {dataset.era_number(e) for c in chunks for e in c.eras} == {3, 4, 5}
+    assert matrix.matrix(['feature_0', 'feature_1']).base is not None  # Contiguous columns: a view
+
+
+def test_reload_is_cached_until_the_source_changes(numerai_csv, tmp_path):
+    cache = str(tmp_path / 'cache')
+    first = dataset.load(numerai_csv, cache)
+    assert dataset.load(numerai_csv, cache) is first and dataset.is_cached(numerai_csv, cache)
+    write_numerai_csv(numerai_csv, rows=100, seed=5)
+    os.utime(numerai_csv, (1, 1))
+    assert not dataset.is_cached(numerai_csv, cache)
+    assert len(dataset.load(numerai_csv, cache)) == 100
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from lab import backtest, indicators
+
+
+def test_rolling_state_matches_full_recomputation():
+    rng = np.random.default_rng(0)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 300))
+    sma, stats = indicators.RollingSMA(10), indicators.RollingMeanStd(14)
+    for i, price in enumerate(prices.tolist()):
+        sma.push(price)
+        stats.push(price)
+        window = prices[max(0, i - 13):i + 1]
+        assert sma.value == pytest.approx(prices[max(0, i - 9):i + 1].mean())
+        assert stats.mean == pytest.approx(window.mean())
+        assert stats.std == pytest.approx(window.std(), abs=1e-9)
+
+
+def test_wilder_rsi_matches_textbook_definition():
+    rng = np.random.default_rng(1)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 200))
+    rsi = indicators.WilderRSI(14)
+    streamed = [rsi.push(p) for p in prices.tolist()]
+    changes = np.diff(prices)
+    avg_gain, avg_loss = np.maximum(changes, 0)[:14].mean(), np.maximum(-changes, 0)[:14].mean()
+    expected = [100 - 100 / (1 + avg_gain / avg_loss)]
+    for change in changes[14:].tolist():
+        avg_gain = (avg_gain * 13 + max(change, 0)) / 14
+        avg_loss = (avg_loss * 13 + max(-change, 0)) / 14
+        expected.append(100 - 100 / (1 + avg_gain / avg_loss))
+    np.testing.assert_allclose(streamed[14:], expected, rtol=1e-9)
+    assert rsi.ready
+
+
+def test_signal_engine_versions_changes_only():
+    engine = indicators.SignalEngine()
+    rng = np.random.default_rng(2)
+    for price in (100 + np.cumsum(rng.normal(0, 1, 100))).tolist():
+        engine.update('AAA', price)
+    version = engine.version
+    assert version > 0
+    [record] = engine.snapshot()
+    assert record['symbol'] == 'AAA' and record['signal'] in ('BUY', 'SELL', 'HOLD')
+    assert engine.snapshot(since_version=version) == []
+    assert engine.update('BBB', 1.0) is None  # Warming up
+    assert engine.export()['symbols_tracked'] == 2
@@ -0,0 +1,49 @@
+import csv
+
+import numpy as np
+import pytest
+
+from lab import dataset, inference
+
+
+def test_chunked_predictions_match_one_pass(numerai_csv, tmp_path):
+    ensemble = inference.Ensemble.initial(6)
+    whole = next(inference.iter_chunks(numerai_csv, chunk_rows=10 ** 6))
+    expected = ensemble.predict(whole.features)
+    output = str(tmp_path / 'predictions.csv')
+    done = []
+    summary = inference.predict_chunks(inference.iter_chunks(numerai_csv, chunk_rows=64), ensemble, output,
+                                       progress=done.append)
+    assert summary['count'] == len(whole) and summary['chunks'] == len(done) == 10
+    assert summary['peak_chunk_bytes'] == 64 * 6 * 4
+    with open(output) as f:
+        rows = list(csv.DictReader(f))
+    assert [r['id'] for r in rows] == whole.ids
+    np.testing.assert_allclose([float(r['prediction']) for r in rows], expected, atol=1e-6)
+    batches = list(inference.read_prediction_batches(output, rows=100))
+    assert sum(len(b['id']) for b in batches) == len(whole)
+
+
+def test_aborted_run_leaves_no_partial_file(numerai_csv, tmp_path):
+    output = tmp_path / 'predictions.csv'
+
+    def abort(rows):
+        raise RuntimeError('cancelled')
+
+    with pytest.raises(RuntimeError):
+        inference.predict_chunks(inference.iter_chunks(numerai_csv, 64), inference.Ensemble.initial(6), str(output),
+                                 progress=abort)
+    assert list(tmp_path.iterdir()) == [tmp_path / 'train.csv']
+
+
+def test_ensemble_save_load_round_trip(numerai_csv, tmp_path):
+    ensemble = inference.Ensemble.initial(6)
+    ensemble.features = [f'feature_{j}' for j in range(6)]
+    path = str(tmp_path / 'ensemble.npz')
+    ensemble.save(path)
+    loaded = inference.Ensemble.load(path, 'ensemble-v1')
+    X = dataset.load(numerai_csv, str(tmp_path / 'cache')).take(np.arange(50))
+    np.testing.assert_array_equal(loaded.predict(X), ensemble.predict(X))
+    assert loaded.features == ensemble.features
+    with pytest.raises(ValueError):
+        loaded.predict(X[:, :3])
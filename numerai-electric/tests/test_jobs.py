@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from lab import jobs
+
+
+def test_job_runs_and_reports_progress(tmp_path):
+    scheduler = jobs.JobScheduler(1, 10, str(tmp_path))
+
+    def work(job):
+        for i in range(4):
+            job.report((i + 1) / 4, f'step {i}')
+        return {'answer': 42}
+
+    job = scheduler.submit('test', work, params={'n': 4})
+    record = scheduler.wait(job.id, 10)
+    assert record['status'] == jobs.COMPLETED and record['result'] == {'answer': 42}
+    assert record['progress'] == 1.0 and record['message'] == 'step 3'
+    # Another worker process sees the persisted copy
+    assert jobs.JobScheduler(1, 10, str(tmp_path)).get(job.id)['status'] == jobs.COMPLETED
+
+
+def test_priorities_failures_and_cancellation(tmp_path):
+    scheduler = jobs.JobScheduler(1, 10, str(tmp_path))
+    gate, started, order = threading.Event(), threading.Event(), []
+
+    def blocker(job):
+        started.set()
+        gate.wait(10)
+        order.append('blocker')
+
+    def until_cancelled(job):
+        while True:
+            job.report()
+
+    first = scheduler.submit('block', blocker)
+    started.wait(10)
+    low = scheduler.submit('low', lambda job: order.append('low'), priority='exploratory')
+    high = scheduler.submit('high', lambda job: order.append('high'), priority='deadline')
+    queued = scheduler.submit('queued', lambda job: order.append('queued'))
+    assert scheduler.cancel(queued.id)['status'] == jobs.CANCELLED
+    gate.set()
+    for job in (first, low, high):
+        scheduler.wait(job.id, 10)
+    assert order == ['blocker', 'high', 'low']
+
+    failing = scheduler.submit('fail', lambda job: 1 / 0)
+    assert scheduler.wait(failing.id, 10)['error'].startswith('ZeroDivisionError')
+    spinning = scheduler.submit('spin', until_cancelled)
+    while scheduler.get(spinning.id)['status'] != jobs.RUNNING:
+        pass
+    scheduler.cancel(spinning.id)
+    assert scheduler.wait(spinning.id, 10)['status'] == jobs.CANCELLED
+
+
+def test_queue_limit_and_bad_priority():
+    scheduler = jobs.JobScheduler(1, 1)
+    gate, started = threading.Event(), threading.Event()
+    scheduler.submit('block', lambda job: started.set() or gate.wait(10))
+    started.wait(10)
+    scheduler.submit('queued', lambda job: None)
+    try:
+        with pytest.raises(jobs.QueueFull):
+            scheduler.submit('overflow', lambda job: None)
+        with pytest.raises(ValueError):
+            scheduler.submit('x', lambda job: None, priority='urgent')
+    finally:
+        gate.set()
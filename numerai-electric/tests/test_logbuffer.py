@@ -0,0 +1,33 @@
+import threading
+
+from lab import logbuffer
+
+
+def test_cursor_pagination_and_wraparound():
+    buffer = logbuffer.LogBuffer(capacity=5)
+    for i in range(8):
+        buffer.append(f'm{i}')
+    assert len(buffer) == 5 and buffer.last_seq == 8
+    assert [r['message'] for r in buffer.since(0)] == ['m3', 'm4', 'm5', 'm6', 'm7']  # Oldest overwritten
+    assert [r['seq'] for r in buffer.since(5, limit=2)] == [6, 7]
+    assert buffer.since(8) == []
+    assert [r['seq'] for r in buffer.recent(2)] == [7, 8]
+
+
+def test_concurrent_appends_get_unique_sequence_numbers():
+    buffer = logbuffer.LogBuffer(capacity=10000)
+    threads = [threading.Thread(target=lambda: [buffer.append('x') for _ in range(500)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [r['seq'] for r in buffer.since(0)] == list(range(1, 4001))
+
+
+def test_logs_route_pages_with_since(client, electric):
+    first = electric.LOG_BUFFER.last_seq
+    for i in range(3):
+        electric.log_event(f'test {i}')
+    body = client.get(f'/api/logs?since={first}&limit=2').get_json()
+    assert [r['message'] for r in body['logs']] == ['test 0', 'test 1']
+    assert client.get(f"/api/logs?since={body['next_since']}").get_json()['logs'][0]['message'] == 'test 2'
@@ -0,0 +1,42 @@
+import heapq
+
+import pytest
+
+from lab import backtest
+from tests import reference
+from tests.test_backtest import MARKET, PARAMS, walk
+
+
+def test_symbol_streams_merge_lazily():
+    pulled = []
+
+    def chunks(i, bars):
+        for chunk in backtest.iter_chunks(bars, 50):
+            pulled.append(i)
+            yield chunk
+
+    key, fn, resolved = backtest.resolve_strategy('mean_reversion', PARAMS['mean_reversion'])
+    totals = backtest._StreamTotals(len(MARKET))
+    merged = heapq.merge(*(backtest.symbol_events(i, chunks(i, bars), fn, resolved, totals)
+                           for i, bars in enumerate(MARKET)))
+    first = next(merged)
+    assert len(pulled) < 2 * len(MARKET)  # A couple of chunks per symbol, not whole histories
+    events = [first] + list(merged)
+    assert events == sorted(events, key=lambda e: (e[0], e[1]))
+    assert totals.bars == sum(len(bars) for bars in MARKET)
+
+
+def test_colliding_timestamps_match_reference():
+    market = [walk('AAA', 300, 4, 900.0, 1), walk('BBB', 300, 5, 900.0, 1), walk('CCC', 200, 6, 950.0, 2)]
+    expected = reference.run_backtest('sma', PARAMS['sma'], market, 100000, 0.3, 0.001)
+    result = backtest.run_backtest('sma', PARAMS['sma'], market, 100000, 0.3, 0.001, chunk_rows=32)
+    assert [(t['type'], t['symbol'], t['quantity']) for t in result['trades']] == \
+        [(t['type'], t['symbol'], t['quantity']) for t in expected['trades']]
+    assert result['metrics']['final_value'] == pytest.approx(expected['final_value'])
+
+
+def test_repeated_symbol_shares_one_position():
+    market = [walk('AAA', 300, 4, 900.0, 1), walk('AAA', 300, 5, 900.0, 1)]
+    trades = backtest.run_backtest('sma', PARAMS['sma'], market, 100000, 0.3, 0.001, chunk_rows=32)['trades']
+    assert trades
+    assert [t['type'] for t in trades] == ['buy', 'sell'] * (len(trades) // 2) + ['buy'] * (len(trades) % 2)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from lab import metrics
+from lab.portfolio import BUY, SELL, Portfolio
+
+
+def _assert_same(batch, live):
+    assert batch.keys() == live.keys()
+    for name, value in batch.items():
+        assert live[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+
+
+def test_trade_stats_matches_trade_metrics():
+    rng = np.random.default_rng(7)
+    pnls = np.where(rng.random(501) < 0.4, 0.0, rng.normal(0, 250, 501))
+    times = np.cumsum(rng.integers(1, 100, 501)) * metrics.HOUR_NS // 3
+    stats = metrics.TradeStats(100000.0)
+    for pnl, time_ns in zip(pnls.tolist(), times.tolist()):
+        stats.push(pnl, time_ns)
+    _assert_same(metrics.trade_metrics(pnls, 100000.0, times), stats.snapshot())
+
+
+def test_empty_and_single_trade():
+    _assert_same(metrics.trade_metrics(np.zeros(0), 1000.0, np.zeros(0, dtype=np.int64)),
+                 metrics.TradeStats(1000.0).snapshot())
+    stats = metrics.TradeStats(1000.0)
+    stats.push(-50.0, 0)
+    _assert_same(metrics.trade_metrics(np.array([-50.0]), 1000.0, np.array([0])), stats.snapshot())
+
+
+def test_portfolio_stats_follow_its_trade_log():
+    rng = np.random.default_rng(3)
+    book = Portfolio(['A', 'B', 'C'], 10000.0, 0.3, 0.001, track_stats=True)
+    for step in range(400):
+        ids = rng.permutation(3)[:rng.integers(1, 4)]
+        sides = rng.choice([BUY, SELL], len(ids))
+        book.apply_fills(ids, sides, rng.uniform(90, 110, len(ids)), step * metrics.HOUR_NS)
+    log = book.trades
+    assert len(log) > 50
+    batch = metrics.trade_metrics(np.nan_to_num(log.column('pnl')), 10000.0, log.column('time'))
+    _assert_same(batch, book.stats.snapshot())
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from lab import backtest, optimizer
+from tests.test_backtest import MARKET
+
+
+def test_parameter_grid():
+    grid = optimizer.parameter_grid({'short_window': [5, 10], 'long_window': [20, 30, 40]})
+    assert len(grid) == 6
+    assert grid[0] == {'short_window': 5, 'long_window': 20}
+
+
+def test_grid_search_matches_serial_backtests():
+    ranges = {'lookback_period': [5, 10], 'threshold': [0.005, 0.02]}
+    records = list(optimizer.optimize_strategy('mean_reversion', MARKET, ranges, workers=2))
+    summary = records[-1]
+    assert summary['type'] == 'summary' and summary['completed'] == summary['total'] == 4
+    assert summary['workers'] == 2
+    for record in records[:-1]:
+        expected = backtest.run_backtest('mean_reversion', record['parameters'], MARKET)['metrics']
+        assert record['metrics'] == pytest.approx(expected)
+    best = max(records[:-1], key=lambda r: r['metrics']['sharpe_ratio'])
+    assert summary['best_strategy']['parameters'] == best['parameters']
+
+
+def test_bad_combination_fails_before_any_worker_starts():
+    with pytest.raises(ValueError):
+        optimizer.optimize_strategy('sma', MARKET, {'short_window': [5, 30], 'long_window': [20]})
+
+
+def test_route_caps_workers(client, electric):
+    body = {'symbols': ['AAPL'], 'strategy': 'sma', 'parameter_ranges': {'short_window': [5, 10]}}
+    response = client.post('/api/optimize', json=dict(body, workers=64))
+    assert response.status_code == 200
+    summary = json.loads(response.data.splitlines()[-1])
+    assert summary['type'] == 'summary'
+    assert summary['workers'] <= electric.CONFIG['optimize_workers']
+    for workers in (0, -1, 'many', True, 1.5):
+        assert client.post('/api/optimize', json=dict(body, workers=workers)).status_code == 400
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from lab.portfolio import BUY, SELL, SMALL_BATCH, Portfolio
+
+
+def _trade(book, batches):
+    for time, (ids, sides, prices) in enumerate(batches):
+        book.apply_fills(ids, sides, prices, time)
+    return book
+
+
+def _batches(n_symbols, steps, seed):
+    rng = np.random.default_rng(seed)
+    batches = []
+    for _ in range(steps):
+        ids = rng.permutation(n_symbols)[:rng.integers(1, n_symbols + 1)]
+        batches.append((ids, rng.choice([BUY, SELL], len(ids)), rng.uniform(50, 150, len(ids))))
+    return batches
+
+
+def test_vector_fills_match_one_at_a_time():
+    names = [f'S{i}' for i in range(40)]
+    batches = _batches(40, 200, 0)
+    vector = _trade(Portfolio(names, 1e6, 0.05), batches)
+    serial = Portfolio(names, 1e6, 0.05)
+    for time, (ids, sides, prices) in enumerate(batches):
+        for i, side, price in zip(ids.tolist(), sides.tolist(), prices.tolist()):
+            serial.apply_fills([i], [side], [price], time)
+    assert any(len(ids) > SMALL_BATCH for ids, _, _ in batches)  # Exercises the vector path
+    assert vector.cash == pytest.approx(serial.cash, rel=1e-12)
+    assert [(r['type'], r['symbol'], r['quantity'], r['timestamp']) for r in vector.trade_records()] == \
+        [(r['type'], r['symbol'], r['quantity'], r['timestamp']) for r in serial.trade_records()]
+    np.testing.assert_array_equal(vector.quantity, serial.quantity)
+    np.testing.assert_allclose(vector.realized_pnl, serial.realized_pnl)
+
+
+def test_buy_sell_accounting():
+    book = Portfolio(['A', 'B'], 10000.0, 0.5, 0.01)
+    book.apply_fills([0], [BUY], [100.0], 1)
+    assert book.quantity[0] == 50 and book.cash == pytest.approx(10000 - 5000 - 50)
+    book.apply_fills([0, 1], [BUY, SELL], [120.0, 10.0], 2)  # Already long A; nothing to sell in B
+    assert len(book.trades) == 1
+    book.mark([0], [130.0])
+    assert book.value() == pytest.approx(book.cash + 50 * 130.0)
+    assert book.unrealized_pnl()[0] == pytest.approx(50 * 30.0)
+    assert list(book.positions()) == ['A']
+    book.apply_fills([0], [SELL], [110.0], 3)
+    assert book.realized_pnl[0] == pytest.approx(110 * 50 * 0.99 - 100 * 50)
+    assert book.trade_records()[-1]['pnl'] == pytest.approx(book.realized_pnl[0])
+    assert not book.open.any()
+
+
+def test_buy_refused_without_cash():
+    book = Portfolio(['A'], 100.0, 1.0, 0.01)
+    assert book.apply_fills([0], [BUY], [100.0], 0) == 0  # 1 share costs 101 with commission
+    assert book.cash == 100.0
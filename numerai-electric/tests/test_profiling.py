@@ -0,0 +1,42 @@
+import pstats
+import time
+
+from lab import profiling
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def test_cprofile_request_profile_is_saved_and_pruned(tmp_path):
+    for _ in range(3):
+        profile = profiling.RequestProfile('cprofile')
+        _busy(0.01)
+        record = profile.save(str(tmp_path), '/api/backtest', 'POST', keep=2)
+    assert record['file'].endswith('.pstats') and record['duration_ms'] >= 10
+    assert any('_busy' in row['function'] for row in record['top_functions'])
+    pstats.Stats(str(tmp_path / record['file']))  # Loadable by the standard tooling
+    listed = profiling.list_profiles(str(tmp_path))
+    assert len(listed) == 2 and listed[0]['profile_id'] == record['profile_id']
+    assert 'top_functions' not in listed[0]
+
+
+def test_sampled_profile_writes_folded_stacks(tmp_path):
+    profile = profiling.RequestProfile('sample', 0.001)
+    _busy(0.1)
+    record = profile.save(str(tmp_path), '/', 'GET')
+    lines = (tmp_path / record['file']).read_text().splitlines()
+    assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any('_busy' in line for line in lines)
+
+
+def test_profiling_is_opt_in(client, electric, monkeypatch):
+    assert 'X-Profile-Id' not in client.get('/api/test?profile=1').headers
+    monkeypatch.setitem(electric.CONFIG, 'profiling_enabled', True)
+    profile_id = client.get('/api/test?profile=cprofile').headers['X-Profile-Id']
+    profiles = client.get('/api/profiles').get_json()['profiles']
+    assert profiles[0]['profile_id'] == profile_id
+    assert client.get(f'/api/profiles/{profile_id}.pstats').status_code == 200
+    assert client.get('/api/profiles/..%2Fsecret').status_code == 404
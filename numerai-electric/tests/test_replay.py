@@ -0,0 +1,58 @@
+import numpy as np
+
+from lab import indicators, replay
+from lab.portfolio import Portfolio
+from tests.test_backtest import MARKET, walk
+
+
+def _serial(market):
+    """Ticks in timestamp order (ties by symbol order) fed straight into an engine"""
+    engine = indicators.SignalEngine()
+    ticks = sorted((int(t), i, float(c)) for i, bars in enumerate(market)
+                   for t, c in zip(bars.timestamp.astype(np.int64).tolist(), bars.close.tolist()))
+    for _, i, price in ticks:
+        engine.update(market[i].symbol, price)
+    return engine
+
+
+def test_blocking_replay_delivers_every_tick_in_order():
+    engine = indicators.SignalEngine()
+    feed = replay.ReplayFeed(MARKET, engine, speed=0, queue_size=16, policy='block', batch_size=8).start()
+    assert feed.wait(30)
+    stats = feed.stats()
+    assert stats['state'] == 'finished' and stats['dropped'] == 0
+    assert stats['processed'] == stats['published'] == sum(len(b) for b in MARKET)
+    assert stats['max_queue_depth'] <= 16 and stats['latency']['count'] == stats['processed']
+    def signals(snapshot):
+        return {s['symbol']: dict(s, version=None, timestamp=None) for s in snapshot}
+    assert signals(engine.snapshot()) == signals(_serial(MARKET).snapshot())
+
+
+def test_drop_policy_bounds_the_queue():
+    market = [walk(f'S{i}', 3000, i) for i in range(4)]
+    feed = replay.ReplayFeed(market, indicators.SignalEngine(), speed=0, queue_size=4, policy='drop',
+                             batch_size=1).start()
+    assert feed.wait(60)
+    stats = feed.stats()
+    assert stats['max_queue_depth'] <= 4
+    assert stats['processed'] + stats['dropped'] == stats['published'] == 12000
+
+
+def test_paper_trading_tracks_live_metrics():
+    book = Portfolio([b.symbol for b in MARKET], 100000.0, 0.1, 0.001, track_stats=True)
+    feed = replay.ReplayFeed(MARKET, indicators.SignalEngine(), speed=0, portfolio=book).start()
+    assert feed.wait(30)
+    paper = feed.stats()['paper_trading']
+    assert paper['metrics']['total_trades'] == len(book.trades) > 0
+    assert paper['value'] == round(book.value(), 2)
+
+
+def test_replay_route(client):
+    response = client.post('/api/replay?wait=30', json={'symbols': ['AAPL', 'GOOGL'], 'speed': 'max',
+                                                            'isolated': True, 'paper_trade': True})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['state'] == 'finished' and body['processed'] == 600
+    assert body['paper_trading']['metrics'] is not None
+    assert client.get('/api/replay').get_json()['processed'] == 600
+    assert client.post('/api/replay', json={'policy': 'lossy'}).status_code == 400
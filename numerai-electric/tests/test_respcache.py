@@ -0,0 +1,43 @@
+import gzip
+import time
+
+from lab import respcache
+
+
+def test_tracked_dict_versions_per_key():
+    state = respcache.TrackedDict(a=1, b=2)
+    before = state.version_of(['a'])
+    state['b'] = 3
+    assert state.version_of(['a']) == before
+    state['a'] = 5
+    assert state.version_of(['a']) != before
+    version = state.version_of()
+    state.update(c=1)
+    assert state.version_of() != version
+
+
+def test_response_cache_rebuilds_on_version_or_ttl():
+    cache = respcache.ResponseCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b'{"n": %d}' % len(builds)
+
+    first = cache.get('k', (1,), build)
+    assert cache.get('k', (1,), build) is first
+    assert cache.get('k', (2,), build).body == b'{"n": 2}'
+    short = cache.get('t', (1,), build, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('t', (1,), build, ttl=0.01) is not short
+    assert gzip.decompress(first.gzipped) == first.body
+    assert cache.stats()['hits'] == 1
+
+
+def test_conditional_get(client, electric, monkeypatch):
+    response = client.get('/api/status')
+    etag = response.headers['ETag']
+    assert client.get('/api/status', headers={'If-None-Match': etag}).status_code == 304
+    monkeypatch.setitem(electric.SYSTEM_STATE, 'numerai_status', {'tournament': 'closed'})
+    changed = client.get('/api/status', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
@@ -0,0 +1,51 @@
+import os
+import time
+
+from lab import resultcache
+
+
+def test_content_key_ignores_dict_order():
+    assert resultcache.content_key({'a': 1, 'b': [1, 2]}) == resultcache.content_key({'b': [1, 2], 'a': 1})
+    assert resultcache.content_key({'a': 1}) != resultcache.content_key({'a': 2})
+
+
+def test_memory_then_disk_tier(tmp_path):
+    cache = resultcache.ResultCache(str(tmp_path), memory_entries=1)
+    cache.put('aa11', {'n': 1})
+    cache.put('bb22', {'n': 2})  # Pushes aa11 out of memory
+    assert cache.get('bb22') == {'n': 2}
+    assert cache.get('aa11') == {'n': 1}
+    assert cache.get('cc33') is None
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 1, 1)
+    # A second worker shares the disk tier
+    assert resultcache.ResultCache(str(tmp_path)).get('bb22') == {'n': 2}
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = resultcache.ResultCache(str(tmp_path), memory_entries=0, disk_bytes=100)
+    payload = {'x': os.urandom(20).hex()}
+    for i, key in enumerate(('k1', 'k2', 'k3', 'k4')):
+        cache.put(key, payload)
+        os.utime(cache._path(key), (i, i))
+        time.sleep(0.01)
+    assert cache.get('k4') == payload
+    assert cache.get('k1') is None
+    assert sum(size for _, size, _ in cache._files()) <= 100
+
+
+def test_unwritable_directory_keeps_memory_tier(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    cache = resultcache.ResultCache(str(blocker / 'cache'))
+    cache.put('ab12', {'n': 1})
+    assert cache.get('ab12') == {'n': 1} and cache.stats()['write_errors'] == 1
+
+
+def test_backtest_route_hits_the_cache(client):
+    body = {'symbols': ['AAPL'], 'strategy': 'mean_reversion', 'params': {'lookback_period': 8}}
+    first = client.post('/api/backtest', json=body)
+    second = client.post('/api/backtest', json=body)
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('miss', 'hit')
+    assert second.get_json()['trades'] == first.get_json()['trades']
+    assert client.post('/api/backtest', json=dict(body, cache=False)).headers['X-Cache'] == 'miss'
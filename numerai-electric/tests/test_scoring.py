@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from lab import dataset, scoring
+
+
+def _ranks(values):
+    """1-based ranks, ties in row order"""
+    ranks = np.empty(len(values))
+    ranks[np.argsort(values, kind='stable')] = np.arange(1, len(values) + 1)
+    return ranks
+
+
+def test_era_correlation_matches_a_per_era_loop():
+    rng = np.random.default_rng(1)
+    labels = np.repeat([f'era{i}' for i in range(20)], rng.integers(5, 40, 20))
+    index = scoring.EraIndex.from_labels(labels)
+    predictions = rng.random(len(labels)).round(2)  # Ties
+    targets = rng.choice([0.0, 0.25, 0.5, 0.75, 1.0], len(labels))
+    expected = []
+    for era in dict.fromkeys(labels):
+        rows = labels == era
+        expected.append(np.corrcoef(_ranks(predictions[rows]) / rows.sum(), targets[rows])[0, 1])
+    np.testing.assert_allclose(scoring.era_correlation(predictions, targets, index), expected, atol=1e-12)
+
+
+def test_mmc_of_the_meta_model_itself_is_zero():
+    rng = np.random.default_rng(2)
+    index = scoring.EraIndex.from_labels(np.repeat(['a', 'b', 'c'], 50))
+    meta = rng.random(150)
+    np.testing.assert_allclose(scoring.era_mmc(meta, meta, rng.random(150), index), 0, atol=1e-12)
+
+
+def test_score_many_orders_best_first():
+    rng = np.random.default_rng(3)
+    index = scoring.EraIndex.from_labels(np.repeat(['a', 'b', 'c', 'd'], 100))
+    targets = rng.random(400)
+    scored = scoring.score_many({'noise': rng.random(400), 'oracle': targets}, targets, index)
+    assert list(scored) == ['oracle', 'noise']
+    assert scored['oracle']['correlation']['mean'] > 0.9
+
+
+def test_unsorted_eras_are_rejected():
+    with pytest.raises(ValueError):
+        scoring.EraIndex.from_labels(['a', 'b', 'a'])
+
+
+def test_target_rows_cache_is_bounded(numerai_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(scoring, '_cache', type(scoring._cache)())
+    matrix = dataset.load(numerai_csv, str(tmp_path / 'cache'))
+    first, index = scoring.target_rows(matrix, (1, 2))
+    assert scoring.target_rows(matrix, (1, 2))[0] is first
+    assert np.isfinite(np.asarray(matrix.targets)[first]).all()
+    assert len(index) == len(first)
+    for end in range(3, 13):
+        scoring.target_rows(matrix, (1, end))
+    assert len(scoring._cache) == scoring.CACHE_ENTRIES
+    assert scoring.target_rows(matrix, (1, 2))[0] is not first  # Evicted, rebuilt
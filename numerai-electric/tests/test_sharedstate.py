@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from lab import sharedstate
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+
+
+def _in_child(fn):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            fn()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+
+def test_counters_slots_and_logs_cross_fork():
+    state = sharedstate.SharedState(['requests'], {'signals': 1024}, log_capacity=8, log_message_bytes=16)
+    state.increment('requests')
+
+    def child():
+        state.increment('requests', 5)
+        state.publish('signals', {'version': 3, 'signals': ['AAPL']})
+        state.log.append('from the child process', 'warning')
+
+    _in_child(child)
+    assert state.value('requests') == 6
+    assert state.version('signals') == 1
+    assert state.get('signals') == {'version': 3, 'signals': ['AAPL']}
+    [record] = state.log.since(0)
+    assert record['level'] == 'warning' and record['message'] == 'from the child p'  # Truncated to 16 bytes
+
+
+def test_slot_overflow_and_log_wraparound():
+    state = sharedstate.SharedState([], {'small': 8}, log_capacity=3)
+    with pytest.raises(ValueError):
+        state.publish('small', {'too': 'large'})
+    assert state.get('small', 'default') == 'default'
+    for i in range(5):
+        state.log.append(f'm{i}')
+    assert [r['message'] for r in state.log.since(0)] == ['m2', 'm3', 'm4']
+    assert [r['seq'] for r in state.log.recent(1)] == [5]
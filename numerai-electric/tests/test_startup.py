@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_defers_optional_modules():
+    code = ("import sys, app; print(','.join(m for m in ('lab.optimizer', 'lab.sharedstate', 'lab.prefork', "
+            "'multiprocessing', 'brotli') if m in sys.modules)); print(app.CONFIG['public_ip'])")
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    loaded, public_ip = output.stdout.splitlines()[-2:]
+    assert loaded == ''
+    assert public_ip == 'None'  # No lookup at import time
+
+
+def test_public_ip_cache(electric, monkeypatch):
+    assert electric.read_cached_public_ip() == (None, False)
+    monkeypatch.setattr(electric, 'get_public_ip', lambda: '203.0.113.7')
+    assert electric.resolve_public_ip() == '203.0.113.7'
+    assert electric.CONFIG['public_ip'] == '203.0.113.7'
+    assert electric.read_cached_public_ip() == ('203.0.113.7', True)
+    monkeypatch.setitem(electric.CONFIG, 'public_ip_cache_ttl', -1)
+    assert electric.read_cached_public_ip() == ('203.0.113.7', False)
@@ -0,0 +1,55 @@
+import json
+import threading
+import time
+
+from lab import streaming
+
+
+def test_notify_wakes_waiting_and_busy_clients():
+    broker = streaming.EventBroker()
+    waiting, busy = broker.subscribe(), broker.subscribe()
+    woken = []
+    thread = threading.Thread(target=lambda: woken.append(broker.wait(waiting, 5.0)))
+    thread.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    broker.notify()
+    thread.join()
+    assert woken == [True] and time.perf_counter() - started < 1.0
+    assert broker.wait(busy, 5.0) is True  # Notified while not waiting: returns at once
+    assert broker.wait(busy, 0.01) is False
+    broker.unsubscribe(waiting)
+    broker.unsubscribe(busy)
+    assert broker.client_count == 0
+
+
+def test_format_event():
+    text = streaming.format_event('log', {'a': 1}, event_id=7)
+    assert text == 'event: log\nid: 7\ndata: {"a":1}\n\n'
+    assert streaming.heartbeat().startswith(':')
+
+
+def _events(chunks):
+    events = []
+    for chunk in chunks:
+        for block in chunk.decode().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+            if 'event' in fields:
+                events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_stream_delivers_new_logs_promptly(client, electric):
+    response = client.get('/api/stream?topics=log', buffered=False)
+    chunks = iter(response.response)
+    try:
+        threading.Timer(0.1, electric.log_event, ('hello stream',)).start()
+        started = time.perf_counter()
+        events = []
+        while not events:
+            events = _events([next(chunks)])
+        assert events[0][0] == 'log' and events[0][1]['message'] == 'hello stream'
+        assert time.perf_counter() - started < electric.CONFIG['stream_poll_interval'] + 0.5
+    finally:
+        response.close()
+    assert electric.EVENT_BROKER.client_count == 0
@@ -0,0 +1,50 @@
+from lab import telemetry
+
+
+def _registry():
+    registry = telemetry.Registry()
+    requests = registry.counter('requests_total', 'Requests', ('route',))
+    latency = registry.histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+    return registry, requests, latency
+
+
+def test_render_cumulative_histogram():
+    registry, requests, latency = _registry()
+    requests.inc(('/a',))
+    requests.inc(('/a',), 2)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(('/a',), value)
+    text = telemetry.render(registry.snapshot())
+    assert 'requests_total{route="/a"} 3' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_merge_sums_worker_snapshots():
+    snapshots = []
+    for n in (1, 2):
+        registry, requests, latency = _registry()
+        requests.inc(('/a',), n)
+        latency.observe(('/a',), 0.5)
+        snapshots.append(registry.snapshot())
+    text = telemetry.render(telemetry.merge(snapshots))
+    assert 'requests_total{route="/a"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 2' in text
+
+
+def test_label_values_are_escaped():
+    registry = telemetry.Registry()
+    registry.counter('c', 'C', ('path',)).inc(('a"b\\c\n',))
+    assert 'c{path="a\\"b\\\\c\\n"} 1' in telemetry.render(registry.snapshot())
+
+
+def test_metrics_endpoint_counts_routes(client):
+    client.get('/api/test')
+    client.get('/api/test')
+    text = client.get('/metrics').get_data(as_text=True)
+    line = next(l for l in text.splitlines()
+                if l.startswith('http_requests_total{') and 'route="/api/test"' in l)
+    assert float(line.rsplit(' ', 1)[1]) >= 2
+    assert 'http_request_duration_seconds_bucket{' in text
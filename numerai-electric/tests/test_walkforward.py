@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+import pytest
+
+from lab import backtest, sharedmem, walkforward
+from tests.test_backtest import MARKET
+
+
+def test_shared_market_data_round_trips():
+    with sharedmem.SharedMarketData(MARKET) as shared:
+        handle, views = sharedmem.attach(shared.descriptor)
+        try:
+            for original, view in zip(MARKET, views):
+                assert view.symbol == original.symbol
+                for field in sharedmem.FIELDS:
+                    np.testing.assert_array_equal(getattr(view, field), getattr(original, field))
+                assert not view.close.flags.writeable
+        finally:
+            del views
+            handle.close()
+
+
+def test_folds_tile_the_range():
+    start, end = np.datetime64('2024-01-01', 'ns'), np.datetime64('2024-01-11', 'ns')
+    folds = walkforward.make_folds(start, end, 3, train_periods=2)
+    assert folds[0][0] == start and folds[-1][3] == end
+    for (train_start, train_end, test_start, test_end), following in zip(folds, folds[1:] + [None]):
+        assert train_start < train_end == test_start < test_end
+        if following is not None:
+            assert following[2] == test_end
+    anchored = walkforward.make_folds(start, end, 3, train_periods=2, mode='anchored')
+    assert all(fold[0] == start for fold in anchored)
+    with pytest.raises(ValueError):
+        walkforward.make_folds(start, end, 3, mode='sideways')
+
+
+def test_each_fold_matches_direct_backtests():
+    ranges = {'lookback_period': [5, 10], 'threshold': [0.005, 0.02]}
+    records = list(walkforward.walk_forward('mean_reversion', MARKET, 3, ranges, workers=2))
+    summary = records[-1]
+    assert summary['type'] == 'summary' and summary['completed'] == 3 and summary['workers'] == 2
+    for record in records[:-1]:
+        train = [b.window(*map(backtest.parse_timestamp, (record['train']['start'], record['train']['end'])))
+                 for b in MARKET]
+        test = [b.window(*map(backtest.parse_timestamp, (record['test']['start'], record['test']['end'])))
+                for b in MARKET]
+        best = max((backtest.run_backtest('mean_reversion', p, train) for p in
+                    [{'lookback_period': lp, 'threshold': t} for lp in (5, 10) for t in (0.005, 0.02)]),
+                   key=lambda r: r['metrics']['sharpe_ratio'])
+        assert record['in_sample']['sharpe_ratio'] == pytest.approx(best['metrics']['sharpe_ratio'])
+        expected = backtest.run_backtest('mean_reversion', record['parameters'], test)['metrics']
+        assert record['out_of_sample'] == pytest.approx(expected)
+
+
+def test_route_caps_workers(client, electric):
+    body = {'symbols': ['AAPL'], 'strategy': 'mean_reversion', 'folds': 2, 'workers': 32}
+    response = client.post('/api/walkforward', json=body)
+    assert response.status_code == 200
+    summary = json.loads(response.data.splitlines()[-1])
+    assert summary['type'] == 'summary'
+    assert summary['workers'] <= electric.CONFIG['optimize_workers']
+    assert client.post('/api/walkforward', json=dict(body, workers=0)).status_code == 400